@@ -0,0 +1,137 @@
+"""Benchmark da leitura de arquivos: ``open()`` no working tree vs. ``BlobReader``.
+
+Gera um repositório git temporário com N arquivos (ou usa ``--workdir``) e
+mede o tempo de ler todos os arquivos do HEAD com ``open()`` e com um
+``git cat-file --batch`` persistente, com o page cache quente e frio. No
+modo frio, antes de cada execução as páginas dos arquivos do working tree e
+de ``.git/objects`` são descartadas com ``posix_fadvise(DONTNEED)``.
+
+Uso:
+    python benchmarks/bench_blob_reader.py
+    python benchmarks/bench_blob_reader.py --files 500 5000 --gc
+    python benchmarks/bench_blob_reader.py --workdir ~/projeto
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from code_reviewer.git_objects import BlobReader
+
+
+def _git(repo: Path, *args: str) -> bytes:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True).stdout
+
+
+def create_repo(root: Path, file_count: int, lines_per_file: int, gc: bool) -> None:
+    """Cria um repositório com ``file_count`` arquivos commitados."""
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "config", "user.email", "bench@example.com")
+    _git(root, "config", "user.name", "Bench")
+
+    for i in range(file_count):
+        path = root / f"pkg{i % 20}" / f"module_{i}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(
+            "".join(f"def func_{j}(x):\n    return x + {i * j}\n" for j in range(lines_per_file))
+        )
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "base")
+    if gc:
+        # Objetos em packfile, como num clone
+        _git(root, "gc", "-q")
+
+
+def list_files(repo: Path) -> list[str]:
+    """Arquivos do HEAD que também estão no working tree."""
+    output = _git(repo, "ls-tree", "-r", "-z", "--name-only", "--full-tree", "HEAD")
+    paths = [path.decode("utf-8", "surrogateescape") for path in output.split(b"\0") if path]
+    return [path for path in paths if (repo / path).is_file()]
+
+
+def drop_page_cache(repo: Path, paths: list[str]) -> None:
+    """Descarta do page cache os arquivos lidos pelas duas estratégias."""
+    os.sync()
+    files = [repo / path for path in paths]
+    files += [path for path in (repo / ".git" / "objects").rglob("*") if path.is_file()]
+    for path in files:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def read_worktree(repo: Path, paths: list[str]) -> int:
+    total = 0
+    for path in paths:
+        with open(repo / path, "rb") as file:
+            total += len(file.read())
+    return total
+
+
+def read_objects(repo: Path, paths: list[str]) -> int:
+    total = 0
+    with BlobReader(repo) as reader:
+        for path in paths:
+            total += len(reader.read_file(path) or b"")
+    return total
+
+
+def measure(
+    read: Callable[[Path, list[str]], int], repo: Path, paths: list[str], repeat: int, cold: bool
+) -> float:
+    """Retorna o melhor tempo (s) de leitura de todos os arquivos."""
+    best = float("inf")
+    read(repo, paths)  # Aquece o cache (e o interpretador)
+    for _ in range(repeat):
+        if cold:
+            drop_page_cache(repo, paths)
+        start = time.perf_counter()
+        read(repo, paths)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(repo: Path, label: str, repeat: int) -> None:
+    paths = list_files(repo)
+    row = f"{label:>10} {len(paths):>8}"
+    for cold in (False, True):
+        for read in (read_worktree, read_objects):
+            row += f" {measure(read, repo, paths, repeat, cold) * 1000:>13.1f}ms"
+    print(row, flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--lines", type=int, default=20, help="funções por arquivo")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gc", action="store_true", help="compacta os objetos em packfile")
+    parser.add_argument("--workdir", type=Path, help="mede um repositório existente")
+    args = parser.parse_args()
+
+    print(
+        f"{'repo':>10} {'arquivos':>8} {'open quente':>15} {'cat-file quente':>15}"
+        f" {'open frio':>15} {'cat-file frio':>15}"
+    )
+    if args.workdir:
+        report(args.workdir, args.workdir.name[:10], args.repeat)
+        return
+
+    for file_count in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            create_repo(repo, file_count, args.lines, args.gc)
+            report(repo, "packed" if args.gc else "loose", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Microbenchmark do parser: diff decodificado inteiro vs. bytes por arquivo.
+
+Gera em memória um diff sintético com arquivos revisáveis e arquivos
+ignorados grandes (lockfiles, dist/) e compara:
+
+- texto: ``data.decode()`` do diff inteiro seguido de ``parse_diff(str)``,
+  como acontecia com ``text=True`` no subprocess;
+- bytes: ``parse_diff(bytes)``, que fatia por arquivo e só decodifica os
+  arquivos que passam pelo filtro.
+
+Também mede a robustez: com um arquivo em latin-1 no diff, o modo texto
+falha ao decodificar e o modo bytes usa o fallback só naquele arquivo.
+
+Uso:
+    python benchmarks/bench_diff_parser.py
+    python benchmarks/bench_diff_parser.py --files 500 --ignored-lines 20000
+"""
+
+import argparse
+import time
+
+from code_reviewer.diff_parser import parse_diff
+
+
+def _file_diff(path: str, lines: list[str]) -> str:
+    body = "".join(f"+{line}\n" for line in lines)
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        "index 1234567..89abcde 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -1,0 +1,{len(lines)} @@\n"
+        f"{body}"
+    )
+
+
+def build_diff(file_count: int, lines_per_file: int, ignored_lines: int) -> str:
+    """Monta um diff com ``file_count`` arquivos .py e alguns lockfiles grandes."""
+    parts = []
+    for i in range(file_count):
+        lines = [f"def func_{i}_{j}(x):  # ação {j}" for j in range(lines_per_file)]
+        parts.append(_file_diff(f"pkg/module_{i}.py", lines))
+        if i % 50 == 0:
+            lock = [f'    "dep-{i}-{j}": "^1.{j}.0",' for j in range(ignored_lines)]
+            parts.append(_file_diff(f"web/package-lock-{i}/package-lock.json", lock))
+            parts.append(_file_diff(f"web/dist/bundle_{i}.js", lock))
+    return "".join(parts)
+
+
+def measure(func, repeat: int) -> float:
+    """Retorna o melhor tempo (s) entre ``repeat`` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--ignored-lines", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_diff(args.files, args.lines, args.ignored_lines)
+    data = text.encode()
+    assert parse_diff(data) == parse_diff(data.decode())
+
+    text_mode = measure(lambda: parse_diff(data.decode()), args.repeat)
+    bytes_mode = measure(lambda: parse_diff(data), args.repeat)
+
+    print(f"diff: {len(data) / 1e6:.1f} MB, {args.files} arquivos revisáveis")
+    print(f"texto (decodifica tudo): {text_mode * 1000:8.1f} ms")
+    print(f"bytes (por arquivo):     {bytes_mode * 1000:8.1f} ms")
+    print(f"ganho:                   {text_mode / bytes_mode:8.2f}x")
+
+    # Robustez: um único arquivo fora de UTF-8
+    latin1 = _file_diff("legado.py", ["nome = 'João'"]).encode("latin-1")
+    try:
+        parse_diff((data + latin1).decode())
+        text_result = "ok"
+    except UnicodeDecodeError as error:
+        text_result = f"falha ({error.reason})"
+    files = parse_diff(data + latin1)
+    print(f"arquivo latin-1 — texto: {text_result}; bytes: {len(files)} arquivos")
+
+
+if __name__ == "__main__":
+    main()
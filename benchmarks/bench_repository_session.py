@@ -0,0 +1,73 @@
+"""Benchmark dos metadados do repositório: processos git vs. RepositorySession.
+
+Compara o custo de obter raiz, branch, HEAD e merge-base com um processo
+git por informação (como o review fazia) contra uma ``RepositorySession``,
+que lê HEAD e refs direto de ``.git`` e só chama o git para o merge-base.
+
+Uso:
+    python benchmarks/bench_repository_session.py
+    python benchmarks/bench_repository_session.py --workdir ~/projeto --base main
+"""
+
+import argparse
+import subprocess
+import time
+from pathlib import Path
+
+from code_reviewer.repository import RepositorySession
+
+
+def _git(workdir: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=workdir, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def with_processes(workdir: Path, base: str) -> tuple[str, str, str, str]:
+    """Uma chamada do git por informação."""
+    return (
+        _git(workdir, "rev-parse", "--show-toplevel"),
+        _git(workdir, "rev-parse", "--abbrev-ref", "HEAD"),
+        _git(workdir, "rev-parse", "HEAD"),
+        _git(workdir, "merge-base", base, "HEAD"),
+    )
+
+
+def with_session(workdir: Path, base: str) -> tuple[str, str, str, str]:
+    """Uma sessão; só o merge-base cria processo."""
+    session = RepositorySession.open(workdir)
+    return (
+        str(session.root),
+        session.branch,
+        session.head_sha,
+        session.merge_base(base),
+    )
+
+
+def measure(func, workdir: Path, base: str, repeat: int) -> float:
+    """Retorna o melhor tempo (s) entre ``repeat`` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(workdir, base)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", type=Path, default=Path.cwd())
+    parser.add_argument("--base", default="HEAD~1")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    processes = measure(with_processes, args.workdir, args.base, args.repeat)
+    session = measure(with_session, args.workdir, args.base, args.repeat)
+
+    print(f"processos git: {processes * 1000:7.2f} ms")
+    print(f"sessão:        {session * 1000:7.2f} ms")
+    print(f"ganho:         {processes / session:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
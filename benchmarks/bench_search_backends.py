@@ -0,0 +1,90 @@
+"""Benchmark dos backends de busca do backtracking de contexto.
+
+Gera um repositório sintético com código rastreado e lixo não rastreado
+(``node_modules``, artefatos ignorados pelo .gitignore) e mede cada backend
+disponível buscando os callers de várias funções numa única varredura.
+O resultado orienta a ordem de SEARCH_BACKENDS usada pela seleção
+automática.
+
+Uso:
+    python benchmarks/bench_search_backends.py
+    python benchmarks/bench_search_backends.py --files 5000 --functions 20
+    python benchmarks/bench_search_backends.py --workdir ~/projeto --pattern "log("
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from code_reviewer.search import SEARCH_BACKENDS
+
+
+def generate_repo(root: Path, files: int, functions: int) -> list[str]:
+    """Cria o repositório sintético e retorna os padrões de busca."""
+    names = [f"funcao_{i}" for i in range(functions)]
+    for i in range(files):
+        package = root / "src" / f"pkg{i % 50}"
+        package.mkdir(parents=True, exist_ok=True)
+        lines = [f"def local_{i}_{j}(x):\n    return x + {j}\n" for j in range(40)]
+        lines.append(f"resultado = {names[i % functions]}(1)\n")
+        (package / f"mod{i}.py").write_text("".join(lines))
+
+    # Lixo que não deve ser pesquisado
+    for directory in ("node_modules/lib", "build/gerado", "logs"):
+        (root / directory).mkdir(parents=True, exist_ok=True)
+    for i in range(files // 2):
+        content = f"{names[i % functions]}(1)\n" * 200
+        (root / "node_modules" / "lib" / f"m{i}.js").write_text(content)
+        (root / "logs" / f"execucao{i}.log").write_text(content)
+    (root / ".gitignore").write_text("logs/\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "src", ".gitignore"], cwd=root, check=True)
+    return [f"{name}(" for name in names]
+
+
+def measure(backend, patterns: list[str], workdir: Path, repeat: int) -> tuple[float, int]:
+    """Retorna (melhor tempo em s, quantidade de linhas encontradas)."""
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in backend.search(patterns, workdir))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", type=Path, help="Repositório real (default: sintético)")
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        help="Padrão buscado no --workdir (pode repetir; default: 'return ')",
+    )
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.workdir:
+            workdir = args.workdir
+            patterns = args.pattern or ["return "]
+        else:
+            workdir = Path(tmp)
+            patterns = generate_repo(workdir, args.files, args.functions)
+
+        for name, backend_class in SEARCH_BACKENDS.items():
+            backend = backend_class()
+            if not backend.check_availability(workdir):
+                print(f"{name:10} indisponível")
+                continue
+            seconds, count = measure(backend, patterns, workdir, args.repeat)
+            print(f"{name:10} {seconds * 1000:8.1f} ms  {count:6} linhas")
+
+
+if __name__ == "__main__":
+    main()
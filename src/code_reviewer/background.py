@@ -0,0 +1,67 @@
+"""Tarefas em segundo plano durante o review.
+
+Etapas independentes da interação com o usuário (contexto, verificação do
+runner e de atualização) rodam enquanto a descrição é digitada e são
+aguardadas só quando o resultado é necessário.
+"""
+
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundTask(Generic[T]):
+    """Executa uma função em uma thread daemon e guarda o resultado.
+
+    A thread é daemon para que interromper o review (Ctrl+C, ``sys.exit``)
+    não espere a tarefa terminar. Exceções da função são relançadas por
+    result().
+    """
+
+    def __init__(
+        self, name: str, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> None:
+        """Inicia a tarefa.
+
+        Args:
+            name: Nome da tarefa (usado no nome da thread)
+            function: Função a executar
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+        """
+        self.name = name
+        self._result: Optional[T] = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(function, args, kwargs),
+            name=f"airev-{name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, function: Callable[..., T], args: tuple, kwargs: dict) -> None:
+        try:
+            self._result = function(*args, **kwargs)
+        except BaseException as e:
+            # Relançada em result(), na thread que aguarda a tarefa
+            self._error = e
+
+    def done(self) -> bool:
+        """Indica se a tarefa já terminou."""
+        return not self._thread.is_alive()
+
+    def result(self) -> T:
+        """Aguarda a tarefa e retorna o resultado.
+
+        Returns:
+            Valor retornado pela função
+
+        Raises:
+            BaseException: A exceção lançada pela função, se houver
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result  # type: ignore[return-value]
@@ -0,0 +1,59 @@
+"""Utilitários compartilhados pelos caches em disco (~/.cache/airev)."""
+
+import os
+from pathlib import Path
+
+CACHE_ROOT = Path.home() / ".cache" / "airev"
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Grava um arquivo de forma atômica (arquivo temporário + rename).
+
+    Args:
+        path: Caminho de destino
+        data: Conteúdo a gravar
+
+    Raises:
+        OSError: Se não for possível gravar
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def touch(path: Path) -> None:
+    """Marca uma entrada como usada recentemente (para a remoção LRU)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_lru(directory: Path, max_bytes: int, pattern: str = "*") -> None:
+    """Remove as entradas usadas há mais tempo até caber em ``max_bytes``.
+
+    A ordem de uso é dada pelo mtime, atualizado por touch() a cada leitura.
+
+    Args:
+        directory: Diretório do cache
+        max_bytes: Tamanho máximo do diretório
+        pattern: Glob dos arquivos considerados
+    """
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,624 @@
+"""Grafo de chamadas exato para projetos Python, via AST.
+
+A busca textual de ``context_builder`` confunde chamadas com comentários,
+strings e métodos homônimos de classes não relacionadas. Para arquivos
+Python, cada arquivo rastreado é parseado com ``ast`` e são extraídas as
+definições (com nome qualificado, ex: ``Classe.metodo``), os imports e as
+chamadas com o escopo de onde partem. As chamadas são resolvidas pelos
+nomes visíveis no arquivo: definições locais, imports (inclusive relativos
+e reexportados por ``__init__``) e ``self``/``cls`` dentro de classes.
+
+A extração fica em ~/.cache/airev/calls, indexada pelo SHA do blob, então
+só arquivos novos ou alterados são parseados de novo. Outras linguagens
+continuam com a busca textual.
+"""
+
+import ast
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import CACHE_ROOT, atomic_write_bytes, evict_lru, touch
+from .file_cache import FileCache
+from .models import DiffFile
+from .python_analysis import git_blob_sha, read_blob
+from .search.base import Deadline
+from .symbol_index import MAX_INDEXED_FILE_BYTES, MAX_SNIPPET_CHARS, list_indexable_files
+
+CALLS_CACHE_DIR = CACHE_ROOT / "calls"
+MAX_CALLS_CACHE_BYTES = 100 * 1024 * 1024
+
+# Incrementar ao mudar o formato das entradas ou a extração
+CALLS_CACHE_VERSION = 1
+
+# Profundidade máxima ao seguir reexportações (from .x import y em __init__)
+MAX_REEXPORT_DEPTH = 3
+
+SHA1_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# Receptores que se referem à classe que contém o método
+SELF_NAMES = ("self", "cls")
+
+# Tipos de definição
+KIND_FUNCTION = "function"
+KIND_CLASS = "class"
+
+# Cache em memória (SHA do blob -> extração), LRU limitado a
+# MAX_CALLS_MEMORY_ENTRIES: o processo pode revisar vários repositórios e
+# os arquivos que saem dele continuam no cache em disco
+MAX_CALLS_MEMORY_ENTRIES = 4096
+_calls_cache: OrderedDict[str, "FileCalls"] = OrderedDict()
+_calls_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Definition:
+    """Função, método ou classe definida em um arquivo."""
+
+    qualname: str
+    kind: str
+    line: int
+    snippet: str
+
+    @property
+    def name(self) -> str:
+        """Nome simples (último componente do nome qualificado)."""
+        return self.qualname.rpartition(".")[2]
+
+
+@dataclass(frozen=True)
+class ImportBinding:
+    """Nome local criado por um import.
+
+    ``import a.b as c`` vira (c, 0, "a.b", ""); ``from ..m import n as c``
+    vira (c, 2, "m", "n").
+    """
+
+    alias: str
+    level: int
+    module: str
+    name: str
+
+
+@dataclass(frozen=True)
+class CallSite:
+    """Chamada encontrada em um arquivo.
+
+    ``target`` é a expressão chamada em forma pontuada (``f``, ``mod.f``,
+    ``self.metodo``); chamadas sobre expressões arbitrárias guardam só o
+    atributo com um ponto na frente (``.metodo``).
+    """
+
+    scope: str
+    target: str
+    line: int
+    snippet: str
+
+
+@dataclass(frozen=True)
+class FileCalls:
+    """Definições, imports e chamadas extraídos de um arquivo Python."""
+
+    definitions: tuple[Definition, ...]
+    imports: tuple[ImportBinding, ...]
+    calls: tuple[CallSite, ...]
+
+
+def _call_target(node: ast.expr) -> Optional[str]:
+    """Converte a expressão chamada para a forma pontuada."""
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    if parts:
+        # Receptor desconhecido: obj().metodo(), lista[0].metodo()
+        return "." + parts[0]
+    return None
+
+
+def extract_file_calls(source: bytes) -> Optional[FileCalls]:
+    """Extrai definições, imports e chamadas de um arquivo Python.
+
+    Args:
+        source: Código-fonte Python
+
+    Returns:
+        FileCalls, ou None se o código não for Python válido
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines = source.decode("utf-8", errors="replace").splitlines()
+
+    def snippet(line: int) -> str:
+        if 0 < line <= len(lines):
+            return lines[line - 1].strip()[:MAX_SNIPPET_CHARS]
+        return ""
+
+    definitions: list[Definition] = []
+    imports: list[ImportBinding] = []
+    calls: list[CallSite] = []
+
+    def visit(node: ast.AST, scope: str) -> None:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            qualname = f"{scope}.{node.name}" if scope else node.name
+            kind = KIND_CLASS if isinstance(node, ast.ClassDef) else KIND_FUNCTION
+            definitions.append(Definition(qualname, kind, node.lineno, snippet(node.lineno)))
+
+            # Decorators, bases e defaults são avaliados no escopo de fora
+            outer: list[ast.AST] = list(node.decorator_list)
+            if isinstance(node, ast.ClassDef):
+                outer.extend([*node.bases, *node.keywords])
+            else:
+                outer.extend(d for d in (*node.args.defaults, *node.args.kw_defaults) if d)
+            for child in outer:
+                visit(child, scope)
+            for statement in node.body:
+                visit(statement, qualname)
+
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imports.append(ImportBinding(alias.asname, 0, alias.name, ""))
+                else:
+                    # import a.b cria o nome "a"
+                    head = alias.name.partition(".")[0]
+                    imports.append(ImportBinding(head, 0, head, ""))
+
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name != "*":
+                    imports.append(
+                        ImportBinding(
+                            alias.asname or alias.name,
+                            node.level,
+                            node.module or "",
+                            alias.name,
+                        )
+                    )
+
+        else:
+            if isinstance(node, ast.Call):
+                target = _call_target(node.func)
+                if target is not None:
+                    calls.append(CallSite(scope, target, node.lineno, snippet(node.lineno)))
+            for child in ast.iter_child_nodes(node):
+                visit(child, scope)
+
+    try:
+        visit(tree, "")
+    except RecursionError:
+        # Expressões aninhadas demais (normalmente código gerado)
+        return None
+    return FileCalls(tuple(definitions), tuple(imports), tuple(calls))
+
+
+def _calls_to_json(calls: FileCalls) -> dict:
+    """Serializa a extração para o cache em disco."""
+    return {
+        "version": CALLS_CACHE_VERSION,
+        "definitions": [[d.qualname, d.kind, d.line, d.snippet] for d in calls.definitions],
+        "imports": [[i.alias, i.level, i.module, i.name] for i in calls.imports],
+        "calls": [[c.scope, c.target, c.line, c.snippet] for c in calls.calls],
+    }
+
+
+def _calls_from_json(data: dict) -> Optional[FileCalls]:
+    """Reconstrói a extração do cache, ou None se inválida/de outra versão."""
+    if data.get("version") != CALLS_CACHE_VERSION:
+        return None
+    try:
+        return FileCalls(
+            tuple(Definition(*item) for item in data["definitions"]),
+            tuple(ImportBinding(*item) for item in data["imports"]),
+            tuple(CallSite(*item) for item in data["calls"]),
+        )
+    except (KeyError, TypeError):
+        return None
+
+
+def _remember_calls(blob_sha: str, calls: FileCalls) -> None:
+    """Guarda a extração no cache em memória, descartando as menos usadas."""
+    with _calls_cache_lock:
+        _calls_cache[blob_sha] = calls
+        _calls_cache.move_to_end(blob_sha)
+        while len(_calls_cache) > MAX_CALLS_MEMORY_ENTRIES:
+            _calls_cache.popitem(last=False)
+
+
+def _read_cached_calls(blob_sha: str) -> Optional[FileCalls]:
+    """Lê a extração de um blob do cache (memória, depois disco)."""
+    with _calls_cache_lock:
+        calls = _calls_cache.get(blob_sha)
+        if calls is not None:
+            _calls_cache.move_to_end(blob_sha)
+            return calls
+
+    path = CALLS_CACHE_DIR / f"{blob_sha}.json"
+    try:
+        calls = _calls_from_json(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return None
+    if calls is None:
+        return None
+
+    _remember_calls(blob_sha, calls)
+    touch(path)
+    return calls
+
+
+def _write_cached_calls(blob_sha: str, calls: FileCalls) -> None:
+    """Grava a extração de um blob no cache em memória e em disco."""
+    _remember_calls(blob_sha, calls)
+    try:
+        atomic_write_bytes(
+            CALLS_CACHE_DIR / f"{blob_sha}.json",
+            json.dumps(_calls_to_json(calls)).encode("utf-8"),
+        )
+    except OSError:
+        # Falha ao escrever cache - ignora silenciosamente
+        pass
+
+
+def load_file_calls(
+    path: str,
+    blob_sha: Optional[str] = None,
+    workdir: Optional[Path] = None,
+    file_cache: Optional[FileCache] = None,
+) -> Optional[FileCalls]:
+    """Obtém a extração de um arquivo Python, usando o cache.
+
+    Args:
+        path: Caminho do arquivo relativo à raiz do repositório
+        blob_sha: SHA completo do blob, se conhecido (default: working tree)
+        workdir: Diretório raiz do repositório
+        file_cache: Cache de arquivos do review
+
+    Returns:
+        FileCalls, ou None se o arquivo não puder ser lido/parseado
+    """
+    # Com o SHA completo, um acerto no cache dispensa ler o arquivo
+    if blob_sha and SHA1_PATTERN.match(blob_sha):
+        calls = _read_cached_calls(blob_sha)
+        if calls is not None:
+            return calls
+
+    content = read_blob(path, blob_sha, workdir, file_cache)
+    if content is None or len(content) > MAX_INDEXED_FILE_BYTES:
+        return None
+
+    sha = git_blob_sha(content)
+    calls = _read_cached_calls(sha)
+    if calls is not None:
+        return calls
+
+    calls = extract_file_calls(content)
+    if calls is None:
+        return None
+
+    _write_cached_calls(sha, calls)
+    return calls
+
+
+def module_name(path: str) -> str:
+    """Nome pontuado do módulo de um arquivo (``a/b/__init__.py`` -> ``a.b``)."""
+    parts = path[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+class PythonCallGraph:
+    """Grafo de chamadas resolvido entre as definições de um projeto Python.
+
+    Os nós são pares (arquivo, nome qualificado). Módulos importados são
+    localizados pelo caminho completo ou, como o diretório raiz do pacote
+    pode estar em ``src/``, por um sufixo único do caminho.
+    """
+
+    def __init__(self, files: dict[str, FileCalls]) -> None:
+        """Cria o grafo e resolve todas as chamadas.
+
+        Args:
+            files: Caminho do arquivo -> extração do arquivo
+        """
+        self.files = files
+        self._definitions: dict[tuple[str, str], Definition] = {}
+        self._names: dict[str, int] = {}
+        self._imports: dict[str, dict[str, ImportBinding]] = {}
+        self._modules: dict[str, str] = {}
+        self._suffixes: dict[str, list[str]] = {}
+
+        for path, calls in files.items():
+            for definition in calls.definitions:
+                self._definitions[(path, definition.qualname)] = definition
+                self._names[definition.name] = self._names.get(definition.name, 0) + 1
+            self._imports[path] = {binding.alias: binding for binding in calls.imports}
+
+            name = module_name(path)
+            self._modules[name] = path
+            parts = name.split(".")
+            for start in range(1, len(parts)):
+                self._suffixes.setdefault(".".join(parts[start:]), []).append(path)
+
+        self._callers: dict[tuple[str, str], list[tuple[str, CallSite]]] = {}
+        self._unresolved: dict[str, list[tuple[str, CallSite]]] = {}
+        self._resolved: dict[str, list[tuple[CallSite, tuple[str, str]]]] = {}
+
+        for path, calls in files.items():
+            resolved: list[tuple[CallSite, tuple[str, str]]] = []
+            for call in calls.calls:
+                target = self._resolve_call(path, call.scope, call.target)
+                if target is not None:
+                    self._callers.setdefault(target, []).append((path, call))
+                    resolved.append((call, target))
+                elif "." in call.target:
+                    attribute = call.target.rpartition(".")[2]
+                    self._unresolved.setdefault(attribute, []).append((path, call))
+            self._resolved[path] = resolved
+
+    def has_file(self, path: str) -> bool:
+        """Verifica se o arquivo faz parte do grafo (Python parseável)."""
+        return path in self.files
+
+    def _module_path(self, dotted: str) -> Optional[str]:
+        """Arquivo de um módulo pelo nome completo ou sufixo único."""
+        if dotted in self._modules:
+            return self._modules[dotted]
+        candidates = self._suffixes.get(dotted, [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _absolute_module(self, path: str, binding: ImportBinding) -> str:
+        """Nome completo do módulo de um import, resolvendo imports relativos."""
+        if not binding.level:
+            return binding.module
+        package = module_name(path).split(".")
+        if not path.endswith("__init__.py"):
+            package.pop()
+        if binding.level > 1:
+            package = package[: len(package) - (binding.level - 1)]
+        if binding.module:
+            package.extend(binding.module.split("."))
+        return ".".join(package)
+
+    def _resolve_name(
+        self, path: str, name: str, depth: int = 0
+    ) -> Optional[tuple[str, str, str]]:
+        """Resolve um nome de módulo de ``path``.
+
+        Returns:
+            ("def", arquivo, nome qualificado), ("module", nome do módulo, "")
+            ou None se o nome não for do projeto
+        """
+        if (path, name) in self._definitions:
+            return ("def", path, name)
+
+        binding = self._imports.get(path, {}).get(name)
+        if binding is None:
+            return None
+
+        module = self._absolute_module(path, binding)
+        if not binding.name:
+            return ("module", module, "")
+
+        module_path = self._module_path(module)
+        if module_path is not None and depth < MAX_REEXPORT_DEPTH:
+            resolved = self._resolve_name(module_path, binding.name, depth + 1)
+            if resolved is not None:
+                return resolved
+
+        submodule = f"{module}.{binding.name}" if module else binding.name
+        if self._module_path(submodule) is not None:
+            return ("module", submodule, "")
+        return None
+
+    def _enclosing_class(self, path: str, scope: str) -> Optional[str]:
+        """Classe mais interna que contém o escopo, se houver."""
+        parts = scope.split(".") if scope else []
+        for end in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:end])
+            definition = self._definitions.get((path, prefix))
+            if definition is not None and definition.kind == KIND_CLASS:
+                return prefix
+        return None
+
+    def _resolve_call(self, path: str, scope: str, target: str) -> Optional[tuple[str, str]]:
+        """Resolve a expressão chamada para (arquivo, nome qualificado)."""
+        parts = target.split(".")
+        if not parts[0]:
+            return None
+
+        if len(parts) == 2 and parts[0] in SELF_NAMES:
+            owner = self._enclosing_class(path, scope)
+            if owner is None:
+                return None
+            key = (path, f"{owner}.{parts[1]}")
+            return key if key in self._definitions else None
+
+        if len(parts) == 1:
+            # Funções aninhadas; o corpo de uma classe não é visível nos métodos
+            scope_parts = scope.split(".") if scope else []
+            for end in range(len(scope_parts), 0, -1):
+                prefix = ".".join(scope_parts[:end])
+                definition = self._definitions.get((path, prefix))
+                if definition is not None and definition.kind == KIND_CLASS:
+                    continue
+                key = (path, f"{prefix}.{target}")
+                if key in self._definitions:
+                    return key
+
+        resolved = self._resolve_name(path, parts[0])
+        if resolved is None:
+            return None
+
+        kind, location, qualname = resolved
+        if kind == "def":
+            key = (location, ".".join([qualname, *parts[1:]]))
+            return key if key in self._definitions else None
+
+        # Módulo: avança enquanto o próximo componente for um submódulo
+        module = location
+        index = 1
+        while index < len(parts) - 1 and self._module_path(f"{module}.{parts[index]}"):
+            module = f"{module}.{parts[index]}"
+            index += 1
+        module_path = self._module_path(module)
+        if module_path is None or index >= len(parts):
+            return None
+        key = (module_path, ".".join(parts[index:]))
+        return key if key in self._definitions else None
+
+    def definitions_named(self, path: str, name: str) -> list[Definition]:
+        """Definições de ``path`` cujo nome simples é ``name``."""
+        calls = self.files.get(path)
+        if calls is None:
+            return []
+        return [d for d in calls.definitions if d.name == name]
+
+    def callers(self, path: str, name: str) -> list[tuple[str, CallSite]]:
+        """Chamadas às funções de nome ``name`` definidas em ``path``.
+
+        Métodos chamados sobre objetos de tipo desconhecido
+        (``sessao.merge_base()``) só contam quando o nome do método é único
+        no projeto; caso contrário não há como saber a classe.
+
+        Args:
+            path: Arquivo da definição
+            name: Nome simples da função, método ou classe
+
+        Returns:
+            Lista de (arquivo, chamada), ordenada por arquivo e linha
+        """
+        found: dict[tuple[str, int], tuple[str, CallSite]] = {}
+        for definition in self.definitions_named(path, name):
+            for file, call in self.callers_of(path, definition.qualname):
+                found.setdefault((file, call.line), (file, call))
+        return [found[key] for key in sorted(found)]
+
+    def callers_of(self, path: str, qualname: str) -> list[tuple[str, CallSite]]:
+        """Chamadas a uma definição específica (ver callers).
+
+        Args:
+            path: Arquivo da definição
+            qualname: Nome qualificado da definição
+
+        Returns:
+            Lista de (arquivo, chamada), ordenada por arquivo e linha
+        """
+        definition = self._definitions.get((path, qualname))
+        if definition is None:
+            return []
+
+        found = list(self._callers.get((path, qualname), []))
+        if "." in qualname and self._names.get(definition.name) == 1:
+            found.extend(self._unresolved.get(definition.name, []))
+        return sorted(set(found), key=lambda item: (item[0], item[1].line))
+
+    def callees_of(self, path: str, qualname: str) -> list[tuple[str, Definition]]:
+        """Definições do projeto chamadas no corpo de uma definição.
+
+        Inclui chamadas de funções aninhadas na definição. Para uma classe,
+        considera o corpo de ``__init__`` (o que instanciá-la executa).
+
+        Args:
+            path: Arquivo da definição
+            qualname: Nome qualificado da definição
+
+        Returns:
+            Lista de (arquivo, definição) sem repetição, na ordem das chamadas
+        """
+        definition = self._definitions.get((path, qualname))
+        if definition is not None and definition.kind == KIND_CLASS:
+            qualname += ".__init__"
+
+        nested = qualname + "."
+        found: dict[tuple[str, str], tuple[str, Definition]] = {}
+        for call, target in self._resolved.get(path, []):
+            if call.scope != qualname and not call.scope.startswith(nested):
+                continue
+            if target not in found:
+                found[target] = (target[0], self._definitions[target])
+        return list(found.values())
+
+    def callees(
+        self, path: str, lines: Optional[set[int]] = None
+    ) -> list[tuple[str, Definition]]:
+        """Definições do projeto chamadas a partir de ``path``.
+
+        Args:
+            path: Arquivo de onde partem as chamadas
+            lines: Considera só chamadas nessas linhas (default: todas)
+
+        Returns:
+            Lista de (arquivo, definição) sem repetição, na ordem das chamadas
+        """
+        found: dict[tuple[str, str], tuple[str, Definition]] = {}
+        for call, target in self._resolved.get(path, []):
+            if lines is not None and call.line not in lines:
+                continue
+            if target not in found:
+                found[target] = (target[0], self._definitions[target])
+        return list(found.values())
+
+
+def build_call_graph(
+    root: Path,
+    diff_files: Optional[list[DiffFile]] = None,
+    file_cache: Optional[FileCache] = None,
+    deadline: Optional[Deadline] = None,
+) -> Optional[PythonCallGraph]:
+    """Constrói o grafo de chamadas dos arquivos Python rastreados.
+
+    Arquivos do diff são lidos na versão do diff (``new_blob``), para que as
+    linhas do grafo batam com as dos hunks, e passam por ``file_cache``
+    (o contexto do review lê os mesmos arquivos depois). Os demais são
+    lidos direto, para não ocupar o cache.
+
+    Args:
+        root: Raiz do repositório
+        diff_files: Arquivos parseados do diff
+        file_cache: Cache de arquivos do review
+        deadline: Prazo da construção (default: sem prazo)
+
+    Returns:
+        Grafo de chamadas do projeto, ou None se o ``deadline`` esgotar
+        antes de todos os arquivos serem lidos (um grafo parcial daria
+        callers incompletos como se fossem todos)
+
+    Raises:
+        subprocess.CalledProcessError: Se o comando git falhar
+    """
+    keys = {
+        path: key
+        for path, key in list_indexable_files(root).items()
+        if path.endswith(".py")
+    }
+    diff_paths: set[str] = set()
+    for diff_file in diff_files or []:
+        if diff_file.path.endswith(".py") and not diff_file.is_deleted:
+            keys[diff_file.path] = diff_file.new_blob or keys.get(diff_file.path, "")
+            diff_paths.add(diff_file.path)
+
+    files: dict[str, FileCalls] = {}
+    for path, key in keys.items():
+        if deadline is not None and deadline.expired:
+            return None
+        # O diff traz SHAs abreviados, que só servem para o cat-file
+        blob_sha = key if SHA1_PATTERN.match(key) else None
+        cache = file_cache if path in diff_paths else None
+        calls = load_file_calls(path, blob_sha, root, cache)
+        if calls is not None:
+            files[path] = calls
+
+    if files:
+        evict_lru(CALLS_CACHE_DIR, MAX_CALLS_CACHE_BYTES, "*.json")
+    return PythonCallGraph(files)
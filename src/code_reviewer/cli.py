@@ -9,17 +9,245 @@ import click
 
 from . import __version__
 from .analytics import shutdown_analytics, track_event
-from .context_builder import build_context_graph
+from .background import BackgroundTask
+from .call_graph import PythonCallGraph, build_call_graph
+from .context_builder import (
+    DEFAULT_CONTEXT_DEPTH,
+    MAX_CONTEXT_DEPTH,
+    build_context_graph,
+)
 from .description_input import get_description
-from .diff_parser import get_current_branch, get_git_diff, parse_diff
+from .diff_cache import compute_cache_key, load_cached_diff, store_cached_diff
+from .diff_parser import (
+    detect_moved_blocks,
+    load_ignore_patterns,
+    resolve_diff_workers,
+    stream_selected_diffs,
+    triage_diff,
+)
+from .file_cache import FileCache
 from .formatters.progress import ProgressReporter
 from .formatters.terminal import format_result
+from .git_objects import BlobReader
 from .i18n import get_available_languages, set_language, t
-from .models import ReviewSummary, Severity
+from .incremental import (
+    INCREMENTAL_CONTEXT_LINES,
+    carry_over_findings,
+    load_review_state,
+    merge_findings,
+    save_review_state,
+)
+from .models import ContextGraph, DiffFile, FileTriage, ReviewResult
 from .prompt_builder import build_prompt
-from .response_parser import parse_response
+from .python_analysis import resolve_python_functions
+from .repository import RepositorySession
+from .response_parser import parse_response, summarize_findings
+from .symbol_index import (
+    INDEX_FILE_NAME,
+    NoDefinitionCache,
+    SymbolIndex,
+    load_no_definition_cache,
+    load_symbol_index,
+    read_lookup_stats,
+    record_lookup_stats,
+    save_no_definition_cache,
+)
 from .runners import DEFAULT_RUNNER, RunnerNotFoundError, get_runner, list_runners
-from .updater import check_for_update, notify_update, run_upgrade
+from .search import (
+    AUTO_SEARCH_BACKEND,
+    SEARCH_DEADLINE,
+    Deadline,
+    RevisionBackend,
+    SearchBackend,
+    list_search_backends,
+    select_search_backend,
+)
+from .updater import UpdateInfo, check_for_update, notify_update, run_upgrade
+
+
+def _fetch_diff(
+    session: RepositorySession,
+    base: str,
+    context_lines: int,
+    diff_workers: int,
+    use_cache: bool,
+) -> tuple[list[FileTriage], list[DiffFile]]:
+    """Obtém triagem e arquivos parseados, reaproveitando o cache do diff.
+
+    Sem cache, o diff é obtido em duas fases: triagem via numstat e
+    patches só dos arquivos selecionados, parseados em streaming.
+    """
+    workdir = session.root
+    ignore_patterns = load_ignore_patterns(workdir)
+
+    cache_key = None
+    if use_cache:
+        cache_key = compute_cache_key(
+            session.merge_base(base),
+            session.head_sha,
+            context_lines,
+            ignore_patterns,
+        )
+        cached = load_cached_diff(cache_key)
+        if cached is not None:
+            return cached
+
+    triage = triage_diff(base, workdir, ignore_patterns)
+    selected = [entry.path for entry in triage if entry.is_reviewable]
+    old_paths = {
+        entry.path: entry.old_path
+        for entry in triage
+        if entry.is_reviewable and entry.old_path
+    }
+    diff_files = list(
+        stream_selected_diffs(
+            base,
+            selected,
+            workdir,
+            context_lines=context_lines,
+            workers=resolve_diff_workers(diff_workers, len(selected)),
+            old_paths=old_paths,
+        )
+    )
+
+    if cache_key is not None:
+        store_cached_diff(cache_key, triage, diff_files)
+
+    return triage, diff_files
+
+
+def _check_for_update_quietly() -> UpdateInfo | None:
+    """Verifica atualizações sem nunca falhar (usado em segundo plano)."""
+    try:
+        return check_for_update()
+    except Exception:
+        # Falha silenciosa - não bloqueia execução
+        return None
+
+
+def _build_context(
+    session: RepositorySession,
+    diff_files: list[DiffFile],
+    search_backend: SearchBackend,
+    file_cache: FileCache,
+    no_index: bool,
+    no_ast: bool,
+    context_depth: int,
+    context_deadline: float,
+) -> list[ContextGraph]:
+    """Constrói o contexto (backtracking) das funções modificadas.
+
+    Carrega o índice de símbolos (ou, sem ele, o cache de símbolos sem
+    definição) e o grafo de chamadas Python, e grava as estatísticas de
+    busca no cache do repositório. ``context_deadline`` é o prazo, em
+    segundos, de toda a etapa, contado a partir daqui, inclusive da
+    atualização do índice e do grafo de chamadas.
+    """
+    deadline = Deadline.after(context_deadline)
+
+    symbol_index: SymbolIndex | None = None
+    if not no_index and not deadline.expired:
+        try:
+            symbol_index, stats = load_symbol_index(session, deadline=deadline)
+        except Exception:
+            # Sem índice, as definições são buscadas com grep
+            symbol_index = None
+        else:
+            # Índice incompleto responderia "sem definição" para os
+            # arquivos que faltaram; a busca textual (já sem prazo)
+            # registra os callees pulados em skipped_lookups
+            if not stats.complete:
+                symbol_index = None
+
+    # Sem índice, lembra os símbolos que o grep não encontrou definidos
+    no_definitions: NoDefinitionCache | None = None
+    if symbol_index is None:
+        try:
+            no_definitions = load_no_definition_cache(session)
+        except Exception:
+            no_definitions = None
+
+    call_graph: PythonCallGraph | None = None
+    if not no_ast and not deadline.expired:
+        try:
+            # None se o prazo esgotar: callers e callees caem na busca
+            # textual, que registra o que foi pulado
+            call_graph = build_call_graph(
+                session.root, diff_files, file_cache, deadline
+            )
+        except Exception:
+            # Sem grafo, callers e callees de Python usam a busca textual
+            call_graph = None
+
+    context_graphs = build_context_graph(
+        diff_files,
+        session.root,
+        symbol_index,
+        search_backend,
+        call_graph,
+        file_cache,
+        deadline,
+        context_depth=context_depth,
+        no_definitions=no_definitions,
+    )
+
+    if symbol_index is not None:
+        record_lookup_stats(session, symbol_index)
+    if no_definitions is not None:
+        save_no_definition_cache(session, no_definitions)
+
+    return context_graphs
+
+
+def _emit_result(
+    result: ReviewResult,
+    reporter: ProgressReporter,
+    json_output: bool,
+    min_confidence: int,
+    context_graphs: list[ContextGraph],
+    show_deps: bool,
+    start_time: float,
+) -> None:
+    """Filtra os findings por confidence, registra métricas e exibe o resultado."""
+    # Filtra findings por confidence
+    if min_confidence > 1:
+        filtered_findings = [
+            f for f in result.findings if f.confidence >= min_confidence
+        ]
+
+        # Atualiza o resultado com findings filtrados e sumário recalculado
+        result = result.model_copy(
+            update={
+                "findings": filtered_findings,
+                "summary": summarize_findings(filtered_findings),
+            }
+        )
+
+    # Calcula tempo total
+    elapsed = time.perf_counter() - start_time
+
+    # Evento de review concluído com métricas
+    track_event("review_completed", {
+        "duration_s": round(elapsed, 2),
+        "files_count": result.files_analyzed,
+        "findings_total": result.summary.total,
+        "findings_critical": result.summary.critical,
+        "findings_warning": result.summary.warning,
+        "findings_info": result.summary.info,
+        "version": __version__,
+    })
+
+    # Output
+    if json_output:
+        click.echo(result.model_dump_json(indent=2))
+    else:
+        format_result(
+            result,
+            context_graphs=context_graphs if show_deps else None,
+            show_deps=show_deps,
+        )
+        reporter.print()
+        reporter.success(t("cli.analysis_complete", elapsed=elapsed))
 
 
 @click.group()
@@ -119,6 +347,57 @@ def main():
     default=False,
     help="Exibe grafo de dependências (callers/callees) das funções modificadas",
 )
+@click.option(
+    "--diff-workers",
+    type=click.IntRange(0, 64),
+    default=0,
+    help="Processos git paralelos para extrair o diff (default: 0 = automático).",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Ignora o cache do diff parseado (~/.cache/airev/diff)",
+)
+@click.option(
+    "--no-ast",
+    is_flag=True,
+    default=False,
+    help=(
+        "Desabilita a análise via AST de arquivos Python "
+        "(funções modificadas e grafo de chamadas)"
+    ),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Revisa só os commits desde o último review incremental desta branch",
+)
+@click.option(
+    "--no-index",
+    is_flag=True,
+    default=False,
+    help="Busca definições com grep em vez do índice de símbolos (veja 'airev index')",
+)
+@click.option(
+    "--search-backend",
+    type=click.Choice([AUTO_SEARCH_BACKEND, *list_search_backends()]),
+    default=AUTO_SEARCH_BACKEND,
+    help="Ferramenta de busca do backtracking de contexto (default: primeira disponível)",
+)
+@click.option(
+    "--context-depth",
+    type=click.IntRange(1, MAX_CONTEXT_DEPTH),
+    default=DEFAULT_CONTEXT_DEPTH,
+    help="Níveis de callers/callees no contexto (default: 1 = só chamadas diretas)",
+)
+@click.option(
+    "--context-deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=SEARCH_DEADLINE,
+    help=f"Prazo em segundos para todo o backtracking de contexto (default: {SEARCH_DEADLINE:g})",
+)
 def review(
     base: str,
     runner: str,
@@ -133,6 +412,14 @@ def review(
     min_confidence: int,
     context_lines: int,
     show_deps: bool,
+    diff_workers: int,
+    no_cache: bool,
+    no_ast: bool,
+    incremental: bool,
+    no_index: bool,
+    search_backend: str,
+    context_depth: int,
+    context_deadline: float,
 ):
     """Analisa o diff da branch atual contra a branch base.
 
@@ -159,6 +446,8 @@ def review(
         airev review --base main --context-lines 5  # Mais contexto no diff
 
         airev review --base main -C 0  # Sem linhas de contexto
+
+        airev review --base main --incremental  # Só commits novos (CI por push)
     """
     workdir = workdir or Path.cwd()
     start_time = time.perf_counter()
@@ -176,6 +465,7 @@ def review(
         "no_interactive": no_interactive,
         "min_confidence": min_confidence,
         "context_lines": context_lines,
+        "incremental": incremental,
         "version": __version__,
     })
 
@@ -197,52 +487,125 @@ def review(
         force_terminal=force_terminal,
     )
 
-    # Verifica atualizações (apenas em modo interativo)
+    # Verifica atualizações em segundo plano (apenas em modo interativo);
+    # a notificação é exibida depois da descrição
+    update_task = None
     if not json_output:
-        try:
-            update_info = check_for_update()
-            if update_info:
-                notify_update(update_info)
-        except Exception:
-            # Falha silenciosa - não bloqueia execução
-            pass
+        update_task = BackgroundTask("update-check", _check_for_update_quietly)
 
-    # Obtém o nome da branch atual
+    # Resolve raiz, HEAD e branch do repositório uma única vez
     try:
-        current_branch = get_current_branch(workdir)
+        session = RepositorySession.open(workdir)
+        current_branch = session.branch
     except Exception as e:
         track_event("review_failed", {"error_type": "branch_error", "version": __version__})
         reporter.error(t("cli.error_branch", error=e))
         sys.exit(1)
 
+    try:
+        context_search = select_search_backend(session.root, search_backend)
+    except ValueError as e:
+        reporter.error(t("cli.error_search_backend", error=e))
+        sys.exit(1)
+
     reporter.info(t("cli.analyzing", branch=current_branch, base=base))
 
-    # Obtém o diff
+    # Modo incremental: diff só desde o último HEAD revisado desta branch
+    previous_state = load_review_state(session, base) if incremental else None
+    diff_base = base
+    if previous_state is not None:
+        diff_base = previous_state.head_sha
+        context_lines = max(context_lines, INCREMENTAL_CONTEXT_LINES)
+        reporter.info(
+            t(
+                "cli.incremental_since",
+                sha=diff_base[:8],
+                count=len(previous_state.findings),
+            )
+        )
+
+    # Obtém o diff (cache ou git)
     with reporter.status(t("cli.getting_diff")):
         try:
-            diff_output = get_git_diff(base, workdir, context_lines=context_lines)
+            triage, diff_files = _fetch_diff(
+                session, diff_base, context_lines, diff_workers, use_cache=not no_cache
+            )
         except Exception as e:
             track_event("review_failed", {"error_type": "diff_error", "version": __version__})
             reporter.error(t("cli.error_diff", error=e))
             reporter.print(t("cli.error_diff_help", base=base))
             sys.exit(1)
 
-    if not diff_output.strip():
+    if not triage and previous_state is None:
         reporter.warning(t("cli.no_changes"))
         sys.exit(0)
 
-    # Parseia o diff
-    with reporter.status(t("cli.analyzing_diff")):
-        diff_files = parse_diff(diff_output)
+    # Exibe arquivos modificados e os descartados na triagem
+    if triage:
+        skipped = [entry for entry in triage if not entry.is_reviewable]
+        reporter.show_diff_files(diff_files, skipped=skipped)
 
     if not diff_files:
-        reporter.warning(t("cli.no_files"))
-        sys.exit(0)
+        if previous_state is None:
+            reporter.warning(t("cli.no_files"))
+            sys.exit(0)
+
+        # Nada novo para revisar: mantém os findings anteriores ainda válidos
+        reporter.info(t("cli.incremental_nothing_new"))
+        carried = carry_over_findings(previous_state.findings, diff_files)
+        save_review_state(session, base, carried)
+        result = ReviewResult(
+            branch=current_branch,
+            base=base,
+            files_analyzed=0,
+            findings=carried,
+            summary=summarize_findings(carried),
+        )
+        _emit_result(
+            result, reporter, json_output, min_confidence, [], show_deps, start_time
+        )
+        return
 
-    # Exibe arquivos modificados
-    reporter.show_diff_files(diff_files)
     reporter.show_diff_summary(diff_files)
 
+    # Arquivos lidos uma única vez até o fim do review, na versão do HEAD
+    # (a mesma do diff) por um único git cat-file --batch; a busca textual
+    # pesquisa a mesma versão
+    blob_reader = BlobReader(session.root)
+    file_cache = FileCache(session.root, blob_reader=blob_reader)
+    context_search = RevisionBackend(context_search, blob_reader)
+
+    # Código só movido de lugar não é reenviado ao modelo
+    detect_moved_blocks(diff_files)
+
+    # Corrige as funções modificadas de arquivos Python usando o AST
+    if not no_ast:
+        resolve_python_functions(diff_files, session.root, file_cache)
+
+    # Obtém o runner
+    try:
+        ai_runner = get_runner(runner)
+    except ValueError as e:
+        track_event("review_failed", {"error_type": "runner_not_found", "version": __version__})
+        reporter.error(t("cli.error_runner_invalid", error=e))
+        sys.exit(1)
+
+    # Contexto e verificação do runner não dependem da descrição: rodam em
+    # segundo plano enquanto o usuário a digita
+    context_task = BackgroundTask(
+        "context",
+        _build_context,
+        session,
+        diff_files,
+        context_search,
+        file_cache,
+        no_index,
+        no_ast,
+        context_depth,
+        context_deadline,
+    )
+    runner_task = BackgroundTask("runner-check", ai_runner.check_availability)
+
     # Obtém descrição das alterações (após mostrar diff para contexto)
     change_description = get_description(
         description_flag=description,
@@ -251,9 +614,25 @@ def review(
         reporter=reporter,
     )
 
-    # Constrói contexto (backtracking)
+    if update_task is not None:
+        update_info = update_task.result()
+        if update_info:
+            notify_update(update_info)
+
+    # Aguarda o contexto (backtracking)
     with reporter.status(t("cli.building_context")):
-        context_graphs = build_context_graph(diff_files, workdir)
+        try:
+            context_graphs = context_task.result()
+        finally:
+            # O contexto era o último leitor dos arquivos
+            blob_reader.close()
+
+    # Prazo esgotado: o review segue com o contexto parcial
+    incomplete = sum(1 for graph in context_graphs if graph.skipped_lookups)
+    if incomplete:
+        reporter.warning(
+            t("cli.context_deadline_reached", count=incomplete, seconds=context_deadline)
+        )
 
     # Exibe dependências encontradas
     if context_graphs:
@@ -272,16 +651,8 @@ def review(
             description=change_description,
         )
 
-    # Obtém o runner
-    try:
-        ai_runner = get_runner(runner)
-    except ValueError as e:
-        track_event("review_failed", {"error_type": "runner_not_found", "version": __version__})
-        reporter.error(t("cli.error_runner_invalid", error=e))
-        sys.exit(1)
-
     # Verifica disponibilidade do CLI
-    if not ai_runner.check_availability():
+    if not runner_task.result():
         track_event("review_failed", {"error_type": "runner_unavailable", "version": __version__})
         reporter.error(t("cli.error_runner_unavailable", runner=runner))
         reporter.print(t("cli.error_runner_help"))
@@ -314,55 +685,30 @@ def review(
             reporter.error(t("cli.error_execution", error=e))
             sys.exit(1)
 
-    # Filtra findings por confidence
-    if min_confidence > 1:
-        filtered_findings = [
-            f for f in result.findings if f.confidence >= min_confidence
-        ]
-
-        # Recalcula sumário com findings filtrados
-        critical = sum(1 for f in filtered_findings if f.severity == Severity.CRITICAL)
-        warning = sum(1 for f in filtered_findings if f.severity == Severity.WARNING)
-        info = sum(1 for f in filtered_findings if f.severity == Severity.INFO)
-
-        # Atualiza o resultado com findings filtrados
-        result = result.model_copy(
-            update={
-                "findings": filtered_findings,
-                "summary": ReviewSummary(
-                    total=len(filtered_findings),
-                    critical=critical,
-                    warning=warning,
-                    info=info,
-                ),
-            }
+    # Junta com os findings anteriores que continuam válidos
+    if incremental:
+        carried = (
+            carry_over_findings(previous_state.findings, diff_files)
+            if previous_state is not None
+            else []
         )
-
-    # Calcula tempo total
-    elapsed = time.perf_counter() - start_time
-
-    # Evento de review concluído com métricas
-    track_event("review_completed", {
-        "duration_s": round(elapsed, 2),
-        "files_count": len(diff_files),
-        "findings_total": result.summary.total,
-        "findings_critical": result.summary.critical,
-        "findings_warning": result.summary.warning,
-        "findings_info": result.summary.info,
-        "version": __version__,
-    })
-
-    # Output
-    if json_output:
-        click.echo(result.model_dump_json(indent=2))
-    else:
-        format_result(
-            result,
-            context_graphs=context_graphs if show_deps else None,
-            show_deps=show_deps,
+        findings = merge_findings(result.findings, carried)
+        result = result.model_copy(
+            update={"findings": findings, "summary": summarize_findings(findings)}
         )
-        reporter.print()
-        reporter.success(t("cli.analysis_complete", elapsed=elapsed))
+        # Sem resposta parseável o incremento não foi revisado de fato
+        if result.raw_response is None:
+            save_review_state(session, base, findings)
+
+    _emit_result(
+        result,
+        reporter,
+        json_output,
+        min_confidence,
+        context_graphs,
+        show_deps,
+        start_time,
+    )
 
 
 @main.command()
@@ -375,6 +721,50 @@ def runners():
         click.echo(f"  {available} {name}")
 
 
+@main.command()
+@click.option(
+    "--workdir",
+    "-w",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Diretório do repositório (default: diretório atual)",
+)
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    default=False,
+    help="Descarta o índice salvo e reconstrói do zero",
+)
+def index(workdir: Path | None, rebuild: bool):
+    """Constrói ou atualiza o índice de definições de símbolos do repositório.
+
+    O review atualiza o índice automaticamente; use este comando para
+    pré-construí-lo (ex: em uma etapa de cache do CI) e ver estatísticas.
+    """
+    try:
+        session = RepositorySession.open(workdir)
+        symbol_index, stats = load_symbol_index(session, rebuild=rebuild)
+    except Exception as e:
+        click.echo(f"Erro ao construir o índice: {e}", err=True)
+        sys.exit(1)
+
+    hits, misses = read_lookup_stats(session)
+
+    click.echo(f"Índice de símbolos: {session.cache_dir / INDEX_FILE_NAME}")
+    click.echo(
+        f"  Arquivos: {stats.files} "
+        f"({stats.reused} reaproveitados, {stats.parsed} parseados)"
+    )
+    click.echo(f"  Símbolos: {symbol_index.symbol_count}")
+    click.echo(f"  Arquivos de teste: {symbol_index.tests.file_count}")
+    click.echo(f"  Tempo: {stats.seconds:.2f}s")
+    if hits or misses:
+        rate = 100 * hits / (hits + misses)
+        click.echo(f"  Taxa de acerto: {rate:.1f}% ({hits}/{hits + misses} buscas)")
+    else:
+        click.echo("  Taxa de acerto: nenhuma busca registrada")
+
+
 @main.command()
 def upgrade():
     """Atualiza o airev para a versão mais recente."""
@@ -1,43 +1,60 @@
 """Context Builder - Backtracking de callers/callees."""
 
 import re
-import subprocess
+from contextlib import closing
 from pathlib import Path
-from typing import Optional
-
-from .models import ContextGraph, DiffFile, FunctionRef
-
-# Diretórios excluídos do backtracking
-EXCLUDED_DIRS = [
-    "node_modules",
-    "venv",
-    ".venv",
-    "env",
-    ".env",
-    ".git",
-    "__pycache__",
-    ".pytest_cache",
-    ".mypy_cache",
-    "dist",
-    "build",
-    ".tox",
-    ".eggs",
-    "*.egg-info",
-    "vendor",
-    "third_party",
-]
+from typing import TYPE_CHECKING, Optional
+
+from .definition_filter import (
+    builtin_method_names,
+    call_language,
+    is_external_call,
+    is_stdlib_module,
+)
+from .file_cache import FileCache
+from .import_resolver import ImportResolver
+from .models import (
+    ContextGraph,
+    ContextLookup,
+    DiffFile,
+    DiffHunk,
+    FunctionRef,
+    LineKind,
+)
+from .related_tests import MAX_TESTS_PER_FUNCTION, is_test_file
+from .search import (
+    SEARCH_DEADLINE,
+    Deadline,
+    SearchBackend,
+    select_search_backend,
+)
+
+if TYPE_CHECKING:
+    from .call_graph import PythonCallGraph
+    from .symbol_index import NoDefinitionCache, SymbolIndex
 
 # Limites para controlar tamanho do contexto
 MAX_REFS_PER_SYMBOL = 5
 MAX_CONTEXT_LINES = 10
 
+# Expansão transitiva (--context-depth): níveis além das chamadas diretas
+DEFAULT_CONTEXT_DEPTH = 1
+MAX_CONTEXT_DEPTH = 5
+# Novas referências por nível, em cada direção (callers e callees)
+MAX_REFS_PER_DEPTH = 10
+# Total de referências (todos os níveis) por função modificada
+MAX_CONTEXT_NODES = 40
+# Linhas examinadas acima de uma chamada para achar a função que a contém
+ENCLOSING_SCAN_LINES = 200
 
-def _build_grep_exclude_args() -> list[str]:
-    """Constrói argumentos de exclusão para o grep."""
-    args = []
-    for dir_pattern in EXCLUDED_DIRS:
-        args.extend(["--exclude-dir", dir_pattern])
-    return args
+# Nome chamado, com o receptor opcional (``obj.nome(``)
+CALL_PATTERN = re.compile(r"(?:(\w*)\s*\.\s*)?\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\(")
+# Fim de um literal de string antes de ``.metodo(`` (``"-".join(``)
+LITERAL_ENDINGS = ("\"", "'", "`")
+
+ENCLOSING_DEFINITION_PATTERN = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?(?:def|function|func)\s+([A-Za-z_]\w*)"
+)
 
 
 def _is_comment_line(line: str) -> bool:
@@ -53,189 +70,281 @@ def _is_comment_line(line: str) -> bool:
     )
 
 
+def _is_definition_line(function_name: str, content: str) -> bool:
+    """Verifica se a linha é a definição da própria função."""
+    return bool(
+        re.search(r"\bdef\s+" + function_name + r"\b", content)
+        or re.search(r"\bfunction\s+" + function_name + r"\b", content)
+    )
+
+
+def find_callers_batch(
+    function_names: list[str],
+    workdir: Optional[Path] = None,
+    search_backend: Optional[SearchBackend] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict[str, list[FunctionRef]]:
+    """Encontra chamadas a várias funções com uma única varredura do projeto.
+
+    Todos os padrões ``nome(`` são buscados de uma vez como strings fixas,
+    e cada linha encontrada é distribuída entre os nomes que ela contém.
+    Os filtros de comentário e de definição e o limite MAX_REFS_PER_SYMBOL
+    valem por função. Chamadas em arquivos de teste têm um limite próprio
+    (MAX_TESTS_PER_FUNCTION) e não contam para MAX_REFS_PER_SYMBOL. Assim
+    que todas as funções atingem o limite, a busca é encerrada sem esperar
+    a varredura do restante do projeto.
+
+    Args:
+        function_names: Nomes das funções a buscar
+        workdir: Diretório raiz do projeto
+        search_backend: Backend de busca (default: seleção automática)
+        deadline: Prazo da busca (default: SEARCH_DEADLINE a partir de agora)
+
+    Returns:
+        Dicionário nome -> referências onde a função é chamada (inclusive
+        em testes; ver _split_test_refs)
+    """
+    names = list(dict.fromkeys(name for name in function_names if name))
+    callers: dict[str, list[FunctionRef]] = {name: [] for name in names}
+    test_counts = dict.fromkeys(names, 0)
+    if not names:
+        return callers
+
+    root = Path(workdir or ".")
+    backend = search_backend or select_search_backend(root)
+    seen_locations: dict[str, set[tuple[str, int]]] = {name: set() for name in names}
+    pending = set(names)
+
+    with closing(backend.search([f"{name}(" for name in names], root, deadline)) as matches:
+        for match in matches:
+            # Ignora comentários
+            if _is_comment_line(match.content):
+                continue
+
+            location = (match.file, match.line)
+            for name in [name for name in pending if f"{name}(" in match.content]:
+                # Evita duplicatas
+                if location in seen_locations[name]:
+                    continue
+                seen_locations[name].add(location)
+
+                # Ignora definições da própria função
+                if _is_definition_line(name, match.content):
+                    continue
+
+                in_test = is_test_file(match.file)
+                if in_test and (
+                    test_counts[name] >= MAX_TESTS_PER_FUNCTION
+                    # ``def test_pagar(`` contém ``pagar(`` mas não o chama
+                    or ENCLOSING_DEFINITION_PATTERN.match(match.content)
+                ):
+                    continue
+
+                callers[name].append(
+                    FunctionRef(
+                        file=match.file,
+                        line=match.line,
+                        snippet=match.content.strip(),
+                    )
+                )
+
+                # Testes têm espaço próprio e não encerram a busca
+                if in_test:
+                    test_counts[name] += 1
+                    continue
+
+                # Limita quantidade de referências
+                if len(callers[name]) - test_counts[name] >= MAX_REFS_PER_SYMBOL:
+                    pending.discard(name)
+
+            # Referências suficientes: encerra a busca
+            if not pending:
+                break
+
+    return callers
+
+
 def find_callers(
     function_name: str,
     workdir: Optional[Path] = None,
+    search_backend: Optional[SearchBackend] = None,
+    deadline: Optional[Deadline] = None,
 ) -> list[FunctionRef]:
-    """Encontra chamadas a uma função no projeto via grep.
+    """Encontra chamadas a uma função no projeto.
 
     Args:
         function_name: Nome da função a buscar
         workdir: Diretório raiz do projeto
+        search_backend: Backend de busca (default: seleção automática)
+        deadline: Prazo da busca (default: SEARCH_DEADLINE a partir de agora)
 
     Returns:
         Lista de referências (FunctionRef) onde a função é chamada
     """
     if not function_name:
         return []
+    return find_callers_batch([function_name], workdir, search_backend, deadline)[
+        function_name
+    ]
 
-    # Busca por function_name( para pegar chamadas
-    pattern = f"{function_name}\\("
 
-    cmd = [
-        "grep",
-        "-rn",
-        "-E",
-        pattern,
-        ".",
-    ] + _build_grep_exclude_args()
+def _find_definitions(
+    symbols: set[str],
+    workdir: Optional[Path],
+    search_backend: Optional[SearchBackend],
+    deadline: Optional[Deadline],
+    no_definitions: Optional["NoDefinitionCache"] = None,
+) -> list[FunctionRef]:
+    """Busca a primeira definição de cada símbolo com uma única varredura.
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=workdir,
-            timeout=30,
-        )
-    except subprocess.TimeoutExpired:
-        return []
-    except FileNotFoundError:
+    Símbolos em ``no_definitions`` não são buscados; os que uma varredura
+    completa (sem encerramento antecipado nem prazo esgotado) não encontra
+    são acrescentados a ele.
+    """
+    if no_definitions is not None:
+        symbols = {symbol for symbol in symbols if symbol not in no_definitions}
+    if not symbols:
         return []
 
-    refs: list[FunctionRef] = []
-    seen_locations: set[tuple[str, int]] = set()
-
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            continue
-
-        # Formato: ./path/to/file.py:123:conteudo
-        match = re.match(r"^\.?/?(.+?):(\d+):(.+)$", line)
-        if not match:
-            continue
-
-        file_path = match.group(1)
-        line_num = int(match.group(2))
-        content = match.group(3)
-
-        # Evita duplicatas
-        if (file_path, line_num) in seen_locations:
-            continue
-        seen_locations.add((file_path, line_num))
-
-        # Ignora comentários
-        if _is_comment_line(content):
-            continue
+    root = Path(workdir or ".")
+    backend = search_backend or select_search_backend(root)
+    deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+    complete = True
 
-        # Ignora definições da própria função
-        if re.search(r"\bdef\s+" + function_name + r"\b", content):
-            continue
-        if re.search(r"\bfunction\s+" + function_name + r"\b", content):
-            continue
-
-        refs.append(
-            FunctionRef(
-                file=file_path,
-                line=line_num,
-                snippet=content.strip(),
-            )
-        )
-
-        # Limita quantidade de referências
-        if len(refs) >= MAX_REFS_PER_SYMBOL:
-            break
+    # Nomes mais longos primeiro para a alternação não parar em um prefixo
+    names = sorted(symbols, key=len, reverse=True)
+    definition_pattern = re.compile(
+        r"(?:def|class|function|func)\s+(" + "|".join(map(re.escape, names)) + r")\b"
+    )
 
-    return refs
+    found: dict[str, FunctionRef] = {}
+    with closing(backend.search(sorted(symbols), root, deadline)) as matches:
+        for match in matches:
+            for definition in definition_pattern.finditer(match.content):
+                symbol = definition.group(1)
+                # Apenas primeira definição por símbolo
+                if symbol not in found:
+                    found[symbol] = FunctionRef(
+                        file=match.file,
+                        line=match.line,
+                        snippet=match.content.strip(),
+                        function_name=symbol,
+                    )
+            # Definições suficientes (ou todas encontradas): encerra a busca
+            if len(found) >= min(MAX_REFS_PER_SYMBOL, len(symbols)):
+                complete = len(found) == len(symbols)
+                break
+
+    if no_definitions is not None and complete and not deadline.expired:
+        for symbol in symbols - found.keys():
+            no_definitions.add(symbol)
+
+    return list(found.values())[:MAX_REFS_PER_SYMBOL]
 
 
 def find_callees(
     added_lines: list[str],
     workdir: Optional[Path] = None,
+    symbol_index: Optional["SymbolIndex"] = None,
+    search_backend: Optional[SearchBackend] = None,
+    deadline: Optional[Deadline] = None,
+    no_definitions: Optional["NoDefinitionCache"] = None,
+    source_file: Optional[str] = None,
+    import_resolver: Optional[ImportResolver] = None,
 ) -> list[FunctionRef]:
     """Identifica novos símbolos usados nas linhas adicionadas e busca definições.
 
+    Com ``import_resolver``, cada chamada é primeiro resolvida pelos
+    imports de ``source_file``: nomes de módulos do projeto são procurados
+    só no arquivo do módulo, e nomes de pacotes externos não são buscados.
+    Do que sobra, palavras-chave e builtins da linguagem de ``source_file``
+    (e métodos builtin chamados em literais) são descartados (veja
+    definition_filter). O restante segue para o índice ou para a busca no
+    projeto. Com ``symbol_index``, cada
+    definição é um acesso ao índice; o índice cobre todos os arquivos
+    rastreados, então símbolo ausente nele é tratado como sem definição no
+    projeto (builtins, dependências). Sem índice, todos os símbolos são
+    buscados em uma única varredura, exceto os já registrados em
+    ``no_definitions``.
+
     Args:
         added_lines: Linhas adicionadas no diff
         workdir: Diretório raiz do projeto
+        symbol_index: Índice de definições (default: busca textual)
+        search_backend: Backend da busca textual (default: seleção automática)
+        deadline: Prazo da busca textual (default: SEARCH_DEADLINE a partir de agora)
+        no_definitions: Cache persistente de símbolos sem definição, usado
+            e atualizado pela busca textual
+        source_file: Arquivo das linhas adicionadas (para ``import_resolver``)
+        import_resolver: Resolvedor de imports (default: só índice/busca)
 
     Returns:
         Lista de referências às definições dos símbolos usados
     """
     # Extrai possíveis chamadas de função das linhas adicionadas
-    symbol_pattern = re.compile(r"\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\(")
     symbols: set[str] = set()
-
-    for line in added_lines:
-        matches = symbol_pattern.findall(line)
-        for match in matches:
-            # Ignora palavras-chave e funções builtin comuns
-            if match not in {
-                "if",
-                "for",
-                "while",
-                "with",
-                "except",
-                "print",
-                "len",
-                "str",
-                "int",
-                "float",
-                "list",
-                "dict",
-                "set",
-                "tuple",
-                "range",
-                "enumerate",
-                "zip",
-                "map",
-                "filter",
-                "sorted",
-                "reversed",
-                "isinstance",
-                "type",
-                "hasattr",
-                "getattr",
-                "setattr",
-            }:
-                symbols.add(match)
-
     refs: list[FunctionRef] = []
+    resolved: set[str] = set()
+    checked: set[tuple[Optional[str], str]] = set()
+    language = call_language(source_file)
 
-    for symbol in symbols:
-        # Busca definição: def symbol ou class symbol
-        pattern = f"(def|class|function|func)\\s+{symbol}\\b"
-
-        cmd = [
-            "grep",
-            "-rn",
-            "-E",
-            pattern,
-            ".",
-        ] + _build_grep_exclude_args()
-
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=workdir,
-                timeout=30,
+    for line in added_lines:
+        for match in CALL_PATTERN.finditer(line):
+            receiver, name = match.groups()
+            if name in resolved or (receiver, name) in checked:
+                continue
+            checked.add((receiver, name))
+
+            # Imports antes do filtro: ``runner.run(`` pode ser do projeto
+            if import_resolver is not None and source_file is not None:
+                resolution = import_resolver.resolve(source_file, name, receiver or None)
+                if resolution is not None:
+                    # Resolvido pelos imports (ou pacote externo): sem busca
+                    resolved.add(name)
+                    if not resolution.is_external:
+                        refs.append(
+                            FunctionRef(
+                                file=resolution.file,
+                                line=resolution.line,
+                                snippet=resolution.snippet,
+                                function_name=name,
+                            )
+                        )
+                    continue
+
+            # Ignora palavras-chave e builtins; métodos de tipos builtin e da
+            # biblioteca padrão só em literais (ou módulos, sem os imports)
+            builtin_receiver = receiver == "" and line[: match.start(1)].rstrip().endswith(
+                LITERAL_ENDINGS
             )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            continue
-
-        for line in result.stdout.strip().split("\n"):
-            if not line:
+            if import_resolver is None and is_stdlib_module(receiver):
+                builtin_receiver = True
+            if is_external_call(name, receiver, language, builtin_receiver):
                 continue
+            symbols.add(name)
 
-            match = re.match(r"^\.?/?(.+?):(\d+):(.+)$", line)
-            if not match:
-                continue
+    symbols -= resolved
+    if len(refs) >= MAX_REFS_PER_SYMBOL or not symbols:
+        return refs[:MAX_REFS_PER_SYMBOL]
 
-            file_path = match.group(1)
-            line_num = int(match.group(2))
-            content = match.group(3)
+    if symbol_index is None:
+        refs += _find_definitions(
+            symbols, workdir, search_backend, deadline, no_definitions
+        )
+        return refs[:MAX_REFS_PER_SYMBOL]
 
+    for symbol in symbols:
+        definitions = symbol_index.lookup(symbol)
+        if definitions:
+            definition = definitions[0]
             refs.append(
                 FunctionRef(
-                    file=file_path,
-                    line=line_num,
-                    snippet=content.strip(),
+                    file=definition.file,
+                    line=definition.line,
+                    snippet=definition.snippet,
                     function_name=symbol,
                 )
             )
-            break  # Apenas primeira definição por símbolo
 
         if len(refs) >= MAX_REFS_PER_SYMBOL:
             break
@@ -243,16 +352,24 @@ def find_callees(
     return refs
 
 
-def read_file_content(file_path: str, workdir: Optional[Path] = None) -> Optional[str]:
+def read_file_content(
+    file_path: str,
+    workdir: Optional[Path] = None,
+    file_cache: Optional[FileCache] = None,
+) -> Optional[str]:
     """Lê o conteúdo completo de um arquivo.
 
     Args:
         file_path: Caminho relativo do arquivo
-        workdir: Diretório raiz do projeto
+        workdir: Diretório raiz do projeto (ignorado com ``file_cache``)
+        file_cache: Cache de arquivos do review (default: lê do disco)
 
     Returns:
         Conteúdo do arquivo ou None se não existir
     """
+    if file_cache is not None:
+        return file_cache.read_text(file_path)
+
     full_path = Path(workdir or ".") / file_path
 
     try:
@@ -265,74 +382,484 @@ def get_context_around_line(
     file_path: str,
     line_number: int,
     workdir: Optional[Path] = None,
+    file_cache: Optional[FileCache] = None,
 ) -> str:
     """Obtém contexto ao redor de uma linha específica.
 
+    Com ``file_cache``, só a janela de linhas é decodificada, usando o
+    índice de linhas do arquivo.
+
     Args:
         file_path: Caminho do arquivo
         line_number: Número da linha central
-        workdir: Diretório raiz
+        workdir: Diretório raiz (ignorado com ``file_cache``)
+        file_cache: Cache de arquivos do review (default: cache descartável)
 
     Returns:
         Snippet com linhas ao redor
     """
-    content = read_file_content(file_path, workdir)
-    if not content:
-        return ""
+    cache = file_cache or FileCache(Path(workdir or "."))
+    half = MAX_CONTEXT_LINES // 2
+    return "\n".join(cache.lines(file_path, line_number - half, line_number + half))
 
-    lines = content.split("\n")
-    start = max(0, line_number - MAX_CONTEXT_LINES // 2 - 1)
-    end = min(len(lines), line_number + MAX_CONTEXT_LINES // 2)
 
-    return "\n".join(lines[start:end])
+def _graph_callers(
+    call_graph: "PythonCallGraph", path: str, function_name: str
+) -> list[FunctionRef]:
+    """Callers de uma função Python pelo grafo de chamadas (inclusive em testes)."""
+    return [
+        FunctionRef(
+            file=file,
+            line=call.line,
+            snippet=call.snippet,
+            function_name=call.scope or None,
+        )
+        for file, call in call_graph.callers(path, function_name)
+    ]
+
+
+def _split_test_refs(
+    refs: list[FunctionRef],
+) -> tuple[list[FunctionRef], list[FunctionRef]]:
+    """Separa as referências em arquivos de teste das demais.
+
+    Args:
+        refs: Referências encontradas (callers)
+
+    Returns:
+        Tupla (callers fora de testes, até MAX_REFS_PER_SYMBOL; chamadas
+        em testes, até MAX_TESTS_PER_FUNCTION)
+    """
+    callers = [ref for ref in refs if not is_test_file(ref.file)]
+    tests = [ref for ref in refs if is_test_file(ref.file)]
+    return callers[:MAX_REFS_PER_SYMBOL], tests[:MAX_TESTS_PER_FUNCTION]
+
+
+def _related_tests(
+    symbol_index: "SymbolIndex", path: str, function_name: str
+) -> list[FunctionRef]:
+    """Testes que chamam a função, pelo índice de testes relacionados.
+
+    Testes que não importam o módulo da função só entram se o nome for
+    distintivo: definido uma única vez no projeto e sem colidir com
+    métodos de tipos embutidos ou nomes da biblioteca padrão.
+    """
+    name = function_name.rsplit(".", 1)[-1]
+    distinctive = symbol_index.definition_count(name) == 1 and name not in (
+        builtin_method_names(call_language(path))
+    )
+    return [
+        FunctionRef(
+            file=test.file,
+            line=test.line,
+            snippet=test.snippet,
+            function_name=test.test,
+        )
+        for test in symbol_index.tests.lookup(name, path, distinctive=distinctive)
+    ]
+
+
+def _graph_callees(
+    call_graph: "PythonCallGraph", path: str, hunk: DiffHunk
+) -> list[FunctionRef]:
+    """Definições chamadas nas linhas adicionadas do hunk, pelo grafo de chamadas."""
+    added = {line for kind, line, _ in hunk.lines if kind == LineKind.ADDED}
+    return [
+        FunctionRef(
+            file=file,
+            line=definition.line,
+            snippet=definition.snippet,
+            function_name=definition.qualname,
+        )
+        for file, definition in call_graph.callees(path, added)[:MAX_REFS_PER_SYMBOL]
+    ]
+
+
+def _enclosing_definition(
+    file_cache: FileCache, path: str, line: int
+) -> Optional[str]:
+    """Nome da função que contém a linha, procurando a definição mais próxima acima.
+
+    Heurística textual (sem considerar indentação), usada só na expansão
+    transitiva para referências que vieram da busca textual.
+
+    Args:
+        file_cache: Cache de arquivos do review
+        path: Caminho do arquivo
+        line: Linha da referência
+
+    Returns:
+        Nome da função, ou None se nenhuma definição for encontrada
+    """
+    start = max(line - ENCLOSING_SCAN_LINES, 1)
+    for content in reversed(file_cache.lines(path, start, line)):
+        match = ENCLOSING_DEFINITION_PATTERN.match(content)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _next_callers(
+    frontier: list[FunctionRef],
+    call_graph: Optional["PythonCallGraph"],
+    workdir: Optional[Path],
+    search_backend: Optional[SearchBackend],
+    file_cache: FileCache,
+    deadline: Deadline,
+    expanded: set[tuple[str, str]],
+) -> list[FunctionRef]:
+    """Callers das funções que contêm as referências da fronteira.
+
+    Referências em arquivos do grafo de chamadas usam o AST; as demais
+    são resolvidas com uma única busca textual por nível. Funções já em
+    ``expanded`` são ignoradas; as expandidas agora são acrescentadas.
+    """
+    found: list[FunctionRef] = []
+    textual: list[str] = []
+
+    for ref in frontier:
+        # function_name de um caller do grafo é o escopo (nome qualificado)
+        name = ref.function_name or _enclosing_definition(
+            file_cache, ref.file, ref.line
+        )
+        if not name:
+            continue
+
+        in_graph = call_graph is not None and call_graph.has_file(ref.file)
+        # A busca textual é por nome, independente do arquivo
+        key = (ref.file if in_graph else "", name)
+        if key in expanded:
+            continue
+        expanded.add(key)
+
+        if call_graph is not None and in_graph:
+            calls = call_graph.callers_of(ref.file, name) or call_graph.callers(
+                ref.file, name.rsplit(".", 1)[-1]
+            )
+            # Testes ficam no espaço próprio (só das funções modificadas)
+            calls = [(file, call) for file, call in calls if not is_test_file(file)]
+            found.extend(
+                FunctionRef(
+                    file=file,
+                    line=call.line,
+                    snippet=call.snippet,
+                    function_name=call.scope or None,
+                )
+                for file, call in calls[:MAX_REFS_PER_SYMBOL]
+            )
+        else:
+            textual.append(name)
+
+    if textual and not deadline.expired:
+        by_name = find_callers_batch(textual, workdir, search_backend, deadline)
+        for refs in by_name.values():
+            for ref in _split_test_refs(refs)[0]:
+                found.append(
+                    ref.model_copy(
+                        update={
+                            "function_name": _enclosing_definition(
+                                file_cache, ref.file, ref.line
+                            )
+                        }
+                    )
+                )
+
+    return found
+
+
+def _next_callees(
+    frontier: list[FunctionRef],
+    call_graph: Optional["PythonCallGraph"],
+    expanded: set[tuple[str, str]],
+) -> list[FunctionRef]:
+    """Definições chamadas pelas definições da fronteira (só pelo grafo de chamadas)."""
+    found: list[FunctionRef] = []
+    if call_graph is None:
+        return found
+
+    for ref in frontier:
+        if not ref.function_name or not call_graph.has_file(ref.file):
+            continue
+        key = (ref.file, ref.function_name)
+        if key in expanded:
+            continue
+        expanded.add(key)
+        found.extend(
+            FunctionRef(
+                file=file,
+                line=definition.line,
+                snippet=definition.snippet,
+                function_name=definition.qualname,
+            )
+            for file, definition in call_graph.callees_of(ref.file, ref.function_name)[
+                :MAX_REFS_PER_SYMBOL
+            ]
+        )
+    return found
+
+
+def expand_context_graph(
+    graph: ContextGraph,
+    depth: int,
+    workdir: Optional[Path] = None,
+    search_backend: Optional[SearchBackend] = None,
+    call_graph: Optional["PythonCallGraph"] = None,
+    file_cache: Optional[FileCache] = None,
+    deadline: Optional[Deadline] = None,
+) -> ContextGraph:
+    """Acrescenta callers e callees indiretos ao grafo, até ``depth`` níveis.
+
+    Busca em largura a partir das referências diretas (nível 1): os
+    callers do nível N+1 chamam as funções que contêm os callers do nível
+    N; os callees do nível N+1 são chamados pelas definições do nível N.
+    Cada local aparece uma vez, cada função é expandida uma vez, e cada
+    nível acrescenta no máximo MAX_REFS_PER_DEPTH referências por direção,
+    até MAX_CONTEXT_NODES no total. Callees indiretos só são resolvidos
+    para arquivos do grafo de chamadas. Se o ``deadline`` esgotar, a
+    expansão para e ContextLookup.INDIRECT é registrado em
+    ``graph.skipped_lookups``.
+
+    Args:
+        graph: Grafo com as referências diretas
+        depth: Profundidade máxima (1 mantém o grafo como está)
+        workdir: Diretório raiz do projeto
+        search_backend: Backend da busca textual (default: seleção automática)
+        call_graph: Grafo de chamadas dos arquivos Python
+        file_cache: Cache de arquivos do review (default: cache descartável)
+        deadline: Prazo das buscas textuais (default: SEARCH_DEADLINE)
+
+    Returns:
+        O próprio ``graph``, com as referências indiretas anexadas
+    """
+    depth = min(depth, MAX_CONTEXT_DEPTH)
+    if depth <= 1:
+        return graph
+
+    cache = file_cache or FileCache(Path(workdir or "."))
+    deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+    budget = MAX_CONTEXT_NODES - len(graph.callers) - len(graph.callees)
+
+    # A própria função modificada e as referências diretas já estão no grafo
+    root_line = None
+    if call_graph is not None:
+        definitions = call_graph.definitions_named(graph.file, graph.function_name)
+        root_line = definitions[0].line if definitions else None
+    seen = {(ref.file, ref.line) for ref in graph.callers + graph.callees}
+    if root_line is not None:
+        seen.add((graph.file, root_line))
+    expanded_callers = {(graph.file, graph.function_name), ("", graph.function_name)}
+    expanded_callees = {(graph.file, graph.function_name)}
+
+    def admit(candidates: list[FunctionRef], level: int) -> list[FunctionRef]:
+        nonlocal budget
+        admitted: list[FunctionRef] = []
+        for ref in candidates:
+            if budget <= 0 or len(admitted) >= MAX_REFS_PER_DEPTH:
+                break
+            location = (ref.file, ref.line)
+            if location in seen:
+                continue
+            seen.add(location)
+            admitted.append(ref.model_copy(update={"depth": level}))
+            budget -= 1
+        return admitted
+
+    caller_frontier = list(graph.callers)
+    callee_frontier = list(graph.callees)
+
+    for level in range(2, depth + 1):
+        if not caller_frontier and not callee_frontier:
+            break
+        if deadline.expired:
+            graph.skipped_lookups.append(ContextLookup.INDIRECT)
+            break
+        if budget <= 0:
+            break
+
+        caller_frontier = admit(
+            _next_callers(
+                caller_frontier,
+                call_graph,
+                workdir,
+                search_backend,
+                cache,
+                deadline,
+                expanded_callers,
+            ),
+            level,
+        )
+        callee_frontier = admit(
+            _next_callees(callee_frontier, call_graph, expanded_callees), level
+        )
+        graph.callers.extend(caller_frontier)
+        graph.callees.extend(callee_frontier)
+
+        # A busca textual do nível pode ter sido interrompida
+        if deadline.expired:
+            graph.skipped_lookups.append(ContextLookup.INDIRECT)
+            break
+
+    return graph
 
 
 def build_context_graph(
     diff_files: list[DiffFile],
     workdir: Optional[Path] = None,
+    symbol_index: Optional["SymbolIndex"] = None,
+    search_backend: Optional[SearchBackend] = None,
+    call_graph: Optional["PythonCallGraph"] = None,
+    file_cache: Optional[FileCache] = None,
+    deadline: Optional[Deadline] = None,
+    context_depth: int = DEFAULT_CONTEXT_DEPTH,
+    no_definitions: Optional["NoDefinitionCache"] = None,
 ) -> list[ContextGraph]:
     """Constrói o grafo de contexto para todas as funções modificadas.
 
+    Funções definidas em arquivos presentes em ``call_graph`` usam as
+    chamadas resolvidas pelo AST; as demais usam a busca textual.
+
+    Chamadas em arquivos de teste vão para ``tests``, com limite próprio
+    (MAX_TESTS_PER_FUNCTION); com ``symbol_index``, os testes vêm do índice
+    de testes relacionados, construído na mesma varredura das definições.
+
+    Todas as buscas textuais dividem um único ``deadline``, e as de maior
+    valor rodam primeiro: callers das funções modificadas (uma varredura
+    para todas), depois as definições dos callees de cada função, na ordem
+    do diff, e por último os níveis indiretos. Ao esgotar o prazo, as
+    buscas restantes são puladas e os grafos saem com o que já foi
+    encontrado; ``skipped_lookups`` indica o que ficou incompleto.
+
     Args:
         diff_files: Arquivos parseados do diff
         workdir: Diretório raiz do projeto
+        symbol_index: Índice de definições usado para os callees e os testes
+        search_backend: Backend de busca (default: seleção automática)
+        call_graph: Grafo de chamadas dos arquivos Python (default: só busca textual)
+        file_cache: Cache de arquivos do review (default: cache só desta chamada)
+        deadline: Prazo total das buscas textuais (default: SEARCH_DEADLINE)
+        context_depth: Níveis de callers/callees (1 = só chamadas diretas;
+            veja expand_context_graph)
+        no_definitions: Cache de símbolos sem definição da busca textual
+            de callees (ver find_callees)
 
     Returns:
         Lista de ContextGraph para cada função modificada
     """
-    graphs: list[ContextGraph] = []
+    # Coleta todas as funções modificadas antes de buscar os callers
+    entries: list[tuple[DiffFile, DiffHunk, str]] = []
     seen_functions: set[tuple[str, str]] = set()
 
     for diff_file in diff_files:
-        # Lê conteúdo completo do arquivo
-        file_content = read_file_content(diff_file.path, workdir)
-
         for hunk in diff_file.hunks:
-            function_name = hunk.function_name
-            if not function_name:
-                continue
+            for function_name in hunk.function_names:
+                # Evita duplicatas
+                key = (diff_file.path, function_name)
+                if key in seen_functions:
+                    continue
+                seen_functions.add(key)
+                entries.append((diff_file, hunk, function_name))
+
+    def in_call_graph(diff_file: DiffFile, function_name: str) -> bool:
+        return call_graph is not None and bool(
+            call_graph.definitions_named(diff_file.path, function_name)
+        )
 
-            # Evita duplicatas
-            key = (diff_file.path, function_name)
-            if key in seen_functions:
-                continue
-            seen_functions.add(key)
-
-            # Encontra callers
-            callers = find_callers(function_name, workdir)
-
-            # Extrai linhas adicionadas para buscar callees
-            added_content = [line.content for line in hunk.added_lines]
-            callees = find_callees(added_content, workdir)
-
-            graphs.append(
-                ContextGraph(
-                    function_name=function_name,
-                    file=diff_file.path,
-                    callers=callers,
-                    callees=callees,
-                    file_content=file_content,
+    textual = [
+        (diff_file, hunk, function_name)
+        for diff_file, hunk, function_name in entries
+        if not in_call_graph(diff_file, function_name)
+    ]
+    if textual and search_backend is None:
+        search_backend = select_search_backend(Path(workdir or "."))
+    if deadline is None:
+        deadline = Deadline.after(SEARCH_DEADLINE)
+
+    # 1. Callers: uma única varredura do projeto para todas as funções
+    callers_by_name = find_callers_batch(
+        [function_name for _, _, function_name in textual],
+        workdir,
+        search_backend,
+        deadline,
+    )
+    callers_cut = deadline.expired
+
+    graphs: list[ContextGraph] = []
+    if file_cache is None:
+        file_cache = FileCache(Path(workdir or "."))
+    import_resolver = ImportResolver(file_cache)
+
+    # 2. Callees de cada função, na ordem do diff
+    for diff_file, hunk, function_name in entries:
+        skipped: list[ContextLookup] = []
+
+        if call_graph is not None and in_call_graph(diff_file, function_name):
+            callers, tests = _split_test_refs(
+                _graph_callers(call_graph, diff_file.path, function_name)
+            )
+            callees = _graph_callees(call_graph, diff_file.path, hunk)
+        else:
+            callers, tests = _split_test_refs(callers_by_name.get(function_name, []))
+            tests = [
+                ref.model_copy(
+                    update={
+                        "function_name": _enclosing_definition(
+                            file_cache, ref.file, ref.line
+                        )
+                    }
                 )
+                for ref in tests
+            ]
+            # Varredura interrompida antes de atingir o limite de referências
+            if callers_cut and len(callers) < MAX_REFS_PER_SYMBOL:
+                skipped.append(ContextLookup.CALLERS)
+
+            # Com o índice, os callees não dependem do prazo
+            if symbol_index is None and deadline.expired:
+                callees = []
+                skipped.append(ContextLookup.CALLEES)
+            else:
+                # Extrai linhas adicionadas para buscar callees
+                added_content = hunk.lines.contents(LineKind.ADDED)
+                callees = find_callees(
+                    added_content,
+                    workdir,
+                    symbol_index,
+                    search_backend,
+                    deadline,
+                    no_definitions,
+                    diff_file.path,
+                    import_resolver,
+                )
+                if symbol_index is None and deadline.expired:
+                    skipped.append(ContextLookup.CALLEES)
+
+        # O índice também acha testes que a varredura de callers não alcançou
+        if symbol_index is not None:
+            tests = _related_tests(symbol_index, diff_file.path, function_name) or tests
+
+        graphs.append(
+            ContextGraph(
+                function_name=function_name,
+                file=diff_file.path,
+                callers=callers,
+                callees=callees,
+                tests=tests,
+                # Conteúdo completo do arquivo (lido uma vez por review)
+                file_content=read_file_content(diff_file.path, file_cache=file_cache),
+                skipped_lookups=skipped,
             )
+        )
+
+    # 3. Níveis indiretos, com o prazo que sobrou
+    for graph in graphs:
+        expand_context_graph(
+            graph,
+            context_depth,
+            workdir,
+            search_backend,
+            call_graph,
+            file_cache,
+            deadline,
+        )
 
     return graphs
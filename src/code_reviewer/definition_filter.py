@@ -0,0 +1,249 @@
+"""Nomes chamados no diff que nunca são definições do projeto.
+
+``find_callees`` busca a definição de cada nome chamado nas linhas
+adicionadas. Palavras-chave, builtins e funções da biblioteca padrão
+não estão definidos no projeto: buscá-los só custa uma varredura que
+não encontra nada (ou encontra algo sem relação). Este módulo monta, uma vez por processo, o
+conjunto de nomes que não vale a pena buscar.
+
+Chamadas diretas (``nome(``) são descartadas só quando ``nome`` é
+palavra-chave ou builtin da linguagem do arquivo: uma função do projeto
+pode se chamar ``join`` (e ``fetch`` é um nome comum em Python).
+Chamadas em atributo (``obj.nome(``) também descartam métodos dos tipos
+builtin e nomes exportados pela biblioteca padrão, mas só quando o
+receptor é um literal ou um módulo da biblioteca padrão (``json.loads``,
+``"-".join``). Receptores importados são resolvidos antes pelo
+``ImportResolver``.
+"""
+
+import builtins
+import importlib
+import keyword
+import sys
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import Optional
+
+# Palavras-chave seguidas de "(" que a extração confundiria com chamadas
+JS_KEYWORDS = frozenset(
+    {
+        "await",
+        "case",
+        "catch",
+        "delete",
+        "do",
+        "else",
+        "function",
+        "if",
+        "in",
+        "instanceof",
+        "new",
+        "return",
+        "super",
+        "switch",
+        "throw",
+        "typeof",
+        "void",
+        "while",
+        "with",
+        "yield",
+    }
+)
+GO_KEYWORDS = frozenset(
+    {
+        "case",
+        "defer",
+        "else",
+        "for",
+        "func",
+        "go",
+        "if",
+        "range",
+        "return",
+        "select",
+        "switch",
+    }
+)
+
+# Funções globais de cada linguagem (além dos builtins do Python)
+JS_GLOBALS = frozenset(
+    {
+        "Array",
+        "Boolean",
+        "Date",
+        "Error",
+        "Map",
+        "Number",
+        "Object",
+        "Promise",
+        "RegExp",
+        "Set",
+        "String",
+        "Symbol",
+        "clearInterval",
+        "clearTimeout",
+        "decodeURIComponent",
+        "encodeURIComponent",
+        "fetch",
+        "isFinite",
+        "isNaN",
+        "parseFloat",
+        "parseInt",
+        "require",
+        "setInterval",
+        "setTimeout",
+    }
+)
+GO_BUILTINS = frozenset(
+    {
+        "append",
+        "cap",
+        "clear",
+        "close",
+        "complex",
+        "copy",
+        "delete",
+        "imag",
+        "len",
+        "make",
+        "max",
+        "min",
+        "new",
+        "panic",
+        "print",
+        "println",
+        "real",
+        "recover",
+    }
+)
+
+# Tipos builtin cujos métodos são descartados em chamadas de atributo
+BUILTIN_TYPES = (str, bytes, list, dict, set, frozenset, tuple, int, float, object)
+
+# Módulos da biblioteca padrão cujos nomes exportados são descartados em
+# chamadas de atributo (os mais usados e baratos de importar)
+STDLIB_MODULES = (
+    "base64",
+    "collections",
+    "copy",
+    "datetime",
+    "functools",
+    "glob",
+    "hashlib",
+    "io",
+    "itertools",
+    "json",
+    "logging",
+    "math",
+    "os",
+    "os.path",
+    "pathlib",
+    "random",
+    "re",
+    "shutil",
+    "string",
+    "subprocess",
+    "sys",
+    "tempfile",
+    "time",
+    "typing",
+    "urllib.parse",
+)
+
+# Linguagem das chamadas pela extensão do arquivo (tabelas de cada uma)
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".go": "go",
+    ".js": "js",
+    ".jsx": "js",
+    ".mjs": "js",
+    ".cjs": "js",
+    ".ts": "js",
+    ".tsx": "js",
+}
+
+
+def call_language(path: Optional[str]) -> Optional[str]:
+    """Linguagem do arquivo ("python", "js", "go"), ou None se desconhecida."""
+    if not path:
+        return None
+    return LANGUAGE_BY_EXTENSION.get(PurePosixPath(path).suffix)
+
+
+def is_stdlib_module(name: Optional[str]) -> bool:
+    """Indica se o nome é de um módulo de primeiro nível da biblioteca padrão."""
+    return bool(name) and name in sys.stdlib_module_names
+
+
+def _public_names(module_name: str) -> set[str]:
+    """Nomes públicos de um módulo da biblioteca padrão (vazio se indisponível)."""
+    if not is_stdlib_module(module_name.partition(".")[0]):
+        return set()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return set()
+    exported = getattr(module, "__all__", None)
+    names = exported if exported is not None else dir(module)
+    return {name for name in names if not name.startswith("_")}
+
+
+@lru_cache(maxsize=None)
+def bare_call_names(language: Optional[str] = None) -> frozenset[str]:
+    """Nomes que, chamados diretamente (``nome(``), nunca são do projeto.
+
+    Args:
+        language: Linguagem do arquivo (default: todas as tabelas)
+    """
+    names: set[str] = set()
+    if language in ("python", None):
+        names.update(keyword.kwlist, keyword.softkwlist, dir(builtins))
+    if language in ("js", None):
+        names.update(JS_KEYWORDS, JS_GLOBALS)
+    if language in ("go", None):
+        names.update(GO_KEYWORDS, GO_BUILTINS)
+    return frozenset(names)
+
+
+@lru_cache(maxsize=None)
+def builtin_method_names(language: Optional[str] = None) -> frozenset[str]:
+    """Nomes não buscados quando chamados em um literal ou módulo da stdlib.
+
+    Args:
+        language: Linguagem do arquivo (default: todas as tabelas)
+    """
+    names = set(bare_call_names(language))
+    if language in ("python", None):
+        for builtin_type in BUILTIN_TYPES:
+            names.update(name for name in dir(builtin_type) if not name.startswith("_"))
+        for module_name in STDLIB_MODULES:
+            names.update(_public_names(module_name))
+    return frozenset(names)
+
+
+def is_external_call(
+    name: str,
+    receiver: Optional[str] = None,
+    language: Optional[str] = None,
+    builtin_receiver: bool = False,
+) -> bool:
+    """Indica se a chamada certamente não é de uma definição do projeto.
+
+    Métodos de tipos builtin e nomes da biblioteca padrão só são
+    descartados quando se sabe que o receptor é builtin: em ``obj.get(``,
+    ``obj`` pode ser um objeto do projeto com um método ``get``.
+
+    Args:
+        name: Nome chamado
+        receiver: Texto antes do ponto em ``obj.nome(`` (None para chamada
+            direta; vazio se o receptor não for um identificador)
+        language: Linguagem do arquivo (ver call_language; default: todas)
+        builtin_receiver: O receptor é um literal ou um módulo da
+            biblioteca padrão
+
+    Returns:
+        True se a definição não deve ser buscada
+    """
+    if receiver is not None and builtin_receiver:
+        return name in builtin_method_names(language)
+    return name in bare_call_names(language)
@@ -0,0 +1,198 @@
+"""Cache persistente do diff parseado.
+
+Um ``git diff base...HEAD`` depende apenas dos commits envolvidos, então o
+resultado da triagem e dos patches parseados pode ser reaproveitado enquanto
+merge-base e HEAD não mudarem. As entradas ficam em ~/.cache/airev/diff,
+serializadas com marshal (formato binário compacto) e com remoção LRU
+quando o diretório passa de MAX_CACHE_BYTES.
+"""
+
+import hashlib
+import json
+import marshal
+import zlib
+from typing import Optional
+
+from .cache import CACHE_ROOT, atomic_write_bytes, evict_lru, touch
+from .diff_parser import MAX_FILE_CHANGED_LINES
+from .models import DiffFile, DiffHunk, FileTriage, HunkLines, TriageStatus
+
+CACHE_DIR = CACHE_ROOT / "diff"
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# Incrementar ao mudar o formato serializado ou o parser
+CACHE_FORMAT_VERSION = 3
+
+
+def compute_cache_key(
+    merge_base: str,
+    head: str,
+    context_lines: int,
+    ignore_patterns: list[str],
+    max_changed_lines: int = MAX_FILE_CHANGED_LINES,
+) -> str:
+    """Calcula a chave do cache a partir de tudo que afeta o diff parseado.
+
+    Args:
+        merge_base: SHA do merge-base entre a branch base e o HEAD
+        head: SHA do HEAD
+        context_lines: Linhas de contexto do diff
+        ignore_patterns: Padrões de ignore aplicados
+        max_changed_lines: Limite de linhas alteradas da triagem
+
+    Returns:
+        Hash hexadecimal que identifica a entrada
+    """
+    payload = json.dumps(
+        [
+            CACHE_FORMAT_VERSION,
+            merge_base,
+            head,
+            context_lines,
+            ignore_patterns,
+            max_changed_lines,
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _serialize(triage: list[FileTriage], diff_files: list[DiffFile]) -> bytes:
+    """Converte triagem e arquivos em tuplas de tipos primitivos."""
+    triage_state = tuple(
+        (entry.path, entry.old_path, entry.added, entry.removed, entry.status.value)
+        for entry in triage
+    )
+    files_state = tuple(
+        (
+            diff_file.path,
+            diff_file.is_new,
+            diff_file.is_deleted,
+            diff_file.old_path,
+            diff_file.similarity,
+            diff_file.is_copy,
+            diff_file.old_blob,
+            diff_file.new_blob,
+            tuple(
+                (
+                    hunk.function_name,
+                    hunk.start_line_old,
+                    hunk.start_line_new,
+                    hunk.lines.dump_state(),
+                )
+                for hunk in diff_file.hunks
+            ),
+        )
+        for diff_file in diff_files
+    )
+    data = marshal.dumps((CACHE_FORMAT_VERSION, triage_state, files_state))
+    return zlib.compress(data, 1)
+
+
+def _deserialize(raw: bytes) -> tuple[list[FileTriage], list[DiffFile]]:
+    """Reconstrói triagem e arquivos sem revalidar os modelos."""
+    version, triage_state, files_state = marshal.loads(zlib.decompress(raw))
+    if version != CACHE_FORMAT_VERSION:
+        raise ValueError(f"Versão de cache incompatível: {version}")
+
+    triage = [
+        FileTriage.model_construct(
+            path=path,
+            old_path=old_path,
+            added=added,
+            removed=removed,
+            status=TriageStatus(status),
+        )
+        for path, old_path, added, removed, status in triage_state
+    ]
+    diff_files = [
+        DiffFile.model_construct(
+            path=path,
+            is_new=is_new,
+            is_deleted=is_deleted,
+            old_path=old_path,
+            similarity=similarity,
+            is_copy=is_copy,
+            old_blob=old_blob,
+            new_blob=new_blob,
+            hunks=[
+                DiffHunk.model_construct(
+                    function_name=function_name,
+                    start_line_old=start_old,
+                    start_line_new=start_new,
+                    enclosing_functions=[],
+                    moved_blocks=[],
+                    lines=HunkLines.from_state(lines_state),
+                )
+                for function_name, start_old, start_new, lines_state in hunks
+            ],
+        )
+        for (
+            path,
+            is_new,
+            is_deleted,
+            old_path,
+            similarity,
+            is_copy,
+            old_blob,
+            new_blob,
+            hunks,
+        ) in files_state
+    ]
+    return triage, diff_files
+
+
+def load_cached_diff(key: str) -> Optional[tuple[list[FileTriage], list[DiffFile]]]:
+    """Lê uma entrada do cache.
+
+    Args:
+        key: Chave calculada por compute_cache_key
+
+    Returns:
+        Tupla (triagem, arquivos parseados) ou None se ausente/corrompida
+    """
+    path = CACHE_DIR / f"{key}.bin"
+
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        result = _deserialize(raw)
+    except (ValueError, TypeError, EOFError, zlib.error):
+        # Entrada corrompida ou de versão antiga
+        return None
+
+    touch(path)
+    return result
+
+
+def store_cached_diff(
+    key: str,
+    triage: list[FileTriage],
+    diff_files: list[DiffFile],
+    max_bytes: int = MAX_CACHE_BYTES,
+) -> None:
+    """Grava uma entrada no cache e remove as menos usadas se necessário.
+
+    Args:
+        key: Chave calculada por compute_cache_key
+        triage: Resultado da triagem
+        diff_files: Arquivos parseados
+        max_bytes: Tamanho máximo do diretório de cache
+    """
+    try:
+        atomic_write_bytes(CACHE_DIR / f"{key}.bin", _serialize(triage, diff_files))
+        evict_cache(max_bytes)
+    except OSError:
+        # Falha ao escrever cache - ignora silenciosamente
+        pass
+
+
+def evict_cache(max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """Remove as entradas usadas há mais tempo até caber em ``max_bytes``.
+
+    Args:
+        max_bytes: Tamanho máximo do diretório de cache
+    """
+    evict_lru(CACHE_DIR, max_bytes, "*.bin")
@@ -0,0 +1,214 @@
+"""Cache do conteúdo de arquivos compartilhado durante um review.
+
+Análise via AST, grafo de chamadas e construção do contexto leem os mesmos
+arquivos do working tree. Com um ``FileCache`` por review, cada arquivo é
+lido do disco no máximo uma vez (enquanto couber no teto de memória) e
+ganha um índice com o início de cada linha, então extrair uma janela de
+linhas custa proporcional à janela, não ao arquivo.
+
+Com um ``BlobReader``, o conteúdo vem da revisão do diff (HEAD) no banco
+de objetos do git, e o working tree só é lido para arquivos que não
+existem nela (ex: não rastreados).
+"""
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .git_objects import BlobReader
+
+# Teto de memória do cache (conteúdo + texto decodificado + índices)
+MAX_FILE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CachedFile:
+    """Conteúdo de um arquivo com o índice de linhas, montado sob demanda."""
+
+    content: bytes
+    _offsets: Optional[array] = field(default=None, repr=False)
+    _text: Optional[str] = field(default=None, repr=False)
+    _decoded: bool = field(default=False, repr=False)
+
+    @property
+    def offsets(self) -> array:
+        """Posição (em bytes) do início de cada linha, mais o fim do conteúdo.
+
+        As linhas são separadas por ``\\n``, como em ``str.split("\\n")``:
+        um arquivo terminado em ``\\n`` tem uma última linha vazia.
+        """
+        if self._offsets is None:
+            offsets = array("q", [0])
+            content = self.content
+            position = content.find(b"\n")
+            while position >= 0:
+                offsets.append(position + 1)
+                position = content.find(b"\n", position + 1)
+            offsets.append(len(content) + 1)
+            self._offsets = offsets
+        return self._offsets
+
+    @property
+    def text(self) -> Optional[str]:
+        """Conteúdo decodificado como UTF-8, ou None se não for UTF-8 válido."""
+        if not self._decoded:
+            try:
+                self._text = self.content.decode("utf-8")
+            except UnicodeDecodeError:
+                self._text = None
+            self._decoded = True
+        return self._text
+
+    @property
+    def size(self) -> int:
+        """Memória aproximada ocupada pela entrada."""
+        size = len(self.content)
+        if self._offsets is not None:
+            size += len(self._offsets) * self._offsets.itemsize
+        if self._text is not None:
+            size += len(self._text)
+        return size
+
+
+class FileCache:
+    """Cache LRU de arquivos de um repositório, com teto de memória.
+
+    Arquivos maiores que o teto são lidos normalmente, mas não guardados.
+    Arquivos inexistentes ou ilegíveis também não são guardados.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = MAX_FILE_CACHE_BYTES,
+        blob_reader: Optional[BlobReader] = None,
+    ) -> None:
+        """Cria o cache.
+
+        Args:
+            root: Diretório ao qual os caminhos são relativos
+            max_bytes: Teto de memória (default: MAX_FILE_CACHE_BYTES)
+            blob_reader: Leitor do banco de objetos do git; sem ele, os
+                arquivos são lidos do working tree
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.blob_reader = blob_reader
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Memória ocupada pelas entradas guardadas."""
+        return self._total
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def _account(self, path: str, entry: CachedFile) -> None:
+        """Atualiza o tamanho da entrada e remove as menos usadas se passar do teto."""
+        size = entry.size
+        self._total += size - self._sizes.get(path, 0)
+        self._sizes[path] = size
+
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            oldest, _ = self._entries.popitem(last=False)
+            self._total -= self._sizes.pop(oldest)
+            self.evictions += 1
+
+    def _read(self, path: str) -> Optional[bytes]:
+        """Lê o arquivo da revisão do leitor de blobs ou do working tree."""
+        if self.blob_reader is not None:
+            content = self.blob_reader.read_file(path)
+            if content is not None:
+                return content
+        try:
+            return (self.root / path).read_bytes()
+        except OSError:
+            return None
+
+    def get(self, path: str) -> Optional[CachedFile]:
+        """Obtém a entrada de um arquivo, lendo do disco se necessário.
+
+        Args:
+            path: Caminho relativo à raiz
+
+        Returns:
+            CachedFile, ou None se o arquivo não puder ser lido
+        """
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        content = self._read(path)
+        if content is None:
+            return None
+
+        entry = CachedFile(content)
+        if len(content) <= self.max_bytes:
+            self._entries[path] = entry
+            self._account(path, entry)
+        return entry
+
+    def read_bytes(self, path: str) -> Optional[bytes]:
+        """Conteúdo do arquivo, ou None se não puder ser lido."""
+        entry = self.get(path)
+        return entry.content if entry is not None else None
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Conteúdo do arquivo como texto, ou None se ilegível ou não UTF-8."""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        text = entry.text
+        if path in self._entries:
+            self._account(path, entry)
+        return text
+
+    def line_count(self, path: str) -> int:
+        """Quantidade de linhas (como ``len(texto.split("\\n"))``); 0 se ilegível."""
+        entry = self.get(path)
+        if entry is None:
+            return 0
+        count = len(entry.offsets) - 1
+        if path in self._entries:
+            self._account(path, entry)
+        return count
+
+    def lines(self, path: str, start: int, end: int) -> list[str]:
+        """Linhas ``start`` a ``end`` (1-based, inclusivo) do arquivo.
+
+        Só a janela pedida é decodificada.
+
+        Args:
+            path: Caminho relativo à raiz
+            start: Primeira linha
+            end: Última linha (limitada ao fim do arquivo)
+
+        Returns:
+            Linhas sem o ``\\n``; vazia se o arquivo não puder ser lido
+        """
+        entry = self.get(path)
+        if entry is None:
+            return []
+
+        offsets = entry.offsets
+        if path in self._entries:
+            self._account(path, entry)
+
+        start = max(start, 1)
+        end = min(end, len(offsets) - 1)
+        if start > end:
+            return []
+
+        window = entry.content[offsets[start - 1] : offsets[end] - 1]
+        return window.decode("utf-8", errors="replace").split("\n")
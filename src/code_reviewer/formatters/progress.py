@@ -12,7 +12,10 @@ from rich.console import Console
 from ..i18n import t
 
 if TYPE_CHECKING:
-    from code_reviewer.models import ContextGraph, DiffFile
+    from code_reviewer.models import ContextGraph, DiffFile, FileTriage
+
+# Máximo de arquivos ignorados listados individualmente
+MAX_SKIPPED_SHOWN = 10
 
 
 def is_ci_environment() -> bool:
@@ -158,21 +161,27 @@ class ProgressReporter:
 
         self.console.print(message)
 
-    def show_diff_files(self, files: list[DiffFile]) -> None:
+    def show_diff_files(
+        self,
+        files: list[DiffFile],
+        skipped: list[FileTriage] | None = None,
+    ) -> None:
         """Exibe lista de arquivos modificados com contagem de linhas.
 
         Args:
             files: Lista de arquivos do diff
+            skipped: Arquivos descartados na triagem, exibidos com o motivo
         """
         if not self.enabled:
             return
 
         self.console.print()
-        self.console.print(f"[bold]{t('progress.modified_files')}[/bold]")
+        if files:
+            self.console.print(f"[bold]{t('progress.modified_files')}[/bold]")
         for file in files:
             # Conta linhas adicionadas e removidas
-            added = sum(len(hunk.added_lines) for hunk in file.hunks)
-            removed = sum(len(hunk.removed_lines) for hunk in file.hunks)
+            added = sum(hunk.added_count for hunk in file.hunks)
+            removed = sum(hunk.removed_count for hunk in file.hunks)
 
             # Define cor baseada no status do arquivo
             if file.is_new:
@@ -184,8 +193,19 @@ class ProgressReporter:
 
             # Formata contagem de linhas
             changes = f"[green]+{added}[/green], [red]-{removed}[/red]"
+            if file.is_rename:
+                changes += f", {t('progress.renamed_from', path=file.old_path)}"
             self.console.print(f"  {status} {file.path} ({changes})")
 
+        if skipped:
+            self.console.print(f"[bold]{t('progress.skipped_files')}[/bold]")
+            for entry in skipped[:MAX_SKIPPED_SHOWN]:
+                reason = t(f"progress.skip_reason_{entry.status.value}")
+                self.console.print(f"  [dim]○ {entry.path} ({reason})[/dim]")
+            if len(skipped) > MAX_SKIPPED_SHOWN:
+                more = t("progress.more", count=len(skipped) - MAX_SKIPPED_SHOWN)
+                self.console.print(f"  [dim]({more})[/dim]")
+
     def show_diff_summary(self, files: list[DiffFile]) -> None:
         """Exibe resumo do diff (total de arquivos e linhas).
 
@@ -199,8 +219,8 @@ class ProgressReporter:
         total_removed = 0
 
         for file in files:
-            total_added += sum(len(hunk.added_lines) for hunk in file.hunks)
-            total_removed += sum(len(hunk.removed_lines) for hunk in file.hunks)
+            total_added += sum(hunk.added_count for hunk in file.hunks)
+            total_removed += sum(hunk.removed_count for hunk in file.hunks)
 
         summary = (
             f"[bold]{t('progress.files_label')}[/bold] {len(files)} | "
@@ -219,24 +239,41 @@ class ProgressReporter:
         if not self.enabled:
             return
 
-        # Coleta todos os callers e callees únicos
+        # Coleta todos os callers e callees diretos únicos
         all_callers: dict[str, set[str]] = {}  # arquivo -> set de funções
         all_callees: dict[str, set[str]] = {}  # arquivo -> set de funções
+        test_files: dict[str, None] = {}  # arquivos de teste, em ordem
+        # Níveis indiretos (--context-depth) são apenas contados
+        indirect_callers = 0
+        indirect_callees = 0
+        max_depth = 1
 
         for ctx in contexts:
+            for ref in ctx.callers + ctx.callees:
+                max_depth = max(max_depth, ref.depth)
+            indirect_callers += sum(1 for ref in ctx.callers if ref.depth > 1)
+            indirect_callees += sum(1 for ref in ctx.callees if ref.depth > 1)
+
             for caller in ctx.callers:
+                if caller.depth > 1:
+                    continue
                 if caller.file not in all_callers:
                     all_callers[caller.file] = set()
                 if caller.function_name:
                     all_callers[caller.file].add(caller.function_name)
 
+            for test in ctx.tests:
+                test_files[test.file] = None
+
             for callee in ctx.callees:
+                if callee.depth > 1:
+                    continue
                 if callee.file not in all_callees:
                     all_callees[callee.file] = set()
                 if callee.function_name:
                     all_callees[callee.file].add(callee.function_name)
 
-        has_deps = bool(all_callers or all_callees)
+        has_deps = bool(all_callers or all_callees or test_files)
 
         if not has_deps:
             self.console.print(f"[dim]  {t('progress.no_dependencies')}[/dim]")
@@ -270,3 +307,23 @@ class ProgressReporter:
                 self.console.print(
                     f"  [cyan]{t('progress.callees')}[/cyan] {shown} ({more})"
                 )
+
+        if test_files:
+            files = list(test_files)
+            if len(files) <= 3:
+                self.console.print(f"  [cyan]{t('progress.tests')}[/cyan] {', '.join(files)}")
+            else:
+                shown = ", ".join(files[:3])
+                more = t("progress.more", count=len(files) - 3)
+                self.console.print(
+                    f"  [cyan]{t('progress.tests')}[/cyan] {shown} ({more})"
+                )
+
+        if indirect_callers or indirect_callees:
+            indirect = t(
+                "progress.indirect",
+                depth=max_depth,
+                callers=indirect_callers,
+                callees=indirect_callees,
+            )
+            self.console.print(f"  [dim]{indirect}[/dim]")
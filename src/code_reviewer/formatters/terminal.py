@@ -189,7 +189,8 @@ def format_dependency_graph(graph: ContextGraph) -> str:
             connector = "└──" if is_last else "├──"
             location = _colorize(f"{caller.file}:{caller.line}", Colors.DIM)
             snippet = caller.snippet.strip()[:50] if caller.snippet else ""
-            lines.append(f"  {prefix}{connector} {location}     → {snippet}")
+            level = _depth_marker(caller.depth)
+            lines.append(f"  {prefix}{connector} {level}{location}     → {snippet}")
 
         if has_callees:
             lines.append("  │")
@@ -203,12 +204,18 @@ def format_dependency_graph(graph: ContextGraph) -> str:
             connector = "└──" if is_last else "├──"
             func_name = callee.function_name or "?"
             location = _colorize(f"{callee.file}:{callee.line}", Colors.DIM)
-            lines.append(f"      {connector} {func_name}     → {location}")
+            level = _depth_marker(callee.depth)
+            lines.append(f"      {connector} {level}{func_name}     → {location}")
 
     lines.append("")
     return "\n".join(lines)
 
 
+def _depth_marker(depth: int) -> str:
+    """Marcador do nível de referências indiretas (vazio para as diretas)."""
+    return _colorize(f"[{depth}] ", Colors.DIM) if depth > 1 else ""
+
+
 def format_file_header(file_path: str) -> str:
     """Formata o header de um arquivo.
 
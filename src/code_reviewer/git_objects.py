@@ -0,0 +1,217 @@
+"""Leitura de objetos do banco do git com um único processo.
+
+O diff do review compara o merge-base com o HEAD, mas ler os arquivos do
+working tree traz a versão local, que pode ter alterações não commitadas
+(linhas fora de lugar em relação ao diff) ou estar em um sistema de
+arquivos de rede lento. ``BlobReader`` mantém um ``git cat-file --batch``
+aberto durante o review e lê cada objeto (``HEAD:caminho`` ou um SHA de
+blob) pela mesma conexão, sem criar um processo por arquivo.
+
+Para que a busca textual e a resolução de imports vejam a mesma versão,
+o leitor também lista os arquivos da revisão e os que diferem dela no
+working tree (ver ``search.RevisionBackend``).
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Optional
+
+# Revisão lida por padrão (a mesma do lado novo do diff)
+DEFAULT_REVISION = "HEAD"
+
+
+class BlobReader:
+    """Lê blobs do repositório por um ``git cat-file --batch`` persistente.
+
+    O processo é iniciado na primeira leitura e reutilizado pelas
+    seguintes; as leituras são serializadas por um lock, então o leitor
+    pode ser compartilhado entre threads. Se o git não estiver disponível
+    ou o processo morrer, as leituras retornam None e quem chamou recorre
+    ao working tree.
+    """
+
+    def __init__(self, root: Path, revision: str = DEFAULT_REVISION) -> None:
+        """Cria o leitor.
+
+        Args:
+            root: Raiz do repositório
+            revision: Revisão usada por read_file (default: HEAD)
+        """
+        self.root = Path(root)
+        self.revision = revision
+        self.reads = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._failed = False
+        self._listings: dict[str, Optional[frozenset[str]]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _start(self) -> Optional[subprocess.Popen]:
+        """Inicia o processo na primeira leitura (None se não for possível)."""
+        if self._process is None and not self._failed:
+            try:
+                self._process = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.root,
+                )
+            except OSError:
+                self._failed = True
+        return self._process
+
+    def read(self, spec: str) -> Optional[bytes]:
+        """Lê o conteúdo de um blob.
+
+        Args:
+            spec: Nome do objeto para o git (``HEAD:caminho``, SHA do blob)
+
+        Returns:
+            Conteúdo do blob, ou None se o objeto não existir, não for um
+            blob ou não puder ser lido
+        """
+        if not spec or "\n" in spec:
+            return None
+        try:
+            # Caminhos não UTF-8 chegam do git com surrogateescape
+            request = spec.encode("utf-8", "surrogateescape") + b"\n"
+        except UnicodeEncodeError:
+            # Só este objeto fica sem leitura; o processo segue válido
+            return None
+
+        with self._lock:
+            process = self._start()
+            if process is None:
+                return None
+            assert process.stdin is not None and process.stdout is not None
+
+            try:
+                process.stdin.write(request)
+                process.stdin.flush()
+                header = process.stdout.readline()
+                content = self._read_object(header, process.stdout)
+            except (OSError, ValueError):
+                # Processo morto ou resposta fora do protocolo
+                self._failed = True
+                self._stop()
+                return None
+
+        self.reads += 1
+        return content
+
+    @staticmethod
+    def _read_object(header: bytes, stdout: IO[bytes]) -> Optional[bytes]:
+        """Lê o objeto anunciado pelo cabeçalho ``<sha> <tipo> <tamanho>``.
+
+        Raises:
+            ValueError: Se o cabeçalho não seguir o protocolo do --batch
+        """
+        if not header.endswith(b"\n"):
+            raise ValueError("saída do cat-file interrompida")
+
+        # "<spec> missing" / "<spec> ambiguous": nada mais a ler (o spec
+        # pode ter espaços, então o cabeçalho não é separado antes)
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+
+        fields = header.split()
+        if len(fields) != 3:
+            raise ValueError("cabeçalho inesperado do cat-file")
+        size = int(fields[2])
+        content = stdout.read(size + 1)
+        if len(content) != size + 1:
+            raise ValueError("saída do cat-file interrompida")
+        if fields[1] != b"blob":
+            return None
+        return content[:-1]
+
+    def read_file(self, path: str) -> Optional[bytes]:
+        """Lê um arquivo na revisão do leitor.
+
+        Args:
+            path: Caminho relativo à raiz do repositório
+
+        Returns:
+            Conteúdo do arquivo, ou None se ele não existir na revisão
+        """
+        return self.read(f"{self.revision}:{path}")
+
+    def paths(self) -> Optional[frozenset[str]]:
+        """Arquivos da revisão (``git ls-tree``), listados uma vez por leitor.
+
+        Returns:
+            Caminhos relativos à raiz, ou None se o git falhar
+        """
+        return self._list(
+            "paths", ["ls-tree", "-r", "-z", "--name-only", "--full-tree", self.revision]
+        )
+
+    def changed_paths(self) -> Optional[frozenset[str]]:
+        """Caminhos em que o working tree difere da revisão.
+
+        Inclui alterações no índice ou não e arquivos removidos do disco;
+        listados uma vez por leitor, com ``git diff --name-only``.
+
+        Returns:
+            Caminhos relativos à raiz, ou None se o git falhar
+        """
+        return self._list(
+            "changed", ["diff", "--name-only", "-z", "--no-renames", self.revision, "--"]
+        )
+
+    def _list(self, key: str, args: list[str]) -> Optional[frozenset[str]]:
+        """Executa um comando git que lista caminhos e guarda o resultado."""
+        with self._lock:
+            if key not in self._listings:
+                try:
+                    result = subprocess.run(
+                        ["git", *args],
+                        cwd=self.root,
+                        capture_output=True,
+                        check=True,
+                    )
+                except (OSError, subprocess.CalledProcessError):
+                    self._listings[key] = None
+                else:
+                    self._listings[key] = frozenset(
+                        path.decode("utf-8", errors="surrogateescape")
+                        for path in result.stdout.split(b"\0")
+                        if path
+                    )
+            return self._listings[key]
+
+    def _stop(self) -> None:
+        """Encerra o processo, se houver."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+        try:
+            # Com a entrada fechada, o cat-file termina sozinho
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def close(self) -> None:
+        """Encerra o processo. Uma leitura posterior inicia outro."""
+        with self._lock:
+            self._stop()
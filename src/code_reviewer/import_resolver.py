@@ -0,0 +1,387 @@
+"""Resolução de callees pelos imports do arquivo alterado (Python e JS/TS).
+
+Antes de varrer o projeto atrás da definição de um nome chamado no diff,
+``find_callees`` consulta os imports do próprio arquivo: ``from x.y import
+z``, ``import x.y as m``, ``import {z} from './y'``, ``require('./y')``.
+Se o nome vem de um módulo do projeto, só esse arquivo é lido (seguindo
+reexportações); se vem de um pacote externo (biblioteca padrão, pacote
+npm), não há definição a buscar. Nomes não importados são procurados
+primeiro no próprio arquivo. Só o que não se resolve assim vai para a
+busca no projeto inteiro.
+
+Os imports são lidos com expressões regulares (não com o AST), então a
+resolução também vale com ``--no-ast`` e para arquivos com erro de sintaxe.
+"""
+
+import posixpath
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Optional
+
+from .file_cache import FileCache
+
+# Limite de reexportações seguidas (from .b import x; export * from './c')
+MAX_REEXPORT_DEPTH = 3
+
+PYTHON_EXTENSIONS = (".py",)
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# Diretórios de código-fonte onde imports absolutos do Python são procurados
+PYTHON_SOURCE_ROOTS = ("", "src")
+
+# Receptores de métodos da própria classe, procurados no próprio arquivo
+SELF_RECEIVERS = ("self", "cls", "this")
+
+PY_FROM_IMPORT = re.compile(
+    r"^[ \t]*from[ \t]+(\.*)([\w.]*)[ \t]+import[ \t]+(\([^)]*\)|[^\n#;]+)", re.M
+)
+PY_IMPORT = re.compile(r"^[ \t]*import[ \t]+([^\n#;]+)", re.M)
+JS_IMPORT = re.compile(
+    r"\bimport[ \t]+(?:type[ \t]+)?(?:([\w$]+)[ \t]*,?[ \t]*)?"
+    r"(\{[^}]*\}|\*[ \t]*as[ \t]+[\w$]+)?[ \t]*from[ \t]*['\"]([^'\"]+)['\"]"
+)
+JS_EXPORT_FROM = re.compile(
+    r"\bexport[ \t]+(?:type[ \t]+)?(\{[^}]*\}|\*(?:[ \t]*as[ \t]+[\w$]+)?)"
+    r"[ \t]*from[ \t]*['\"]([^'\"]+)['\"]"
+)
+JS_REQUIRE = re.compile(
+    r"\b(?:const|let|var)[ \t]+(\{[^}]*\}|[\w$]+)[ \t]*=[ \t]*"
+    r"require\([ \t]*['\"]([^'\"]+)['\"][ \t]*\)"
+)
+ALIAS_SEPARATOR = re.compile(r"\s+as\s+|\s*:\s*")
+
+# Export default (ES modules) ou module.exports (CommonJS)
+DEFAULT_EXPORT_PATTERN = re.compile(
+    r"^[ \t]*(?:export[ \t]+default\b|module\.exports[ \t]*=)", re.M
+)
+
+# Nome do export default em ImportTarget.name
+DEFAULT_EXPORT = "default"
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    """Origem de um nome importado.
+
+    ``name`` é o nome no módulo de origem, ou None quando o próprio módulo
+    foi importado (``import x.y as m``, ``import * as m``). ``level`` é a
+    quantidade de pontos de um import relativo do Python.
+    """
+
+    language: str
+    module: str
+    name: Optional[str]
+    level: int = 0
+
+
+@dataclass
+class FileImports:
+    """Imports de um arquivo: nome local -> origem, mais os ``import *``."""
+
+    bindings: dict[str, ImportTarget] = field(default_factory=dict)
+    star: list[ImportTarget] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CalleeResolution:
+    """Resultado da resolução de um nome chamado.
+
+    ``file`` None indica nome de pacote externo: não há definição no projeto.
+    """
+
+    file: Optional[str]
+    line: int = 0
+    snippet: str = ""
+
+    @property
+    def is_external(self) -> bool:
+        return self.file is None
+
+
+EXTERNAL = CalleeResolution(None)
+
+
+def file_language(path: str) -> Optional[str]:
+    """Linguagem cujos imports são entendidos ("python", "js"), ou None."""
+    suffix = PurePosixPath(path).suffix
+    if suffix in PYTHON_EXTENSIONS:
+        return "python"
+    if suffix in JS_EXTENSIONS:
+        return "js"
+    return None
+
+
+def _split_names(raw: str) -> list[tuple[str, str]]:
+    """Lista ``a, b as c`` (ou ``{a, b: c}``) em pares (nome original, nome local)."""
+    names: list[tuple[str, str]] = []
+    for item in raw.strip("(){} \t\n").replace("\\", " ").split(","):
+        item = item.strip()
+        if item.startswith("type "):
+            item = item[5:].strip()
+        if not item:
+            continue
+        parts = ALIAS_SEPARATOR.split(item, maxsplit=1)
+        original = parts[0].strip()
+        local = parts[-1].strip()
+        if original and local:
+            names.append((original, local))
+    return names
+
+
+def parse_python_imports(text: str) -> FileImports:
+    """Extrai os imports de um arquivo Python."""
+    imports = FileImports()
+    for match in PY_FROM_IMPORT.finditer(text):
+        level = len(match.group(1))
+        module = match.group(2)
+        for original, local in _split_names(match.group(3)):
+            target = ImportTarget("python", module, original, level)
+            if original == "*":
+                imports.star.append(target)
+            else:
+                imports.bindings[local] = target
+
+    for match in PY_IMPORT.finditer(text):
+        for original, local in _split_names(match.group(1)):
+            # "import a.b" associa só "a"; "import a.b as m" associa o módulo a.b
+            if original == local:
+                original = local = original.split(".")[0]
+            imports.bindings[local] = ImportTarget("python", original, None)
+    return imports
+
+
+def parse_js_imports(text: str) -> FileImports:
+    """Extrai imports, reexportações e ``require`` de um arquivo JS/TS."""
+    imports = FileImports()
+
+    def bind_list(raw: str, module: str) -> None:
+        for original, local in _split_names(raw):
+            imports.bindings[local] = ImportTarget("js", module, original)
+
+    for match in JS_IMPORT.finditer(text):
+        default, names, module = match.groups()
+        if default:
+            imports.bindings[default] = ImportTarget("js", module, DEFAULT_EXPORT)
+        if names and names.startswith("*"):
+            imports.bindings[names.split()[-1]] = ImportTarget("js", module, None)
+        elif names:
+            bind_list(names, module)
+
+    for match in JS_EXPORT_FROM.finditer(text):
+        names, module = match.groups()
+        if names.startswith("{"):
+            bind_list(names, module)
+        elif names == "*":
+            imports.star.append(ImportTarget("js", module, None))
+        else:
+            # export * as ns from './x'
+            imports.bindings[names.split()[-1]] = ImportTarget("js", module, None)
+
+    for match in JS_REQUIRE.finditer(text):
+        names, module = match.groups()
+        if names.startswith("{"):
+            bind_list(names, module)
+        else:
+            imports.bindings[names] = ImportTarget("js", module, None)
+    return imports
+
+
+def _definition_pattern(name: str) -> re.Pattern[str]:
+    """Linha que define ``name`` (def/class/function/func ou const/let/var =)."""
+    if name == DEFAULT_EXPORT:
+        return DEFAULT_EXPORT_PATTERN
+    escaped = re.escape(name)
+    return re.compile(
+        rf"^[ \t]*(?:export[ \t]+(?:default[ \t]+)?)?(?:async[ \t]+)?"
+        rf"(?:def|class|function\*?|func)[ \t]+{escaped}\b"
+        rf"|^[ \t]*(?:export[ \t]+)?(?:const|let|var)[ \t]+{escaped}\b[^=\n]*=",
+        re.M,
+    )
+
+
+class ImportResolver:
+    """Resolve nomes chamados em um arquivo para a definição no projeto.
+
+    Imports de cada arquivo e a existência de cada módulo candidato são
+    memorizados; o conteúdo vem do ``FileCache`` do review.
+    """
+
+    def __init__(self, file_cache: FileCache) -> None:
+        """Cria o resolvedor.
+
+        Args:
+            file_cache: Cache de arquivos do review (define a raiz do projeto)
+        """
+        self.file_cache = file_cache
+        self._imports: dict[str, FileImports] = {}
+        self._exists: dict[str, bool] = {}
+
+    def _file_imports(self, path: str) -> FileImports:
+        imports = self._imports.get(path)
+        if imports is None:
+            text = self.file_cache.read_text(path) or ""
+            language = file_language(path)
+            if language == "python":
+                imports = parse_python_imports(text)
+            elif language == "js":
+                imports = parse_js_imports(text)
+            else:
+                imports = FileImports()
+            self._imports[path] = imports
+        return imports
+
+    def _is_file(self, path: str) -> bool:
+        exists = self._exists.get(path)
+        if exists is None:
+            # Os módulos existem na revisão lida pelo cache, não no disco
+            reader = self.file_cache.blob_reader
+            paths = reader.paths() if reader is not None else None
+            if paths is not None:
+                exists = path in paths
+            else:
+                exists = (self.file_cache.root / path).is_file()
+            self._exists[path] = exists
+        return exists
+
+    def _is_external(self, target: ImportTarget) -> bool:
+        """Módulo de fora do projeto (biblioteca padrão ou pacote npm)."""
+        if target.language == "python":
+            top_level = target.module.split(".")[0]
+            return not target.level and top_level in sys.stdlib_module_names
+        # Sem ./ nem /: pacote (aliases como @/ e ~/ dependem da configuração)
+        return not target.module.startswith((".", "/", "@/", "~/", "#"))
+
+    def _python_module_file(self, importer: str, level: int, module: str) -> Optional[str]:
+        parts = [part for part in module.split(".") if part]
+        if level:
+            base = PurePosixPath(importer).parent
+            for _ in range(level - 1):
+                base = base.parent
+            prefixes = [base.joinpath(*parts)]
+        else:
+            prefixes = [PurePosixPath(root, *parts) for root in PYTHON_SOURCE_ROOTS]
+
+        for prefix in prefixes:
+            for candidate in (f"{prefix}.py", f"{prefix}/__init__.py"):
+                candidate = posixpath.normpath(candidate)
+                if not candidate.startswith("..") and self._is_file(candidate):
+                    return candidate
+        return None
+
+    def _js_module_file(self, importer: str, module: str) -> Optional[str]:
+        if not module.startswith("."):
+            return None
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), module))
+        if base.startswith(".."):
+            return None
+
+        candidates = [base]
+        candidates += [base + extension for extension in JS_EXTENSIONS]
+        candidates += [f"{base}/index{extension}" for extension in JS_EXTENSIONS]
+        # TypeScript importa "./x.js" para o fonte "./x.ts"
+        stem, extension = posixpath.splitext(base)
+        if extension in (".js", ".jsx", ".mjs", ".cjs"):
+            candidates += [stem + ".ts", stem + ".tsx"]
+
+        for candidate in candidates:
+            if self._is_file(candidate):
+                return candidate
+        return None
+
+    def _module_file(self, importer: str, target: ImportTarget) -> Optional[str]:
+        """Arquivo do módulo de origem de um import, se for do projeto."""
+        if target.language == "python":
+            return self._python_module_file(importer, target.level, target.module)
+        return self._js_module_file(importer, target.module)
+
+    def _submodule_file(self, importer: str, target: ImportTarget) -> Optional[str]:
+        """Arquivo de ``from pacote import modulo`` (só Python)."""
+        if target.language != "python" or not target.name:
+            return None
+        module = f"{target.module}.{target.name}" if target.module else target.name
+        return self._python_module_file(importer, target.level, module)
+
+    def find_definition(self, path: str, name: str) -> Optional[CalleeResolution]:
+        """Procura a definição de ``name`` diretamente em ``path``."""
+        text = self.file_cache.read_text(path)
+        if not text:
+            return None
+        match = _definition_pattern(name).search(text)
+        if match is None:
+            return None
+
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line_end = text.find("\n", match.start())
+        snippet = text[line_start : line_end if line_end >= 0 else len(text)]
+        line = text.count("\n", 0, match.start()) + 1
+        return CalleeResolution(path, line, snippet.strip())
+
+    def _lookup(self, path: str, name: str, depth: int = 0) -> Optional[CalleeResolution]:
+        """Definição de ``name`` no módulo ``path``, seguindo reexportações."""
+        found = self.find_definition(path, name)
+        if found is not None or depth >= MAX_REEXPORT_DEPTH:
+            return found
+
+        imports = self._file_imports(path)
+        candidates: list[tuple[ImportTarget, str]] = []
+        target = imports.bindings.get(name)
+        if target is not None and target.name is not None:
+            candidates.append((target, target.name))
+        candidates.extend((star, name) for star in imports.star)
+
+        for target, original in candidates:
+            if self._is_external(target):
+                continue
+            module_path = self._module_file(path, target)
+            if module_path is not None:
+                found = self._lookup(module_path, original, depth + 1)
+                if found is not None:
+                    return found
+        return None
+
+    def resolve(
+        self, path: str, name: str, receiver: Optional[str] = None
+    ) -> Optional[CalleeResolution]:
+        """Resolve uma chamada feita em ``path``.
+
+        Args:
+            path: Arquivo onde a chamada aparece
+            name: Nome chamado
+            receiver: Identificador antes do ponto em ``obj.nome(`` (None
+                para chamada direta)
+
+        Returns:
+            Definição encontrada, EXTERNAL se o nome vem de um pacote
+            externo, ou None se só a busca no projeto pode responder
+        """
+        if file_language(path) is None:
+            # Sem leitura de imports: só a definição no próprio arquivo
+            return self.find_definition(path, name) if receiver is None else None
+
+        imports = self._file_imports(path)
+
+        if receiver is not None:
+            if receiver in SELF_RECEIVERS:
+                return self.find_definition(path, name)
+            target = imports.bindings.get(receiver)
+            if target is None:
+                return None
+            if self._is_external(target):
+                return EXTERNAL
+            if target.name is None:
+                module_path = self._module_file(path, target)
+            else:
+                # "from pacote import modulo; modulo.f()" (senão é um objeto)
+                module_path = self._submodule_file(path, target)
+            return self._lookup(module_path, name) if module_path else None
+
+        target = imports.bindings.get(name)
+        if target is not None and target.name is not None:
+            if self._is_external(target):
+                return EXTERNAL
+            module_path = self._module_file(path, target)
+            return self._lookup(module_path, target.name) if module_path else None
+
+        return self.find_definition(path, name)
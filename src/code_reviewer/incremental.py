@@ -0,0 +1,169 @@
+"""Review incremental: analisa só os commits desde o último HEAD revisado.
+
+Com ``--incremental``, o SHA do HEAD revisado e os findings resultantes são
+salvos por branch no cache do repositório. Na execução seguinte, se esse
+SHA ainda for ancestral do HEAD, o diff passa a ser ``último..HEAD`` e os
+findings anteriores são reaproveitados: os que caem em linhas alteradas
+desde então são descartados (o trecho é revisado de novo) e os demais têm
+a linha ajustada pelos hunks do novo diff.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from .cache import atomic_write_bytes
+from .models import REMOVED_KINDS, DiffFile, Finding, LineKind, ReviewState
+from .repository import RepositorySession
+
+REVIEWS_DIR_NAME = "reviews"
+
+# Incrementar ao mudar o formato do estado salvo
+REVIEW_STATE_VERSION = 1
+
+# Contexto mínimo do diff incremental, já que o modelo não vê o restante
+# das mudanças da branch
+INCREMENTAL_CONTEXT_LINES = 10
+
+
+def review_state_path(session: RepositorySession, base: str) -> Path:
+    """Caminho do estado incremental da branch atual contra ``base``."""
+    key = hashlib.sha256(f"{session.branch}\0{base}".encode("utf-8")).hexdigest()
+    return session.cache_dir / REVIEWS_DIR_NAME / f"{key[:16]}.json"
+
+
+def load_review_state(session: RepositorySession, base: str) -> Optional[ReviewState]:
+    """Carrega o estado do último review incremental, se ainda for aplicável.
+
+    O estado é descartado se o SHA salvo não for mais ancestral do HEAD
+    (rebase, force-push, troca de branch com mesmo nome).
+
+    Args:
+        session: Sessão do repositório
+        base: Branch base de comparação
+
+    Returns:
+        ReviewState, ou None se não houver estado utilizável
+    """
+    try:
+        data = json.loads(review_state_path(session, base).read_bytes())
+        state = ReviewState.model_validate(data)
+    except (OSError, ValueError, ValidationError):
+        return None
+
+    if state.version != REVIEW_STATE_VERSION or state.branch != session.branch:
+        return None
+    if not session.is_ancestor(state.head_sha):
+        return None
+    return state
+
+
+def save_review_state(
+    session: RepositorySession, base: str, findings: list[Finding]
+) -> None:
+    """Salva o HEAD atual como revisado, com os findings válidos nele.
+
+    Falhas de escrita são ignoradas: a próxima execução faz um review completo.
+
+    Args:
+        session: Sessão do repositório
+        base: Branch base de comparação
+        findings: Findings do HEAD atual (novos + reaproveitados)
+    """
+    state = ReviewState(
+        version=REVIEW_STATE_VERSION,
+        branch=session.branch,
+        base=base,
+        head_sha=session.head_sha,
+        findings=findings,
+    )
+    try:
+        atomic_write_bytes(
+            review_state_path(session, base), state.model_dump_json().encode("utf-8")
+        )
+    except OSError:
+        pass
+
+
+def map_line(diff_file: DiffFile, line: int) -> Optional[int]:
+    """Converte uma linha da versão anterior para a posição na versão nova.
+
+    Args:
+        diff_file: Diff do arquivo entre as duas versões
+        line: Número da linha na versão anterior
+
+    Returns:
+        Número da linha na versão nova, ou None se a linha foi removida
+        ou alterada
+    """
+    if diff_file.is_deleted:
+        return None
+
+    offset = 0
+    for hunk in diff_file.hunks:
+        if line < hunk.start_line_old:
+            break
+
+        old_line = hunk.start_line_old
+        for kind, line_number, _ in hunk.lines:
+            if kind == LineKind.CONTEXT:
+                if old_line == line:
+                    return line_number
+                old_line += 1
+            elif kind in REMOVED_KINDS:
+                if old_line == line:
+                    return None
+                old_line += 1
+
+        offset += hunk.added_count - hunk.removed_count
+    return line + offset
+
+
+def carry_over_findings(
+    findings: list[Finding], diff_files: list[DiffFile]
+) -> list[Finding]:
+    """Reaproveita findings anteriores que continuam válidos após o novo diff.
+
+    Args:
+        findings: Findings do último review incremental
+        diff_files: Diff entre o último HEAD revisado e o HEAD atual
+
+    Returns:
+        Findings mantidos, com arquivo e linha atualizados
+    """
+    by_old_path = {
+        diff_file.old_path or diff_file.path: diff_file for diff_file in diff_files
+    }
+
+    carried: list[Finding] = []
+    for finding in findings:
+        diff_file = by_old_path.get(finding.file)
+        if diff_file is None:
+            carried.append(finding)
+            continue
+
+        line = map_line(diff_file, finding.line)
+        if line is not None:
+            carried.append(
+                finding.model_copy(update={"file": diff_file.path, "line": line})
+            )
+    return carried
+
+
+def merge_findings(new: list[Finding], carried: list[Finding]) -> list[Finding]:
+    """Junta os findings novos com os reaproveitados, sem duplicatas.
+
+    Em caso de mesmo arquivo, linha e categoria, o finding novo prevalece.
+
+    Args:
+        new: Findings do review do diff incremental
+        carried: Findings reaproveitados (ver carry_over_findings)
+
+    Returns:
+        Findings novos seguidos dos reaproveitados
+    """
+    seen = {(f.file, f.line, f.category) for f in new}
+    return new + [f for f in carried if (f.file, f.line, f.category) not in seen]
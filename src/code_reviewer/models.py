@@ -1,9 +1,11 @@
 """Modelos Pydantic para o Code Reviewer."""
 
-from enum import Enum
-from typing import Optional
+from array import array
+from collections.abc import Iterator
+from enum import Enum, IntEnum
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
 
 
 class Severity(str, Enum):
@@ -34,24 +36,243 @@ class DiffLine(BaseModel):
     is_addition: bool = Field(description="True se linha adicionada (+)")
 
 
+class LineKind(IntEnum):
+    """Tipo de uma linha do hunk, armazenado como um byte."""
+
+    CONTEXT = 0
+    ADDED = 1
+    REMOVED = 2
+    # Linhas que apenas mudaram de lugar (ver detect_moved_blocks)
+    MOVED_ADDED = 3
+    MOVED_REMOVED = 4
+
+
+# Tipos considerados adição/remoção nas views e contagens
+ADDED_KINDS = (LineKind.ADDED, LineKind.MOVED_ADDED)
+REMOVED_KINDS = (LineKind.REMOVED, LineKind.MOVED_REMOVED)
+
+
+class HunkLines:
+    """Armazenamento compacto das linhas de um hunk, na ordem do diff.
+
+    Em vez de um objeto por linha, guarda os números de linha em um
+    ``array('i')``, o tipo de cada linha em um ``bytearray`` e o conteúdo
+    como offsets em um único buffer de texto.
+    """
+
+    __slots__ = ("kinds", "line_numbers", "_ends", "_buffer", "_pending")
+
+    def __init__(self) -> None:
+        self.kinds = bytearray()
+        self.line_numbers = array("i")
+        self._ends = array("q")
+        self._buffer = ""
+        self._pending: list[str] = []
+
+    def append(self, kind: LineKind, line_number: int, content: str) -> None:
+        """Adiciona uma linha ao final do hunk."""
+        start = self._ends[-1] if self._ends else 0
+        self.kinds.append(kind)
+        self.line_numbers.append(line_number)
+        self._ends.append(start + len(content))
+        self._pending.append(content)
+
+    def freeze(self) -> None:
+        """Consolida as linhas pendentes no buffer compartilhado."""
+        if self._pending:
+            self._buffer += "".join(self._pending)
+            self._pending = []
+
+    def content(self, index: int) -> str:
+        """Retorna o conteúdo da linha na posição informada."""
+        self.freeze()
+        start = self._ends[index - 1] if index else 0
+        return self._buffer[start : self._ends[index]]
+
+    def count(self, kind: LineKind) -> int:
+        """Conta as linhas de um tipo sem materializar o conteúdo."""
+        return self.kinds.count(kind)
+
+    def set_kind(self, index: int, kind: LineKind) -> None:
+        """Altera o tipo da linha na posição informada."""
+        self.kinds[index] = kind
+
+    def contents(self, kind: LineKind) -> list[str]:
+        """Retorna o conteúdo das linhas de um tipo, na ordem do diff."""
+        return [content for k, _, content in self if k == kind]
+
+    def to_diff_lines(self, *kinds: LineKind) -> list["DiffLine"]:
+        """Materializa as linhas dos tipos informados como modelos DiffLine."""
+        return [
+            DiffLine(
+                line_number=line_number,
+                content=content,
+                is_addition=k in ADDED_KINDS,
+            )
+            for k, line_number, content in self
+            if k in kinds
+        ]
+
+    def dump_state(self) -> tuple[bytes, bytes, bytes, str]:
+        """Exporta o conteúdo como bytes/str brutos, para serialização."""
+        self.freeze()
+        return (
+            bytes(self.kinds),
+            self.line_numbers.tobytes(),
+            self._ends.tobytes(),
+            self._buffer,
+        )
+
+    @classmethod
+    def from_state(cls, state: tuple[bytes, bytes, bytes, str]) -> "HunkLines":
+        """Reconstrói a partir do resultado de dump_state."""
+        kinds, line_numbers, ends, buffer = state
+        lines = cls()
+        lines.kinds = bytearray(kinds)
+        lines.line_numbers.frombytes(line_numbers)
+        lines._ends.frombytes(ends)
+        lines._buffer = buffer
+        return lines
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator[tuple[LineKind, int, str]]:
+        """Itera sobre (tipo, número da linha, conteúdo) na ordem do diff."""
+        self.freeze()
+        buffer = self._buffer
+        start = 0
+        for kind, line_number, end in zip(self.kinds, self.line_numbers, self._ends):
+            yield LineKind(kind), line_number, buffer[start:end]
+            start = end
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HunkLines):
+            return NotImplemented
+        self.freeze()
+        other.freeze()
+        return (
+            self.kinds == other.kinds
+            and self.line_numbers == other.line_numbers
+            and self._ends == other._ends
+            and self._buffer == other._buffer
+        )
+
+    def __repr__(self) -> str:
+        return f"HunkLines({len(self)} linhas)"
+
+
+class MovedBlock(BaseModel):
+    """Bloco de linhas que apenas mudou de lugar dentro do diff."""
+
+    start: int = Field(description="Índice da primeira linha do bloco em DiffHunk.lines")
+    count: int = Field(description="Quantidade de linhas do bloco")
+    path: str = Field(description="Arquivo da outra ponta do movimento")
+    line: int = Field(description="Linha da outra ponta do movimento")
+
+
 class DiffHunk(BaseModel):
-    """Um hunk do diff (bloco de mudanças)."""
+    """Um hunk do diff (bloco de mudanças).
+
+    As linhas ficam em ``lines`` (HunkLines, formato compacto). As listas
+    ``added_lines``, ``removed_lines`` e ``context_lines`` são views de
+    DiffLine construídas a cada acesso (o tipo das linhas pode mudar
+    depois, ver detect_moved_blocks), usadas no JSON e em testes.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     function_name: Optional[str] = Field(
         default=None, description="Nome da função extraído do hunk header"
     )
     start_line_old: int = Field(description="Linha inicial no arquivo antigo")
     start_line_new: int = Field(description="Linha inicial no arquivo novo")
-    added_lines: list[DiffLine] = Field(
-        default_factory=list, description="Linhas adicionadas"
+    enclosing_functions: list[str] = Field(
+        default_factory=list,
+        description="Funções que envolvem as linhas alteradas, resolvidas via AST",
     )
-    removed_lines: list[DiffLine] = Field(
-        default_factory=list, description="Linhas removidas"
+    moved_blocks: list[MovedBlock] = Field(
+        default_factory=list, description="Blocos de linhas movidas (sem mudança)"
     )
-    context_lines: list[DiffLine] = Field(
-        default_factory=list, description="Linhas de contexto (sem modificação)"
+    lines: HunkLines = Field(
+        default_factory=HunkLines,
+        exclude=True,
+        repr=False,
+        description="Linhas do hunk em formato compacto, na ordem do diff",
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _pack_line_lists(cls, data: Any) -> Any:
+        """Converte listas de DiffLine recebidas no construtor em HunkLines.
+
+        Sem a ordem original do diff, as linhas são ordenadas por número
+        (removidas, adicionadas e contexto, nessa ordem em caso de empate).
+        """
+        if not isinstance(data, dict):
+            return data
+
+        keys = (
+            ("removed_lines", LineKind.REMOVED),
+            ("added_lines", LineKind.ADDED),
+            ("context_lines", LineKind.CONTEXT),
+        )
+        if not any(key in data for key, _ in keys):
+            return data
+
+        data = dict(data)
+        entries: list[tuple[int, LineKind, str]] = []
+        for key, kind in keys:
+            for line in data.pop(key, None) or []:
+                line = DiffLine.model_validate(line)
+                entries.append((line.line_number, kind, line.content))
+        entries.sort(key=lambda entry: entry[0])
+
+        lines = HunkLines()
+        for line_number, kind, content in entries:
+            lines.append(kind, line_number, content)
+        data["lines"] = lines
+        return data
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def added_lines(self) -> list[DiffLine]:
+        """Linhas adicionadas."""
+        return self.lines.to_diff_lines(*ADDED_KINDS)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def removed_lines(self) -> list[DiffLine]:
+        """Linhas removidas."""
+        return self.lines.to_diff_lines(*REMOVED_KINDS)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def context_lines(self) -> list[DiffLine]:
+        """Linhas de contexto (sem modificação)."""
+        return self.lines.to_diff_lines(LineKind.CONTEXT)
+
+    @property
+    def function_names(self) -> list[str]:
+        """Funções modificadas pelo hunk.
+
+        Usa a resolução via AST quando disponível; caso contrário, o nome
+        extraído do hunk header.
+        """
+        if self.enclosing_functions:
+            return self.enclosing_functions
+        return [self.function_name] if self.function_name else []
+
+    @property
+    def added_count(self) -> int:
+        """Quantidade de linhas adicionadas."""
+        return sum(self.lines.count(kind) for kind in ADDED_KINDS)
+
+    @property
+    def removed_count(self) -> int:
+        """Quantidade de linhas removidas."""
+        return sum(self.lines.count(kind) for kind in REMOVED_KINDS)
+
 
 class DiffFile(BaseModel):
     """Um arquivo modificado no diff."""
@@ -60,6 +281,62 @@ class DiffFile(BaseModel):
     hunks: list[DiffHunk] = Field(default_factory=list, description="Hunks do arquivo")
     is_new: bool = Field(default=False, description="True se arquivo foi criado")
     is_deleted: bool = Field(default=False, description="True se arquivo foi removido")
+    old_path: Optional[str] = Field(
+        default=None, description="Caminho anterior, se o arquivo foi renomeado/copiado"
+    )
+    similarity: Optional[int] = Field(
+        default=None, description="Similaridade (%) com o arquivo original em renomeações"
+    )
+    is_copy: bool = Field(default=False, description="True se arquivo foi copiado de old_path")
+    old_blob: Optional[str] = Field(
+        default=None, description="SHA do blob antes da mudança (linha index do diff)"
+    )
+    new_blob: Optional[str] = Field(
+        default=None, description="SHA do blob após a mudança (linha index do diff)"
+    )
+
+    @property
+    def is_rename(self) -> bool:
+        """True se o arquivo foi renomeado (não copiado) de old_path."""
+        return self.old_path is not None and not self.is_copy
+
+    @property
+    def is_pure_rename(self) -> bool:
+        """True se o arquivo só mudou de caminho, sem alterar o conteúdo."""
+        return self.is_rename and not self.hunks
+
+
+class TriageStatus(str, Enum):
+    """Classificação de um arquivo na triagem do diff (git diff --numstat)."""
+
+    REVIEWABLE = "reviewable"
+    BINARY = "binary"
+    HUGE = "huge"
+    GENERATED = "generated"
+    IGNORED = "ignored"
+
+
+class FileTriage(BaseModel):
+    """Resultado da triagem de um arquivo alterado, sem o conteúdo do patch."""
+
+    path: str = Field(description="Caminho do arquivo relativo à raiz do repositório")
+    old_path: Optional[str] = Field(
+        default=None, description="Caminho anterior, se o arquivo foi renomeado/copiado"
+    )
+    added: Optional[int] = Field(
+        default=None, description="Linhas adicionadas (None se binário)"
+    )
+    removed: Optional[int] = Field(
+        default=None, description="Linhas removidas (None se binário)"
+    )
+    status: TriageStatus = Field(
+        default=TriageStatus.REVIEWABLE, description="Classificação do arquivo"
+    )
+
+    @property
+    def is_reviewable(self) -> bool:
+        """True se o patch completo do arquivo deve ser obtido."""
+        return self.status == TriageStatus.REVIEWABLE
 
 
 class FunctionRef(BaseModel):
@@ -71,6 +348,17 @@ class FunctionRef(BaseModel):
     function_name: Optional[str] = Field(
         default=None, description="Nome da função, se identificado"
     )
+    depth: int = Field(
+        default=1, description="Distância até a função modificada (1 = direta)"
+    )
+
+
+class ContextLookup(str, Enum):
+    """Busca do backtracking de contexto (ver ContextGraph.skipped_lookups)."""
+
+    CALLERS = "callers"
+    CALLEES = "callees"
+    INDIRECT = "indirect"
 
 
 class ContextGraph(BaseModel):
@@ -84,9 +372,17 @@ class ContextGraph(BaseModel):
     callees: list[FunctionRef] = Field(
         default_factory=list, description="Funções chamadas por esta"
     )
+    tests: list[FunctionRef] = Field(
+        default_factory=list,
+        description="Chamadas em arquivos de teste (function_name é o teste)",
+    )
     file_content: Optional[str] = Field(
         default=None, description="Conteúdo completo do arquivo"
     )
+    skipped_lookups: list[ContextLookup] = Field(
+        default_factory=list,
+        description="Buscas interrompidas pelo prazo do contexto (resultados parciais)",
+    )
 
 
 class GoodPractice(BaseModel):
@@ -143,3 +439,15 @@ class ReviewResult(BaseModel):
     raw_response: Optional[str] = Field(
         default=None, description="Resposta raw da IA se parsing falhou"
     )
+
+
+class ReviewState(BaseModel):
+    """Estado salvo do último review incremental de uma branch."""
+
+    version: int = Field(description="Versão do formato do estado")
+    branch: str = Field(description="Branch revisada")
+    base: str = Field(description="Branch base de comparação")
+    head_sha: str = Field(description="SHA do HEAD revisado")
+    findings: list[Finding] = Field(
+        default_factory=list, description="Findings ainda válidos no HEAD revisado"
+    )
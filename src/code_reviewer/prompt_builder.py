@@ -2,9 +2,25 @@
 
 import json
 from pathlib import Path
-from .models import ContextGraph, DiffFile
+from .models import ContextGraph, ContextLookup, DiffFile, LineKind
 from .i18n import get_language
 
+# Prefixo de cada tipo de linha no formato unificado do git diff
+LINE_PREFIXES = {
+    LineKind.REMOVED: "-",
+    LineKind.ADDED: "+",
+    LineKind.CONTEXT: " ",
+    LineKind.MOVED_REMOVED: "-",
+    LineKind.MOVED_ADDED: "+",
+}
+
+# Nome de cada busca de contexto interrompida pelo prazo
+SKIPPED_LOOKUP_LABELS = {
+    ContextLookup.CALLERS: "quem chama",
+    ContextLookup.CALLEES: "o que usa",
+    ContextLookup.INDIRECT: "níveis indiretos",
+}
+
 # Mapeamento de código de idioma para nome legível
 LANGUAGE_NAMES = {
     "pt-br": "Português Brasileiro",
@@ -78,34 +94,42 @@ def format_diff_for_prompt(diff_files: list[DiffFile]) -> str:
         elif diff_file.is_deleted:
             parts.append("(arquivo removido)")
 
+        if diff_file.old_path:
+            action = "copiado" if diff_file.is_copy else "renomeado"
+            similarity = (
+                f", similaridade {diff_file.similarity}%"
+                if diff_file.similarity is not None
+                else ""
+            )
+            parts.append(f"({action} de {diff_file.old_path}{similarity})")
+
         for hunk in diff_file.hunks:
-            if hunk.function_name:
-                parts.append(f"\n#### Função: {hunk.function_name}")
+            # Todas as funções tocadas pelo hunk (resolvidas via AST ou o
+            # nome do hunk header)
+            names = hunk.function_names
+            if names:
+                label = "Funções" if len(names) > 1 else "Função"
+                parts.append(f"\n#### {label}: {', '.join(names)}")
 
             parts.append(f"Linhas {hunk.start_line_new}+:")
 
-            # Combina todas as linhas e ordena por número de linha para
-            # manter a ordem original do diff
-            all_lines: list[tuple[int, str, str]] = []
-
-            # Linhas removidas (prefixo -)
-            for line in hunk.removed_lines:
-                all_lines.append((line.line_number, "-", line.content))
-
-            # Linhas adicionadas (prefixo +)
-            for line in hunk.added_lines:
-                all_lines.append((line.line_number, "+", line.content))
-
-            # Linhas de contexto (prefixo espaço - padrão git diff)
-            for line in hunk.context_lines:
-                all_lines.append((line.line_number, " ", line.content))
-
-            # Ordena por número de linha
-            all_lines.sort(key=lambda x: x[0])
-
-            # Formata cada linha com seu prefixo
-            for _, prefix, content in all_lines:
-                parts.append(f"{prefix}{content}")
+            # Linhas já estão na ordem original do diff; blocos movidos sem
+            # alteração viram uma única linha de referência
+            moved_blocks = {block.start: block for block in hunk.moved_blocks}
+            skip_until = 0
+            for index, (kind, _, content) in enumerate(hunk.lines):
+                if index < skip_until:
+                    continue
+                block = moved_blocks.get(index)
+                if block is not None:
+                    direction = "de" if kind == LineKind.MOVED_ADDED else "para"
+                    parts.append(
+                        f"~ ({block.count} linhas movidas {direction} "
+                        f"{block.path}:{block.line}, sem alteração)"
+                    )
+                    skip_until = index + block.count
+                    continue
+                parts.append(f"{LINE_PREFIXES[kind]}{content}")
 
         parts.append("")
 
@@ -160,23 +184,63 @@ def format_references_for_prompt(context_graphs: list[ContextGraph]) -> str:
         parts.append(f"### Função: `{graph.function_name}` ({graph.file})")
         parts.append("")
 
-        if graph.callers:
+        direct_callers = [ref for ref in graph.callers if ref.depth == 1]
+        direct_callees = [ref for ref in graph.callees if ref.depth == 1]
+        indirect_callers = [ref for ref in graph.callers if ref.depth > 1]
+        indirect_callees = [ref for ref in graph.callees if ref.depth > 1]
+
+        if direct_callers:
             parts.append("**Chamada por:**")
-            for caller in graph.callers:
+            for caller in direct_callers:
                 parts.append(f"- {caller.file}:{caller.line} → `{caller.snippet}`")
             parts.append("")
 
-        if graph.callees:
+        if direct_callees:
             parts.append("**Usa:**")
-            for callee in graph.callees:
+            for callee in direct_callees:
                 name = callee.function_name or "?"
                 parts.append(f"- `{name}` → {callee.file}:{callee.line}")
             parts.append("")
 
-        if not graph.callers and not graph.callees:
+        # Níveis indiretos em formato compacto (sem snippet) para poupar o prompt
+        if indirect_callers:
+            parts.append("**Chamada indiretamente por:**")
+            for caller in indirect_callers:
+                name = caller.function_name or "?"
+                parts.append(f"- [nível {caller.depth}] `{name}` → {caller.file}:{caller.line}")
+            parts.append("")
+
+        if indirect_callees:
+            parts.append("**Usa indiretamente:**")
+            for callee in indirect_callees:
+                name = callee.function_name or "?"
+                parts.append(f"- [nível {callee.depth}] `{name}` → {callee.file}:{callee.line}")
+            parts.append("")
+
+        # Testes em espaço próprio: não disputam o limite dos callers
+        if graph.tests:
+            parts.append("**Testes relacionados:**")
+            for test in graph.tests:
+                name = test.function_name or "?"
+                parts.append(f"- `{name}` em {test.file}:{test.line} → `{test.snippet}`")
+            parts.append("")
+
+        if (
+            not graph.callers
+            and not graph.callees
+            and not graph.tests
+            and not graph.skipped_lookups
+        ):
             parts.append("(sem referências encontradas)")
             parts.append("")
 
+        if graph.skipped_lookups:
+            skipped = ", ".join(SKIPPED_LOOKUP_LABELS[lookup] for lookup in graph.skipped_lookups)
+            parts.append(
+                f"_Busca interrompida pelo prazo, referências incompletas: {skipped}._"
+            )
+            parts.append("")
+
     return "\n".join(parts)
 
 
@@ -0,0 +1,323 @@
+"""Análise de arquivos Python via AST, com cache por SHA de blob.
+
+O hunk header do git traz apenas uma heurística do nome da função (muitas
+vezes o ``def`` anterior ou a classe). Aqui cada arquivo Python alterado é
+parseado uma vez com ``ast`` e os intervalos de funções, métodos e classes
+são indexados para mapear cada linha alterada à função que a contém.
+
+O resultado é guardado em ~/.cache/airev/ast, indexado pelo SHA do blob,
+então execuções repetidas não re-parseiam arquivos que não mudaram.
+"""
+
+import ast
+import hashlib
+import json
+import subprocess
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import CACHE_ROOT, atomic_write_bytes, evict_lru, touch
+from .file_cache import FileCache
+from .models import DiffFile, DiffHunk, LineKind
+
+AST_CACHE_DIR = CACHE_ROOT / "ast"
+MAX_AST_CACHE_BYTES = 50 * 1024 * 1024
+
+# Incrementar ao mudar o formato das entradas
+AST_CACHE_VERSION = 1
+
+# Cache em memória (SHA do blob -> spans), LRU limitado a
+# MAX_SPANS_MEMORY_ENTRIES; os que saem dele continuam no cache em disco
+MAX_SPANS_MEMORY_ENTRIES = 4096
+_spans_cache: OrderedDict[str, list["FunctionSpan"]] = OrderedDict()
+_spans_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FunctionSpan:
+    """Intervalo de linhas (inclusivo) de uma função, método ou classe."""
+
+    start: int
+    end: int
+    name: str
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Calcula o SHA que o git atribui a um blob com esse conteúdo.
+
+    Args:
+        content: Conteúdo do arquivo
+
+    Returns:
+        SHA-1 hexadecimal, igual ao de ``git hash-object``
+    """
+    header = f"blob {len(content)}\0".encode("ascii")
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def extract_function_spans(source: bytes) -> Optional[list[FunctionSpan]]:
+    """Extrai os intervalos de funções, métodos e classes de um arquivo.
+
+    O intervalo começa no primeiro decorator, se houver.
+
+    Args:
+        source: Código-fonte Python
+
+    Returns:
+        Lista de FunctionSpan ordenada por início, ou None se o código
+        não for Python válido
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    spans = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            end = node.end_lineno or node.lineno
+            spans.append(FunctionSpan(start=start, end=end, name=node.name))
+
+    spans.sort(key=lambda span: (span.start, -span.end))
+    return spans
+
+
+class FunctionSpanIndex:
+    """Índice linha -> função mais interna que a contém.
+
+    Como funções Python sempre aninham corretamente, basta preencher os
+    intervalos do mais externo para o mais interno em um array por linha,
+    e cada consulta vira um acesso O(1).
+    """
+
+    def __init__(self, spans: list[FunctionSpan]):
+        self._spans = spans
+        last_line = max((span.end for span in spans), default=0)
+        self._owner = array("i", [-1]) * (last_line + 1)
+
+        # spans vem ordenado por início (externos antes dos internos)
+        for index, span in enumerate(spans):
+            for line in range(span.start, span.end + 1):
+                self._owner[line] = index
+
+    def enclosing(self, line: int) -> Optional[str]:
+        """Retorna o nome da função mais interna que contém a linha.
+
+        Args:
+            line: Número da linha (1-based)
+
+        Returns:
+            Nome da função/método/classe ou None se a linha é de módulo
+        """
+        if line < 0 or line >= len(self._owner):
+            return None
+        index = self._owner[line]
+        return self._spans[index].name if index >= 0 else None
+
+
+def _remember_spans(blob_sha: str, spans: list[FunctionSpan]) -> None:
+    """Guarda os spans no cache em memória, descartando os menos usados."""
+    with _spans_cache_lock:
+        _spans_cache[blob_sha] = spans
+        _spans_cache.move_to_end(blob_sha)
+        while len(_spans_cache) > MAX_SPANS_MEMORY_ENTRIES:
+            _spans_cache.popitem(last=False)
+
+
+def _read_cached_spans(blob_sha: str) -> Optional[list[FunctionSpan]]:
+    """Lê os spans de um blob do cache (memória, depois disco)."""
+    with _spans_cache_lock:
+        spans = _spans_cache.get(blob_sha)
+        if spans is not None:
+            _spans_cache.move_to_end(blob_sha)
+            return spans
+
+    path = AST_CACHE_DIR / f"{blob_sha}.json"
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != AST_CACHE_VERSION:
+        return None
+
+    spans = [FunctionSpan(start, end, name) for start, end, name in data["functions"]]
+    _remember_spans(blob_sha, spans)
+    touch(path)
+    return spans
+
+
+def _write_cached_spans(blob_sha: str, spans: list[FunctionSpan]) -> None:
+    """Grava os spans de um blob no cache em memória e em disco."""
+    _remember_spans(blob_sha, spans)
+    data = {
+        "version": AST_CACHE_VERSION,
+        "functions": [[span.start, span.end, span.name] for span in spans],
+    }
+    try:
+        atomic_write_bytes(
+            AST_CACHE_DIR / f"{blob_sha}.json", json.dumps(data).encode("utf-8")
+        )
+    except OSError:
+        # Falha ao escrever cache - ignora silenciosamente
+        pass
+
+
+def read_blob(
+    path: str,
+    blob_sha: Optional[str],
+    workdir: Optional[Path],
+    file_cache: Optional[FileCache] = None,
+) -> Optional[bytes]:
+    """Lê o conteúdo de um arquivo na versão indicada pelo SHA do blob.
+
+    Usa o arquivo do cache (ou do working tree) quando ele corresponde ao
+    blob e recorre ao ``git cat-file`` quando o arquivo foi modificado.
+
+    Args:
+        path: Caminho do arquivo relativo à raiz do repositório
+        blob_sha: SHA do blob (completo ou abreviado); None lê o working tree
+        workdir: Diretório raiz do repositório
+        file_cache: Cache de arquivos do review para o working tree
+
+    Returns:
+        Conteúdo do arquivo, ou None se não puder ser lido
+    """
+    if file_cache is not None:
+        content = file_cache.read_bytes(path)
+    else:
+        try:
+            content = (Path(workdir or ".") / path).read_bytes()
+        except OSError:
+            content = None
+
+    if blob_sha is None:
+        return content
+    if content is not None and git_blob_sha(content).startswith(blob_sha):
+        return content
+
+    # Pelo processo persistente do review, quando houver
+    if file_cache is not None and file_cache.blob_reader is not None:
+        return file_cache.blob_reader.read(blob_sha)
+
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "blob", blob_sha],
+            capture_output=True,
+            cwd=workdir,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    return result.stdout
+
+
+def load_function_spans(
+    path: str,
+    blob_sha: Optional[str] = None,
+    workdir: Optional[Path] = None,
+    file_cache: Optional[FileCache] = None,
+) -> Optional[list[FunctionSpan]]:
+    """Obtém os spans de funções de um arquivo Python, usando o cache.
+
+    Args:
+        path: Caminho do arquivo relativo à raiz do repositório
+        blob_sha: SHA completo do blob (da linha index do diff), se conhecido
+        workdir: Diretório raiz do repositório
+        file_cache: Cache de arquivos do review
+
+    Returns:
+        Lista de FunctionSpan ou None se o arquivo não puder ser lido/parseado
+    """
+    # Com o SHA completo, um acerto no cache dispensa ler o arquivo
+    if blob_sha and len(blob_sha) == 40:
+        spans = _read_cached_spans(blob_sha)
+        if spans is not None:
+            return spans
+
+    content = read_blob(path, blob_sha, workdir, file_cache)
+    if content is None:
+        return None
+
+    sha = git_blob_sha(content)
+    spans = _read_cached_spans(sha)
+    if spans is not None:
+        return spans
+
+    spans = extract_function_spans(content)
+    if spans is None:
+        return None
+
+    _write_cached_spans(sha, spans)
+    return spans
+
+
+def _changed_new_lines(hunk: DiffHunk) -> list[int]:
+    """Posições (no arquivo novo) das linhas alteradas do hunk.
+
+    Linhas removidas não existem no arquivo novo; usa-se a posição da
+    linha seguinte, onde a remoção ocorreu.
+    """
+    positions = []
+    current_new = hunk.start_line_new
+    for kind, line_number, _ in hunk.lines:
+        if kind == LineKind.ADDED:
+            positions.append(line_number)
+            current_new = line_number + 1
+        elif kind == LineKind.REMOVED:
+            positions.append(current_new)
+        elif kind != LineKind.MOVED_REMOVED:
+            # Contexto e linhas movidas existem no arquivo novo
+            current_new = line_number + 1
+    return positions
+
+
+def resolve_python_functions(
+    diff_files: list[DiffFile],
+    workdir: Optional[Path] = None,
+    file_cache: Optional[FileCache] = None,
+) -> None:
+    """Resolve as funções que envolvem as linhas alteradas de arquivos Python.
+
+    Preenche ``enclosing_functions`` e atualiza ``function_name`` de cada
+    hunk. Hunks sem linha alterada dentro de uma função e arquivos que não
+    podem ser parseados mantêm o nome do hunk header.
+
+    Args:
+        diff_files: Arquivos parseados do diff (modificados in-place)
+        workdir: Diretório raiz do repositório
+        file_cache: Cache de arquivos do review
+    """
+    resolved_any = False
+
+    for diff_file in diff_files:
+        if diff_file.is_deleted or not diff_file.path.endswith(".py"):
+            continue
+
+        spans = load_function_spans(
+            diff_file.path, diff_file.new_blob, workdir, file_cache
+        )
+        if spans is None:
+            continue
+        resolved_any = True
+
+        index = FunctionSpanIndex(spans)
+        for hunk in diff_file.hunks:
+            names: list[str] = []
+            for line in _changed_new_lines(hunk):
+                name = index.enclosing(line)
+                if name and name not in names:
+                    names.append(name)
+
+            hunk.enclosing_functions = names
+            # Só linhas de módulo ou movidas: fica o nome do hunk header
+            if names:
+                hunk.function_name = names[0]
+
+    if resolved_any:
+        evict_lru(AST_CACHE_DIR, MAX_AST_CACHE_BYTES, "*.json")
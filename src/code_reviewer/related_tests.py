@@ -0,0 +1,217 @@
+"""Índice de testes relacionados às funções modificadas.
+
+Os testes de uma função costumam ser o contexto mais útil para revisar a
+alteração, mas a busca de callers os mistura com o restante do projeto no
+mesmo limite de referências. Durante a varredura do índice de símbolos,
+os arquivos de teste têm também as chamadas extraídas (nome, linha e o
+teste que as contém) e os módulos que importam, e o resultado fica no
+mesmo cache. ``RelatedTestIndex`` responde quais testes chamam uma
+função, entre os arquivos que importam o módulo dela (ou levam o nome
+dele); só nomes distintivos aceitam os demais arquivos.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Optional
+
+from .definition_filter import bare_call_names, call_language
+from .import_resolver import file_language, parse_js_imports, parse_python_imports
+
+# Testes guardados por função modificada (espaço próprio no prompt)
+MAX_TESTS_PER_FUNCTION = 5
+
+# Tamanho máximo do trecho da linha guardado por referência
+MAX_TEST_SNIPPET_CHARS = 200
+
+# Caminhos de teste: diretórios tests/, __tests__/, spec/ e os sufixos
+# test_x.py, x_test.py, x_test.go, x.test.ts, x.spec.js
+TEST_PATH_PATTERN = re.compile(
+    r"(?:^|/)(?:tests?|__tests__|spec)/"
+    r"|(?:^|/)test_[^/]*\.py$"
+    r"|_test\.(?:py|go)$"
+    r"|\.(?:test|spec)\.[cm]?[jt]sx?$"
+)
+
+# Início de um teste: def test_x, func TestX, it("...") / test("...")
+TEST_DEFINITION_PATTERN = re.compile(
+    r"^[ \t]*(?:async\s+)?def\s+(test\w*)"
+    r"|^func\s+(Test\w+)"
+    r"|^[ \t]*(?:it|test)\s*\(\s*[\"'`]([^\"'`\n]{1,80})"
+)
+
+# Outras definições; no nível do módulo, encerram o teste anterior
+OTHER_DEFINITION_PATTERN = re.compile(
+    r"^([ \t]*)(?:export\s+)?(?:async\s+)?(?:def|class|function|func)\s"
+)
+
+# Qualquer chamada ``nome(`` (inclusive ``obj.nome(``)
+TEST_CALL_PATTERN = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+
+# Nomes de arquivo que representam o diretório como módulo
+PACKAGE_FILE_STEMS = ("__init__", "index")
+
+# Referência serializada: (nome chamado, linha, teste que contém a chamada, trecho)
+TestReferenceState = tuple[str, int, str, str]
+# Estado de um arquivo de teste: (referências, módulos importados)
+TestFileState = tuple[list[TestReferenceState], list[str]]
+
+
+@dataclass(frozen=True)
+class RelatedTest:
+    """Chamada a uma função dentro de um arquivo de teste."""
+
+    file: str
+    line: int
+    test: Optional[str]
+    snippet: str
+
+
+def is_test_file(path: str) -> bool:
+    """Indica se o caminho é de um arquivo de teste."""
+    return TEST_PATH_PATTERN.search(path) is not None
+
+
+def module_stem(path: str) -> str:
+    """Nome pelo qual um módulo é importado (``loja/__init__.py`` -> ``loja``)."""
+    posix = PurePosixPath(path)
+    stem = posix.name.split(".")[0]
+    if stem in PACKAGE_FILE_STEMS and posix.parent.name:
+        return posix.parent.name
+    return stem
+
+
+def _imported_modules(text: str, path: str) -> list[str]:
+    """Módulos importados pelo arquivo, pelo nome do último componente."""
+    language = file_language(path)
+    modules: set[str] = set()
+    if language == "python":
+        imports = parse_python_imports(text)
+        for target in [*imports.bindings.values(), *imports.star]:
+            if target.module:
+                modules.add(target.module.rpartition(".")[2])
+            # ``from pacote import modulo`` também importa o módulo
+            if target.name:
+                modules.add(target.name)
+    elif language == "js":
+        imports = parse_js_imports(text)
+        for target in [*imports.bindings.values(), *imports.star]:
+            modules.add(module_stem(target.module))
+    return sorted(modules)
+
+
+def extract_test_references(content: bytes, path: str) -> TestFileState:
+    """Extrai as chamadas e os imports de um arquivo de teste.
+
+    Cada nome é guardado uma vez por teste (a primeira chamada). Chamadas
+    fora de um teste (fixtures, helpers) ficam com o teste vazio. O teste
+    de cada linha é o último iniciado acima dela (sem considerar a
+    indentação, exceto para definições no nível do módulo).
+
+    Args:
+        content: Conteúdo do arquivo
+        path: Caminho do arquivo (define como os imports são lidos)
+
+    Returns:
+        Tupla (referências, módulos importados); vazia para binários
+    """
+    if b"\0" in content[:8192]:
+        return [], []
+    text = content.decode("utf-8", errors="replace")
+
+    skipped = bare_call_names(call_language(path))
+    references: list[TestReferenceState] = []
+    seen: set[tuple[str, str]] = set()
+    test = ""
+    for number, line in enumerate(text.split("\n"), start=1):
+        # Chamadas só depois do início do teste (``it("x", () => f())``)
+        calls_start = 0
+        definition = TEST_DEFINITION_PATTERN.match(line)
+        other = OTHER_DEFINITION_PATTERN.match(line)
+        if definition:
+            test = next(group for group in definition.groups() if group)
+            calls_start = definition.end()
+        elif other:
+            if not other.group(1):
+                test = ""
+            continue
+        for match in TEST_CALL_PATTERN.finditer(line, calls_start):
+            name = match.group(1)
+            if name in skipped or (name, test) in seen:
+                continue
+            seen.add((name, test))
+            references.append(
+                (name, number, test, line.strip()[:MAX_TEST_SNIPPET_CHARS])
+            )
+
+    return references, _imported_modules(text, path)
+
+
+class RelatedTestIndex:
+    """Índice em memória nome chamado -> chamadas em arquivos de teste."""
+
+    def __init__(self, files: dict[str, TestFileState]) -> None:
+        """Cria o índice.
+
+        Args:
+            files: Caminho do arquivo de teste -> estado extraído
+        """
+        self._by_name: dict[str, list[RelatedTest]] = {}
+        self._modules: dict[str, frozenset[str]] = {}
+        for path in sorted(files):
+            references, modules = files[path]
+            self._modules[path] = frozenset(modules)
+            for name, line, test, snippet in references:
+                self._by_name.setdefault(name, []).append(
+                    RelatedTest(path, line, test or None, snippet)
+                )
+
+    @property
+    def file_count(self) -> int:
+        """Quantidade de arquivos de teste indexados."""
+        return len(self._modules)
+
+    def _imports_module(self, test_file: str, stem: str) -> bool:
+        """Indica se o arquivo de teste importa (ou leva o nome do) módulo."""
+        return stem in self._modules.get(test_file, ()) or module_stem(test_file) in (
+            stem,
+            f"test_{stem}",
+            f"{stem}_test",
+        )
+
+    def lookup(
+        self,
+        name: str,
+        path: str,
+        limit: int = MAX_TESTS_PER_FUNCTION,
+        distinctive: bool = False,
+    ) -> list[RelatedTest]:
+        """Testes que chamam uma função.
+
+        Só contam os arquivos que importam o módulo da função (ou se chamam
+        como ele, ex: ``test_pagamento.py``): pelo nome, ``get`` acharia
+        qualquer ``dict.get``. Com ``distinctive``, os demais arquivos
+        entram depois deles. Chamadas no próprio arquivo da função são
+        ignoradas.
+
+        Args:
+            name: Nome da função
+            path: Arquivo onde a função está definida
+            limit: Máximo de testes retornados
+            distinctive: O nome identifica a função sozinho (ex: definido
+                uma única vez no projeto)
+
+        Returns:
+            Até ``limit`` chamadas, uma por teste
+        """
+        stem = module_stem(path)
+        imported: list[RelatedTest] = []
+        others: list[RelatedTest] = []
+        for ref in self._by_name.get(name, []):
+            if ref.file == path:
+                continue
+            if self._imports_module(ref.file, stem):
+                imported.append(ref)
+            elif distinctive:
+                others.append(ref)
+        return (imported + others)[:limit]
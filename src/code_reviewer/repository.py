@@ -0,0 +1,229 @@
+"""Sessão do repositório git: metadados resolvidos uma única vez por execução.
+
+Raiz do repositório, HEAD e branch atual são lidos direto de ``.git``
+(HEAD, refs soltas e packed-refs), sem criar processos. Só o merge-base,
+que exige percorrer o grafo de commits, chama o git, uma vez por branch
+base. Layouts que não sabemos ler (reftable, ``$GIT_DIR``, repositório
+sem commits) caem para ``git rev-parse``.
+"""
+
+import hashlib
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .cache import CACHE_ROOT
+
+# Dados persistidos por repositório (estado incremental, índices)
+REPOS_CACHE_DIR = CACHE_ROOT / "repos"
+
+SHA_PATTERN = re.compile(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+
+# Prefixo das refs de branch locais
+BRANCH_REF_PREFIX = "refs/heads/"
+
+
+class RepositoryError(Exception):
+    """Diretório não é um repositório git ou metadados não puderam ser lidos."""
+
+
+def _run_git(args: list[str], workdir: Path) -> str:
+    """Executa um comando git e retorna o stdout sem espaços nas pontas."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            cwd=workdir,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        stderr = getattr(e, "stderr", None) or str(e)
+        raise RepositoryError(stderr.strip()) from e
+    return result.stdout.strip()
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """Lê um arquivo pequeno de metadados, ou None se não existir."""
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+        return None
+
+
+def _find_git_dir(start: Path) -> Optional[tuple[Path, Path]]:
+    """Procura o ``.git`` a partir de ``start`` subindo na árvore.
+
+    Suporta ``.git`` como diretório ou como arquivo ``gitdir: ...``
+    (worktrees e submódulos).
+
+    Returns:
+        Tupla (raiz do working tree, diretório git), ou None
+    """
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            content = _read_text(dot_git) or ""
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = Path(content[len("gitdir:") :].strip())
+            if not git_dir.is_absolute():
+                git_dir = (directory / git_dir).resolve()
+            return directory, git_dir
+    return None
+
+
+def _read_packed_ref(common_dir: Path, ref: str) -> Optional[str]:
+    """Procura uma ref no arquivo packed-refs."""
+    try:
+        with open(common_dir / "packed-refs", encoding="utf-8") as packed:
+            for line in packed:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return sha
+    except FileNotFoundError:
+        pass
+    return None
+
+
+@dataclass
+class RepositorySession:
+    """Metadados do repositório compartilhados pelos módulos durante um review.
+
+    Crie com ``RepositorySession.open(workdir)``. Os valores são resolvidos
+    sob demanda e guardados; a sessão assume que HEAD não muda durante a
+    execução.
+
+    Attributes:
+        workdir: Diretório de onde o airev foi chamado
+        root: Raiz do working tree (caminhos do diff são relativos a ela)
+        git_dir: Diretório git do working tree (``.git`` ou o da worktree)
+        common_dir: Diretório com refs e objetos compartilhados
+    """
+
+    workdir: Path
+    root: Path
+    git_dir: Path
+    common_dir: Path
+    _head_ref: Optional[str] = field(default=None, repr=False)
+    _head_sha: Optional[str] = field(default=None, repr=False)
+    _merge_bases: dict[str, str] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def open(cls, workdir: Optional[Path] = None) -> "RepositorySession":
+        """Localiza o repositório que contém ``workdir``.
+
+        Args:
+            workdir: Diretório dentro do repositório (default: diretório atual)
+
+        Returns:
+            Sessão do repositório
+
+        Raises:
+            RepositoryError: Se ``workdir`` não estiver em um repositório git
+        """
+        workdir = Path(workdir or Path.cwd()).resolve()
+
+        found = None if "GIT_DIR" in os.environ else _find_git_dir(workdir)
+        if found is None:
+            output = _run_git(
+                ["rev-parse", "--show-toplevel", "--absolute-git-dir"], workdir
+            )
+            root, git_dir = (Path(line) for line in output.splitlines())
+        else:
+            root, git_dir = found
+
+        common = _read_text(git_dir / "commondir")
+        common_dir = (git_dir / common).resolve() if common else git_dir
+        return cls(workdir=workdir, root=root, git_dir=git_dir, common_dir=common_dir)
+
+    def _read_head(self) -> None:
+        """Resolve HEAD a partir dos arquivos do repositório."""
+        head = _read_text(self.git_dir / "HEAD") or ""
+        sha = None
+
+        if head.startswith("ref:"):
+            self._head_ref = head[len("ref:") :].strip()
+            sha = _read_text(self.common_dir / self._head_ref)
+            if sha is None:
+                sha = _read_packed_ref(self.common_dir, self._head_ref)
+        else:
+            self._head_ref = ""
+            sha = head
+
+        if sha is not None and SHA_PATTERN.match(sha):
+            self._head_sha = sha
+
+    @property
+    def head_sha(self) -> str:
+        """SHA completo do commit HEAD.
+
+        Raises:
+            RepositoryError: Se o repositório ainda não tiver commits
+        """
+        if self._head_sha is None:
+            self._read_head()
+        if self._head_sha is None:
+            # Reftable, branch sem commits ou layout desconhecido
+            self._head_sha = _run_git(["rev-parse", "HEAD"], self.workdir)
+        return self._head_sha
+
+    @property
+    def branch(self) -> str:
+        """Nome da branch atual, ou "HEAD" com HEAD destacado."""
+        if self._head_ref is None:
+            self._read_head()
+        if self._head_ref and self._head_ref.startswith(BRANCH_REF_PREFIX):
+            return self._head_ref[len(BRANCH_REF_PREFIX) :]
+        return "HEAD"
+
+    def merge_base(self, base_branch: str) -> str:
+        """SHA do merge-base entre a branch base e o HEAD.
+
+        É o ponto de comparação usado por ``git diff base...HEAD``.
+
+        Args:
+            base_branch: Branch base para comparação
+
+        Returns:
+            SHA completo do merge-base
+
+        Raises:
+            RepositoryError: Se a branch base não existir
+        """
+        if base_branch not in self._merge_bases:
+            self._merge_bases[base_branch] = _run_git(
+                ["merge-base", base_branch, self.head_sha], self.workdir
+            )
+        return self._merge_bases[base_branch]
+
+    def is_ancestor(self, sha: str) -> bool:
+        """Verifica se um commit é ancestral do HEAD (ou o próprio HEAD).
+
+        Args:
+            sha: SHA do commit
+
+        Returns:
+            False também se o commit não existir mais (ex: após rebase + gc)
+        """
+        if sha == self.head_sha:
+            return True
+        result = subprocess.run(
+            ["git", "merge-base", "--is-ancestor", sha, self.head_sha],
+            capture_output=True,
+            cwd=self.workdir,
+        )
+        return result.returncode == 0
+
+    @property
+    def cache_dir(self) -> Path:
+        """Diretório de cache exclusivo deste repositório."""
+        digest = hashlib.sha256(str(self.root).encode("utf-8")).hexdigest()
+        return REPOS_CACHE_DIR / digest[:16]
@@ -331,21 +331,28 @@ def _parse_json_response(
                 if good_practice:
                     good_practices.append(good_practice)
 
-    # Calcula sumário
-    critical = sum(1 for f in findings if f.severity == Severity.CRITICAL)
-    warning = sum(1 for f in findings if f.severity == Severity.WARNING)
-    info = sum(1 for f in findings if f.severity == Severity.INFO)
-
     return ReviewResult(
         branch=branch,
         base=base,
         files_analyzed=files_analyzed,
         findings=findings,
         good_practices=good_practices,
-        summary=ReviewSummary(
-            total=len(findings),
-            critical=critical,
-            warning=warning,
-            info=info,
-        ),
+        summary=summarize_findings(findings),
+    )
+
+
+def summarize_findings(findings: list[Finding]) -> ReviewSummary:
+    """Calcula o sumário por severidade de uma lista de findings.
+
+    Args:
+        findings: Findings a contabilizar
+
+    Returns:
+        ReviewSummary com total e contagem por severidade
+    """
+    return ReviewSummary(
+        total=len(findings),
+        critical=sum(1 for f in findings if f.severity == Severity.CRITICAL),
+        warning=sum(1 for f in findings if f.severity == Severity.WARNING),
+        info=sum(1 for f in findings if f.severity == Severity.INFO),
     )
@@ -0,0 +1,111 @@
+"""Search backends - Busca textual plugável para o backtracking de contexto."""
+
+from pathlib import Path
+from typing import Optional, Type
+
+from .base import (
+    EXCLUDED_DIRS,
+    SEARCH_DEADLINE,
+    Deadline,
+    SearchBackend,
+    SearchMatch,
+    SearchResults,
+)
+from .git_grep import GitGrepBackend
+from .grep import GrepBackend
+from .mmap_scan import MmapBackend
+from .python_scan import PythonBackend
+from .revision import RevisionBackend
+from .ripgrep import RipgrepBackend
+
+# Registry de backends, na ordem de preferência da seleção automática
+# (do mais rápido para o mais lento; veja benchmarks/bench_search_backends.py)
+SEARCH_BACKENDS: dict[str, Type[SearchBackend]] = {
+    "git-grep": GitGrepBackend,
+    "ripgrep": RipgrepBackend,
+    "mmap": MmapBackend,
+    "grep": GrepBackend,
+    "python": PythonBackend,
+}
+
+# Valor que delega a escolha para select_search_backend
+AUTO_SEARCH_BACKEND = "auto"
+
+
+def get_search_backend(name: str) -> SearchBackend:
+    """Obtém uma instância do backend pelo nome.
+
+    Args:
+        name: Nome do backend (git-grep, ripgrep, mmap, grep, python)
+
+    Returns:
+        Instância do backend
+
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    if name not in SEARCH_BACKENDS:
+        available = ", ".join(SEARCH_BACKENDS.keys())
+        raise ValueError(f"Backend '{name}' não encontrado. Disponíveis: {available}")
+
+    return SEARCH_BACKENDS[name]()
+
+
+def select_search_backend(
+    workdir: Path, name: Optional[str] = None
+) -> SearchBackend:
+    """Escolhe o backend de busca para ``workdir``.
+
+    Args:
+        workdir: Diretório raiz da busca
+        name: Backend forçado; None ou "auto" escolhe o primeiro disponível
+            na ordem de SEARCH_BACKENDS
+
+    Returns:
+        Instância do backend
+
+    Raises:
+        ValueError: Se o backend forçado não existir ou não estiver disponível
+    """
+    if name and name != AUTO_SEARCH_BACKEND:
+        backend = get_search_backend(name)
+        if not backend.check_availability(workdir):
+            raise ValueError(f"Backend '{name}' não está disponível neste ambiente")
+        return backend
+
+    for backend_class in SEARCH_BACKENDS.values():
+        backend = backend_class()
+        if backend.check_availability(workdir):
+            return backend
+
+    return PythonBackend()
+
+
+def list_search_backends() -> list[str]:
+    """Lista os nomes dos backends de busca.
+
+    Returns:
+        Lista de nomes de backends
+    """
+    return list(SEARCH_BACKENDS.keys())
+
+
+__all__ = [
+    "EXCLUDED_DIRS",
+    "SEARCH_DEADLINE",
+    "Deadline",
+    "SearchResults",
+    "SearchBackend",
+    "SearchMatch",
+    "GitGrepBackend",
+    "RipgrepBackend",
+    "GrepBackend",
+    "MmapBackend",
+    "PythonBackend",
+    "RevisionBackend",
+    "get_search_backend",
+    "select_search_backend",
+    "list_search_backends",
+    "AUTO_SEARCH_BACKEND",
+    "SEARCH_BACKENDS",
+]
@@ -0,0 +1,293 @@
+"""Base interface para backends de busca textual no projeto."""
+
+import mmap
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional, Protocol, Union, runtime_checkable
+
+# Diretórios excluídos do backtracking
+EXCLUDED_DIRS = [
+    "node_modules",
+    "venv",
+    ".venv",
+    "env",
+    ".env",
+    ".git",
+    "__pycache__",
+    ".pytest_cache",
+    ".mypy_cache",
+    "dist",
+    "build",
+    ".tox",
+    ".eggs",
+    "*.egg-info",
+    "vendor",
+    "third_party",
+]
+
+# Bytes iniciais inspecionados para detectar arquivos binários (como o git)
+BINARY_SNIFF_BYTES = 8192
+
+# Prazo padrão (segundos) para todas as buscas de um review
+SEARCH_DEADLINE = 30.0
+
+# Iterador de resultados de uma busca; close() encerra a ferramenta
+SearchResults = Generator["SearchMatch", None, None]
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Instante limite compartilhado por várias buscas.
+
+    Crie com ``Deadline.after(segundos)``; cada busca usa só o tempo que
+    sobrou, em vez de um timeout fixo por chamada.
+    """
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Prazo que vence daqui a ``seconds`` segundos."""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Segundos restantes (0 se já venceu)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Verifica se o prazo já venceu."""
+        return time.monotonic() >= self.expires_at
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    """Uma linha que contém algum dos padrões buscados."""
+
+    file: str
+    line: int
+    content: str
+
+
+@runtime_checkable
+class SearchBackend(Protocol):
+    """Interface Protocol para backends de busca.
+
+    Cada implementação encapsula uma ferramenta (git grep, ripgrep, grep
+    ou Python puro). A busca é por strings fixas: uma linha é retornada se
+    contiver qualquer um dos padrões, uma única vez. Arquivos binários e
+    diretórios de EXCLUDED_DIRS não são pesquisados.
+
+    Os resultados são produzidos à medida que a ferramenta os encontra.
+    Quem consome pode parar a qualquer momento chamando ``close()`` no
+    iterador, o que encerra o processo da busca.
+    """
+
+    @property
+    def name(self) -> str:
+        """Nome identificador do backend."""
+        ...
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Verifica se o backend pode ser usado em ``workdir``.
+
+        Returns:
+            True se a ferramenta está instalada e aplicável ao diretório
+        """
+        ...
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca linhas que contêm qualquer um dos padrões.
+
+        Args:
+            patterns: Strings fixas a buscar
+            workdir: Diretório raiz da busca
+            deadline: Prazo da busca (default: SEARCH_DEADLINE a partir de agora)
+
+        Yields:
+            Linhas encontradas, com caminho relativo a ``workdir``; a
+            iteração termina cedo se a ferramenta falhar ou o prazo vencer
+        """
+        ...
+
+
+def is_excluded_dir(name: str) -> bool:
+    """Verifica se um nome de diretório está em EXCLUDED_DIRS."""
+    return any(fnmatch(name, pattern) for pattern in EXCLUDED_DIRS)
+
+
+def is_excluded_path(path: str) -> bool:
+    """Verifica se algum diretório de um caminho relativo está em EXCLUDED_DIRS."""
+    return any(is_excluded_dir(part) for part in path.split("/")[:-1])
+
+
+def is_git_work_tree(workdir: Path) -> bool:
+    """Verifica se o git existe e ``workdir`` está em um repositório."""
+    if shutil.which("git") is None:
+        return False
+    result = subprocess.run(
+        ["git", "rev-parse", "--is-inside-work-tree"],
+        capture_output=True,
+        text=True,
+        cwd=workdir,
+    )
+    return result.returncode == 0 and result.stdout.strip() == "true"
+
+
+def is_binary(buffer: Union[bytes, mmap.mmap]) -> bool:
+    """Verifica se o conteúdo parece binário (byte nulo no início)."""
+    return buffer.find(b"\0", 0, BINARY_SNIFF_BYTES) >= 0
+
+
+def compile_patterns(patterns: list[str]) -> re.Pattern[bytes]:
+    """Compila as strings fixas em uma única regex de bytes.
+
+    Padrões mais longos vêm primeiro para a alternação não parar em um
+    prefixo de outro padrão.
+    """
+    needles = sorted({p.encode("utf-8") for p in patterns}, key=len, reverse=True)
+    return re.compile(b"|".join(re.escape(needle) for needle in needles))
+
+
+def scan_buffer(
+    buffer: Union[bytes, mmap.mmap], regex: re.Pattern[bytes], file: str
+) -> list[SearchMatch]:
+    """Retorna as linhas de ``buffer`` com ocorrências da regex.
+
+    Args:
+        buffer: Conteúdo do arquivo (bytes ou arquivo mapeado em memória)
+        regex: Regex combinada dos padrões (ver compile_patterns)
+        file: Caminho usado nos resultados
+
+    Returns:
+        Uma entrada por linha, mesmo com várias ocorrências na linha
+    """
+    matches: list[SearchMatch] = []
+    line = 1
+    position = 0
+    next_line_start = 0
+
+    for match in regex.finditer(buffer):
+        start = match.start()
+        # Uma linha só aparece uma vez, mesmo com várias ocorrências
+        if start < next_line_start:
+            continue
+        line += buffer[position:start].count(b"\n")
+        position = start
+
+        line_start = buffer.rfind(b"\n", 0, start) + 1
+        line_end = buffer.find(b"\n", start)
+        if line_end < 0:
+            line_end = len(buffer)
+        next_line_start = line_end + 1
+
+        matches.append(
+            SearchMatch(
+                file=file,
+                line=line,
+                content=buffer[line_start:line_end].decode("utf-8", errors="replace"),
+            )
+        )
+    return matches
+
+
+@contextmanager
+def pattern_file(patterns: list[str]) -> Iterator[str]:
+    """Grava os padrões, um por linha, em um arquivo temporário (para ``-f``).
+
+    Yields:
+        Caminho do arquivo, removido ao sair do contexto
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", suffix=".txt", delete=False
+    ) as file:
+        file.write("\n".join(patterns))
+    try:
+        yield file.name
+    finally:
+        os.unlink(file.name)
+
+
+def parse_null_line(raw: bytes, separator: bytes) -> Optional[SearchMatch]:
+    """Parseia uma linha no formato ``caminho\0linha<sep>conteúdo`` (``-Z``/``-z``).
+
+    Args:
+        raw: Linha da saída da ferramenta, sem o ``\n`` final
+        separator: Separador entre número da linha e conteúdo (b":" ou b"\0")
+
+    Returns:
+        SearchMatch, ou None se a linha não estiver no formato esperado
+    """
+    path, null, rest = raw.partition(b"\0")
+    if not null:
+        return None
+    line_number, found, content = rest.partition(separator)
+    if not found or not line_number.isdigit():
+        return None
+    file = path.decode("utf-8", errors="surrogateescape")
+    if file.startswith("./"):
+        file = file[2:]
+    return SearchMatch(
+        file=file,
+        line=int(line_number),
+        content=content.decode("utf-8", errors="replace"),
+    )
+
+
+def stream_command(
+    cmd: list[str], workdir: Path, separator: bytes, deadline: Optional[Deadline]
+) -> SearchResults:
+    """Executa uma ferramenta de busca e produz as linhas conforme saem no pipe.
+
+    O processo é encerrado quando o consumidor fecha o iterador (já tem
+    resultados suficientes) ou quando o prazo vence, mesmo que a ferramenta
+    esteja varrendo arquivos sem produzir saída.
+
+    Args:
+        cmd: Comando da ferramenta, com saída no formato de parse_null_line
+        workdir: Diretório onde executar
+        separator: Separador entre número da linha e conteúdo
+        deadline: Prazo da busca (default: SEARCH_DEADLINE a partir de agora)
+
+    Yields:
+        Linhas encontradas
+    """
+    deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+    if deadline.expired:
+        return
+
+    try:
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=workdir
+        )
+    except OSError:
+        return
+
+    watchdog = threading.Timer(deadline.remaining(), process.kill)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        assert process.stdout is not None
+        for raw in process.stdout:
+            match = parse_null_line(raw.rstrip(b"\n"), separator)
+            if match is not None:
+                yield match
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+        if process.stdout is not None:
+            process.stdout.close()
+        process.wait()
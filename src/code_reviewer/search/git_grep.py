@@ -0,0 +1,56 @@
+"""Backend de busca com git grep."""
+
+from pathlib import Path
+from typing import Optional
+
+from .base import (
+    EXCLUDED_DIRS,
+    Deadline,
+    SearchResults,
+    is_git_work_tree,
+    pattern_file,
+    stream_command,
+)
+
+
+class GitGrepBackend:
+    """Busca com ``git grep``.
+
+    Pesquisa só arquivos rastreados (lendo do índice quando o arquivo não
+    mudou), respeita o .gitignore, usa várias threads e produz a saída
+    ordenada por caminho.
+    """
+
+    @property
+    def name(self) -> str:
+        return "git-grep"
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Verifica se o git existe e ``workdir`` está em um repositório."""
+        return is_git_work_tree(workdir)
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas nos arquivos rastreados."""
+        if not patterns:
+            return
+
+        excludes = [f":(exclude,glob)**/{pattern}/**" for pattern in EXCLUDED_DIRS]
+
+        with pattern_file(patterns) as path:
+            cmd = [
+                "git",
+                "grep",
+                "-n",
+                "-z",
+                "-I",
+                "-F",
+                "--no-color",
+                "-f",
+                path,
+                "--",
+                ".",
+                *excludes,
+            ]
+            yield from stream_command(cmd, workdir, b"\0", deadline)
@@ -0,0 +1,49 @@
+"""Backend de busca com grep recursivo."""
+
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from .base import EXCLUDED_DIRS, Deadline, SearchResults, pattern_file, stream_command
+
+
+def _build_grep_exclude_args() -> list[str]:
+    """Constrói argumentos de exclusão para o grep."""
+    args = []
+    for dir_pattern in EXCLUDED_DIRS:
+        args.extend(["--exclude-dir", dir_pattern])
+    return args
+
+
+class GrepBackend:
+    """Busca com ``grep -r``.
+
+    Disponível em praticamente qualquer sistema, mas percorre todo o
+    diretório (inclusive arquivos não rastreados) em uma única thread.
+    """
+
+    @property
+    def name(self) -> str:
+        return "grep"
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Verifica se o grep está no PATH."""
+        return shutil.which("grep") is not None
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas a partir de ``workdir``."""
+        if not patterns:
+            return
+
+        with pattern_file(patterns) as path:
+            cmd = [
+                "grep",
+                "-rnIZ",
+                "-F",
+                "-f",
+                path,
+                ".",
+            ] + _build_grep_exclude_args()
+            yield from stream_command(cmd, workdir, b":", deadline)
@@ -0,0 +1,148 @@
+"""Backend de busca em processo: arquivos rastreados mapeados em memória."""
+
+import mmap
+import os
+import re
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from .base import (
+    SEARCH_DEADLINE,
+    Deadline,
+    SearchMatch,
+    SearchResults,
+    compile_patterns,
+    is_binary,
+    is_excluded_path,
+    is_git_work_tree,
+    scan_buffer,
+)
+
+# Arquivos por tarefa do pool (amortiza o custo de agendamento)
+FILES_PER_TASK = 32
+
+# Threads do pool; a varredura alterna entre I/O e regex
+DEFAULT_SCAN_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+
+def list_tracked_files(workdir: Path) -> list[str]:
+    """Lista os arquivos rastreados sob ``workdir``, fora de EXCLUDED_DIRS.
+
+    Args:
+        workdir: Diretório dentro do repositório
+
+    Returns:
+        Caminhos relativos a ``workdir``, na ordem do índice do git; vazia
+        se o git falhar
+    """
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z"],
+            capture_output=True,
+            cwd=workdir,
+            check=True,
+        ).stdout
+    except (subprocess.CalledProcessError, OSError):
+        return []
+
+    paths = (
+        raw.decode("utf-8", errors="surrogateescape")
+        for raw in output.split(b"\0")
+        if raw
+    )
+    return [path for path in paths if not is_excluded_path(path)]
+
+
+def _scan_file(root: Path, path: str, regex: re.Pattern[bytes]) -> list[SearchMatch]:
+    """Mapeia um arquivo em memória e retorna as linhas com ocorrências."""
+    try:
+        with open(root / path, "rb") as file:
+            # Arquivo vazio não pode ser mapeado
+            if os.fstat(file.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if is_binary(buffer):
+                    return []
+                return scan_buffer(buffer, regex, path)
+    except (OSError, ValueError):
+        # Removido do working tree, diretório (submódulo) ou sem permissão
+        return []
+
+
+def _scan_files(
+    root: Path, paths: list[str], regex: re.Pattern[bytes], deadline: Deadline
+) -> list[SearchMatch]:
+    """Varre um lote de arquivos (uma tarefa do pool)."""
+    matches: list[SearchMatch] = []
+    for path in paths:
+        if deadline.expired:
+            break
+        matches.extend(_scan_file(root, path, regex))
+    return matches
+
+
+class MmapBackend:
+    """Busca em processo sobre a lista de arquivos rastreados.
+
+    A lista vem de ``git ls-files -z`` (mesmo escopo do git grep). Cada
+    arquivo é mapeado com ``mmap`` e pesquisado com uma única regex de
+    bytes que combina todos os padrões, sem criar processos por busca nem
+    reparsear saída de texto. Lotes de arquivos são distribuídos em um
+    pool de threads; os resultados saem na ordem da lista, e no máximo
+    ``2 * workers`` lotes ficam adiantados, para que fechar o iterador
+    interrompa a varredura.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        """Cria o backend.
+
+        Args:
+            workers: Threads do pool (default: DEFAULT_SCAN_WORKERS)
+        """
+        self.workers = workers or DEFAULT_SCAN_WORKERS
+
+    @property
+    def name(self) -> str:
+        return "mmap"
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Verifica se o git existe e ``workdir`` está em um repositório."""
+        return is_git_work_tree(workdir)
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas nos arquivos rastreados."""
+        if not patterns:
+            return
+
+        deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+        regex = compile_patterns(patterns)
+        files = list_tracked_files(workdir)
+        batches = (
+            files[start : start + FILES_PER_TASK]
+            for start in range(0, len(files), FILES_PER_TASK)
+        )
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="airev-scan"
+        )
+        pending: deque[Future[list[SearchMatch]]] = deque(
+            executor.submit(_scan_files, workdir, batch, regex, deadline)
+            for batch in islice(batches, self.workers * 2)
+        )
+        try:
+            while pending:
+                matches = pending.popleft().result()
+                for batch in islice(batches, 1):
+                    pending.append(
+                        executor.submit(_scan_files, workdir, batch, regex, deadline)
+                    )
+                yield from matches
+        finally:
+            # Lotes ainda na fila são descartados; os em andamento param no prazo
+            executor.shutdown(wait=True, cancel_futures=True)
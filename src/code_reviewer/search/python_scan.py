@@ -0,0 +1,60 @@
+"""Backend de busca em Python puro, sem ferramentas externas."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from .base import (
+    SEARCH_DEADLINE,
+    Deadline,
+    SearchResults,
+    compile_patterns,
+    is_binary,
+    is_excluded_dir,
+    scan_buffer,
+)
+
+
+class PythonBackend:
+    """Busca percorrendo o diretório com ``os.walk``.
+
+    Último recurso quando nenhuma ferramenta está instalada: sempre
+    disponível, mas mais lento. Cada arquivo é lido uma vez e pesquisado
+    com uma única regex que combina todos os padrões.
+    """
+
+    @property
+    def name(self) -> str:
+        return "python"
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Sempre disponível."""
+        return True
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas a partir de ``workdir``."""
+        if not patterns:
+            return
+
+        deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+        regex = compile_patterns(patterns)
+
+        for dirpath, dirnames, filenames in os.walk(workdir):
+            # Ordena para produzir sempre a mesma ordem
+            dirnames[:] = sorted(d for d in dirnames if not is_excluded_dir(d))
+            relative_dir = os.path.relpath(dirpath, workdir)
+
+            for filename in sorted(filenames):
+                if deadline.expired:
+                    return
+                try:
+                    content = Path(dirpath, filename).read_bytes()
+                except OSError:
+                    continue
+                if is_binary(content):
+                    continue
+
+                file = filename if relative_dir == "." else f"{relative_dir}/{filename}"
+                yield from scan_buffer(content, regex, file.replace(os.sep, "/"))
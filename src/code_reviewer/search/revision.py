@@ -0,0 +1,80 @@
+"""Busca na revisão do review (HEAD) em vez do working tree."""
+
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from ..git_objects import BlobReader
+from .base import (
+    SEARCH_DEADLINE,
+    Deadline,
+    SearchBackend,
+    SearchResults,
+    compile_patterns,
+    is_binary,
+    is_excluded_path,
+    scan_buffer,
+)
+
+
+class RevisionBackend:
+    """Adapta um backend para buscar na revisão de um ``BlobReader``.
+
+    As ferramentas varrem o disco, que pode ter alterações não commitadas.
+    Os resultados em arquivos iguais à revisão são mantidos; os arquivos
+    alterados localmente são pesquisados na versão da revisão, lida pelo
+    leitor (costumam ser poucos), e os que não existem nela (não
+    rastreados) são descartados. Assim linhas e trechos batem com o
+    conteúdo que o ``FileCache`` do review lê.
+
+    Se o git não conseguir listar os arquivos, a busca segue no working
+    tree, como o backend original.
+    """
+
+    def __init__(self, backend: SearchBackend, blob_reader: BlobReader) -> None:
+        """Cria o adaptador.
+
+        Args:
+            backend: Backend que varre o working tree
+            blob_reader: Leitor da revisão pesquisada
+        """
+        self.backend = backend
+        self.blob_reader = blob_reader
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Disponível quando o backend original está."""
+        return self.backend.check_availability(workdir)
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas nos arquivos da revisão."""
+        if not patterns:
+            return
+
+        deadline = deadline or Deadline.after(SEARCH_DEADLINE)
+        paths = self.blob_reader.paths()
+        changed = self.blob_reader.changed_paths()
+        if paths is None or changed is None:
+            yield from self.backend.search(patterns, workdir, deadline)
+            return
+
+        with closing(self.backend.search(patterns, workdir, deadline)) as matches:
+            for match in matches:
+                if match.file in paths and match.file not in changed:
+                    yield match
+
+        regex = compile_patterns(patterns)
+        for path in sorted(changed & paths):
+            if deadline.expired:
+                return
+            if is_excluded_path(path):
+                continue
+            content = self.blob_reader.read_file(path)
+            if content is None or is_binary(content):
+                continue
+            yield from scan_buffer(content, regex, path)
@@ -0,0 +1,54 @@
+"""Backend de busca com ripgrep."""
+
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from .base import EXCLUDED_DIRS, Deadline, SearchResults, pattern_file, stream_command
+
+
+class RipgrepBackend:
+    """Busca com ``rg``.
+
+    Respeita .gitignore e ignora arquivos ocultos e binários. A saída é
+    ordenada por caminho (``--sort path``) para que o resultado, e portanto
+    o prompt, seja o mesmo entre execuções.
+    """
+
+    @property
+    def name(self) -> str:
+        return "ripgrep"
+
+    def check_availability(self, workdir: Path) -> bool:
+        """Verifica se o rg está no PATH."""
+        return shutil.which("rg") is not None
+
+    def search(
+        self, patterns: list[str], workdir: Path, deadline: Optional[Deadline] = None
+    ) -> SearchResults:
+        """Busca as strings fixas a partir de ``workdir``."""
+        if not patterns:
+            return
+
+        excludes = []
+        for pattern in EXCLUDED_DIRS:
+            excludes.extend(["--glob", f"!**/{pattern}/**"])
+
+        with pattern_file(patterns) as path:
+            cmd = [
+                "rg",
+                "-n",
+                "--null",
+                "-F",
+                "--no-heading",
+                "--with-filename",
+                "--color",
+                "never",
+                "--sort",
+                "path",
+                "-f",
+                path,
+                *excludes,
+                ".",
+            ]
+            yield from stream_command(cmd, workdir, b":", deadline)
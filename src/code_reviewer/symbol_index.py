@@ -0,0 +1,413 @@
+"""Índice persistente de definições de símbolos (símbolo -> arquivo, linha, tipo).
+
+Substitui o ``grep`` por símbolo em ``find_callees``: os arquivos rastreados
+pelo git são varridos uma vez com a mesma heurística de definição
+(``def``/``class``/``function``/``func``) e o resultado fica no cache do
+repositório. O índice cobre a versão do HEAD (a mesma do diff), lida do
+banco de objetos; nas execuções seguintes só são reparseados os arquivos
+cujo SHA de blob mudou, e cada busca é um acesso a dicionário. Arquivos
+de teste também têm as chamadas extraídas, para o índice de testes
+relacionados (ver ``related_tests``).
+"""
+
+import hashlib
+import json
+import marshal
+import re
+import subprocess
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .cache import atomic_write_bytes
+from .git_objects import DEFAULT_REVISION, BlobReader
+from .related_tests import (
+    RelatedTestIndex,
+    TestFileState,
+    extract_test_references,
+    is_test_file,
+)
+from .repository import RepositorySession
+from .search.base import Deadline, is_excluded_path
+
+INDEX_FILE_NAME = "symbols.idx"
+STATS_FILE_NAME = "symbols-stats.json"
+NO_DEFINITION_FILE_NAME = "no-definitions.json"
+
+# Incrementar ao mudar o formato serializado ou a extração
+SYMBOL_INDEX_VERSION = 2
+
+# Arquivos maiores que isso (normalmente gerados) não são indexados
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+
+# Nomes guardados no cache de "sem definição" (os excedentes não são salvos)
+MAX_NO_DEFINITION_NAMES = 10_000
+
+# Tamanho máximo do trecho da linha guardado por definição
+MAX_SNIPPET_CHARS = 200
+
+# Mesma heurística do grep anterior: palavra-chave seguida do nome
+DEFINITION_PATTERN = re.compile(rb"\b(def|class|function|func)\s+([A-Za-z_][A-Za-z0-9_]*)")
+
+# Modos do git que não são arquivos regulares (symlink e submódulo)
+NON_FILE_MODES = ("120000", "160000")
+
+# Definição serializada: (nome, linha, tipo, trecho)
+DefinitionState = tuple[str, int, str, str]
+# Arquivo serializado: (chave de conteúdo, definições, referências se for teste)
+FileState = tuple[str, list[DefinitionState], Optional[TestFileState]]
+
+
+@dataclass(frozen=True)
+class SymbolDefinition:
+    """Local onde um símbolo é definido."""
+
+    name: str
+    file: str
+    line: int
+    kind: str
+    snippet: str
+
+
+@dataclass
+class IndexBuildStats:
+    """Resumo da construção/atualização do índice."""
+
+    files: int = 0
+    reused: int = 0
+    parsed: int = 0
+    symbols: int = 0
+    seconds: float = 0.0
+    # False se o prazo esgotou antes de reparsear todos os arquivos
+    complete: bool = True
+
+
+def extract_definitions(content: bytes) -> list[DefinitionState]:
+    """Extrai as definições de símbolos de um arquivo.
+
+    Args:
+        content: Conteúdo do arquivo
+
+    Returns:
+        Lista de (nome, linha, tipo, trecho); vazia para arquivos binários
+    """
+    if b"\0" in content[:8192]:
+        return []
+
+    definitions: list[DefinitionState] = []
+    line = 1
+    position = 0
+    for match in DEFINITION_PATTERN.finditer(content):
+        start = match.start()
+        line += content.count(b"\n", position, start)
+        position = start
+
+        line_start = content.rfind(b"\n", 0, start) + 1
+        line_end = content.find(b"\n", start)
+        snippet = content[line_start : line_end if line_end >= 0 else len(content)]
+        definitions.append(
+            (
+                match.group(2).decode("ascii"),
+                line,
+                match.group(1).decode("ascii"),
+                snippet.decode("utf-8", errors="replace").strip()[:MAX_SNIPPET_CHARS],
+            )
+        )
+    return definitions
+
+
+def list_indexable_files(root: Path, revision: str = DEFAULT_REVISION) -> dict[str, str]:
+    """Lista os arquivos da revisão com a chave que identifica seu conteúdo.
+
+    A chave é o SHA do blob na revisão (default: HEAD, a mesma do diff e
+    do ``FileCache`` do review); alterações não commitadas não entram.
+
+    Args:
+        root: Raiz do repositório
+        revision: Revisão listada
+
+    Returns:
+        Dicionário caminho -> chave de conteúdo
+
+    Raises:
+        subprocess.CalledProcessError: Se o comando git falhar
+    """
+    tree = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "--full-tree", revision],
+        capture_output=True,
+        cwd=root,
+        check=True,
+    ).stdout
+
+    files: dict[str, str] = {}
+    for entry in tree.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, raw_path = entry.partition(b"\t")
+        mode, _type, blob_sha = meta.decode("ascii").split(" ")
+        path = raw_path.decode("utf-8", errors="surrogateescape")
+        if mode in NON_FILE_MODES or is_excluded_path(path):
+            continue
+        files[path] = blob_sha
+
+    return files
+
+
+class SymbolIndex:
+    """Índice em memória símbolo -> definições, com contagem de acertos."""
+
+    def __init__(self, files: dict[str, FileState]) -> None:
+        """Cria o índice.
+
+        Args:
+            files: Caminho -> (chave de conteúdo, definições do arquivo,
+                referências se for arquivo de teste)
+        """
+        self.files = files
+        # Testes relacionados, extraídos na mesma varredura
+        self.tests = RelatedTestIndex(
+            {path: state[2] for path, state in files.items() if state[2] is not None}
+        )
+        self.hits = 0
+        self.misses = 0
+        self._by_name: dict[str, list[SymbolDefinition]] = {}
+        for path in sorted(files):
+            for name, line, kind, snippet in files[path][1]:
+                self._by_name.setdefault(name, []).append(
+                    SymbolDefinition(name, path, line, kind, snippet)
+                )
+
+    def lookup(self, name: str) -> list[SymbolDefinition]:
+        """Retorna as definições de um símbolo, ordenadas por arquivo e linha."""
+        definitions = self._by_name.get(name)
+        if definitions:
+            self.hits += 1
+            return definitions
+        self.misses += 1
+        return []
+
+    def definition_count(self, name: str) -> int:
+        """Quantidade de definições de um símbolo (sem contar como busca)."""
+        return len(self._by_name.get(name, ()))
+
+    @property
+    def symbol_count(self) -> int:
+        """Quantidade de nomes distintos indexados."""
+        return len(self._by_name)
+
+    def dump(self) -> bytes:
+        """Serializa o índice (marshal + zlib)."""
+        return zlib.compress(
+            marshal.dumps((SYMBOL_INDEX_VERSION, self.files)), level=1
+        )
+
+    @classmethod
+    def load(cls, data: bytes) -> Optional["SymbolIndex"]:
+        """Reconstrói o índice de dump(), ou None se inválido/de outra versão."""
+        try:
+            version, files = marshal.loads(zlib.decompress(data))
+        except (ValueError, TypeError, EOFError, zlib.error):
+            return None
+        if version != SYMBOL_INDEX_VERSION:
+            return None
+        return cls(files)
+
+
+def build_symbol_index(
+    root: Path,
+    previous: Optional[SymbolIndex] = None,
+    deadline: Optional[Deadline] = None,
+) -> tuple[SymbolIndex, IndexBuildStats]:
+    """Constrói o índice, reaproveitando arquivos cujo conteúdo não mudou.
+
+    Se o ``deadline`` esgotar, os arquivos que ainda precisariam ser
+    parseados ficam fora do índice e ``stats.complete`` fica False; os
+    já reaproveitados continuam nele.
+
+    Args:
+        root: Raiz do repositório
+        previous: Índice anterior (default: constrói do zero)
+        deadline: Prazo para parsear os arquivos alterados (default: sem prazo)
+
+    Returns:
+        Tupla (índice, estatísticas da construção)
+
+    Raises:
+        subprocess.CalledProcessError: Se o comando git falhar
+    """
+    start = time.perf_counter()
+    stats = IndexBuildStats()
+    old_files = previous.files if previous is not None else {}
+    files: dict[str, FileState] = {}
+
+    with BlobReader(root) as reader:
+        for path, key in list_indexable_files(root).items():
+            cached = old_files.get(path)
+            if cached is not None and cached[0] == key:
+                files[path] = cached
+                stats.reused += 1
+                continue
+            if deadline is not None and deadline.expired:
+                stats.complete = False
+                continue
+
+            content = reader.read(key)
+            if content is None or len(content) > MAX_INDEXED_FILE_BYTES:
+                continue
+            tests = extract_test_references(content, path) if is_test_file(path) else None
+            files[path] = (key, extract_definitions(content), tests)
+            stats.parsed += 1
+
+    index = SymbolIndex(files)
+    stats.files = len(files)
+    stats.symbols = index.symbol_count
+    stats.seconds = time.perf_counter() - start
+    return index, stats
+
+
+def load_symbol_index(
+    session: RepositorySession,
+    rebuild: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> tuple[SymbolIndex, IndexBuildStats]:
+    """Carrega o índice do cache do repositório e o atualiza.
+
+    O arquivo só é regravado se algum arquivo foi reparseado ou removido.
+    Um índice interrompido pelo ``deadline`` também é gravado: a próxima
+    execução parseia só os arquivos que faltaram.
+
+    Args:
+        session: Sessão do repositório
+        rebuild: Ignora o índice salvo e reconstrói do zero
+        deadline: Prazo da atualização (ver build_symbol_index)
+
+    Returns:
+        Tupla (índice atualizado, estatísticas da atualização)
+
+    Raises:
+        subprocess.CalledProcessError: Se o comando git falhar
+    """
+    path = session.cache_dir / INDEX_FILE_NAME
+    previous = None
+    if not rebuild:
+        try:
+            previous = SymbolIndex.load(path.read_bytes())
+        except OSError:
+            previous = None
+
+    index, stats = build_symbol_index(session.root, previous, deadline)
+
+    if previous is None or stats.parsed or len(previous.files) != stats.files:
+        try:
+            atomic_write_bytes(path, index.dump())
+        except OSError:
+            pass
+
+    return index, stats
+
+
+def record_lookup_stats(session: RepositorySession, index: SymbolIndex) -> None:
+    """Acumula os acertos/erros de busca desta execução no cache do repositório."""
+    if not index.hits and not index.misses:
+        return
+    hits, misses = read_lookup_stats(session)
+    data = {"hits": hits + index.hits, "misses": misses + index.misses}
+    try:
+        atomic_write_bytes(
+            session.cache_dir / STATS_FILE_NAME, json.dumps(data).encode("utf-8")
+        )
+    except OSError:
+        pass
+
+
+def read_lookup_stats(session: RepositorySession) -> tuple[int, int]:
+    """Retorna (acertos, erros) acumulados das buscas no índice."""
+    try:
+        data = json.loads((session.cache_dir / STATS_FILE_NAME).read_bytes())
+        return int(data["hits"]), int(data["misses"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0, 0
+
+
+def files_fingerprint(files: dict[str, str]) -> str:
+    """Identifica um estado dos arquivos rastreados (ver list_indexable_files).
+
+    Muda sempre que o índice de símbolos precisaria reparsear ou remover
+    algum arquivo.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(files):
+        digest.update(f"{path}\0{files[path]}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+class NoDefinitionCache:
+    """Símbolos que a busca textual varreu o projeto inteiro sem encontrar definidos.
+
+    Vale para um estado dos arquivos rastreados (``fingerprint``): qualquer
+    arquivo adicionado, removido ou alterado invalida o cache inteiro.
+    """
+
+    def __init__(self, fingerprint: str, names: Iterable[str] = ()) -> None:
+        """Cria o cache.
+
+        Args:
+            fingerprint: Estado dos arquivos (files_fingerprint)
+            names: Símbolos já sabidamente sem definição
+        """
+        self.fingerprint = fingerprint
+        self.names = set(names)
+        self.changed = False
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def add(self, name: str) -> None:
+        """Registra um símbolo sem definição no projeto."""
+        if name not in self.names:
+            self.names.add(name)
+            self.changed = True
+
+
+def load_no_definition_cache(session: RepositorySession) -> NoDefinitionCache:
+    """Carrega o cache de símbolos sem definição do repositório.
+
+    Um cache salvo para outro estado dos arquivos é descartado.
+
+    Args:
+        session: Sessão do repositório
+
+    Returns:
+        Cache válido para os arquivos atuais (vazio se não havia um)
+
+    Raises:
+        subprocess.CalledProcessError: Se o comando git falhar
+    """
+    fingerprint = files_fingerprint(list_indexable_files(session.root))
+    try:
+        data = json.loads((session.cache_dir / NO_DEFINITION_FILE_NAME).read_bytes())
+        if data["version"] == SYMBOL_INDEX_VERSION and data["fingerprint"] == fingerprint:
+            return NoDefinitionCache(fingerprint, data["names"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return NoDefinitionCache(fingerprint)
+
+
+def save_no_definition_cache(session: RepositorySession, cache: NoDefinitionCache) -> None:
+    """Grava o cache de símbolos sem definição, se algo foi acrescentado."""
+    if not cache.changed:
+        return
+    data = {
+        "version": SYMBOL_INDEX_VERSION,
+        "fingerprint": cache.fingerprint,
+        "names": sorted(cache.names)[:MAX_NO_DEFINITION_NAMES],
+    }
+    try:
+        atomic_write_bytes(
+            session.cache_dir / NO_DEFINITION_FILE_NAME, json.dumps(data).encode("utf-8")
+        )
+    except OSError:
+        pass
+    cache.changed = False
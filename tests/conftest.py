@@ -0,0 +1,28 @@
+"""Fixtures e helpers compartilhados pelos testes."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+def git(repo: Path, *args: str) -> str:
+    """Executa um comando git no repositório de teste e retorna a saída."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Repositório git vazio, na branch main e com autor configurado.
+
+    Os módulos de teste sobrescrevem esta fixture (recebendo-a como
+    parâmetro) para criar os arquivos e commits de que precisam.
+    """
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "Test")
+    return repo
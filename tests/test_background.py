@@ -0,0 +1,44 @@
+"""Testes para as tarefas em segundo plano."""
+
+import threading
+
+import pytest
+
+from code_reviewer.background import BackgroundTask
+
+
+class TestBackgroundTask:
+    """Testes para BackgroundTask."""
+
+    def test_retorna_resultado(self):
+        task = BackgroundTask("soma", lambda a, b=0: a + b, 2, b=3)
+
+        assert task.result() == 5
+        assert task.done()
+
+    def test_relanca_excecao(self):
+        def falha():
+            raise ValueError("quebrou")
+
+        task = BackgroundTask("falha", falha)
+
+        with pytest.raises(ValueError, match="quebrou"):
+            task.result()
+
+    def test_roda_em_paralelo_com_quem_aguarda(self):
+        liberado = threading.Event()
+        task = BackgroundTask("espera", liberado.wait, 5)
+
+        assert not task.done()
+        liberado.set()
+        assert task.result() is True
+
+    def test_thread_daemon_nomeada(self):
+        nomes = []
+        task = BackgroundTask(
+            "contexto",
+            lambda: nomes.append((threading.current_thread().name, threading.current_thread().daemon)),
+        )
+        task.result()
+
+        assert nomes == [("airev-contexto", True)]
@@ -0,0 +1,313 @@
+"""Testes para o grafo de chamadas Python via AST."""
+
+from collections import OrderedDict
+
+import pytest
+
+from code_reviewer import call_graph
+from code_reviewer.call_graph import (
+    PythonCallGraph,
+    build_call_graph,
+    extract_file_calls,
+    load_file_calls,
+    module_name,
+)
+from code_reviewer.context_builder import build_context_graph
+from code_reviewer.diff_parser import parse_diff
+from code_reviewer.python_analysis import git_blob_sha
+from code_reviewer.search import Deadline
+
+from .conftest import git
+
+PAGAMENTOS = b'''from .util import formatar
+
+
+class Pagamento:
+    def processar(self, valor):
+        self.validar(valor)
+        return formatar(valor)
+
+    def validar(self, valor):
+        return valor > 0
+
+
+def pagar(valor):
+    # pagar(0) em comentario
+    texto = "pagar(1) em string"
+    return Pagamento().processar(valor)
+'''
+
+UTIL = b'''def formatar(valor):
+    return f"R$ {valor}"
+'''
+
+INIT = b'''from .pagamentos import pagar
+'''
+
+APP = b'''import loja.util as u
+from loja import pagar
+
+
+class Relatorio:
+    def validar(self, linha):
+        return bool(linha)
+
+    def gerar(self):
+        self.validar("x")
+        return u.formatar(pagar(10))
+
+
+def pagar_tudo():
+    return [pagar(v) for v in (1, 2)]
+'''
+
+FILES = {
+    "src/loja/__init__.py": INIT,
+    "src/loja/pagamentos.py": PAGAMENTOS,
+    "src/loja/util.py": UTIL,
+    "app.py": APP,
+}
+
+
+@pytest.fixture(autouse=True)
+def calls_cache(tmp_path, monkeypatch):
+    """Isola o cache de chamadas em memória e em disco."""
+    directory = tmp_path / "calls"
+    monkeypatch.setattr(call_graph, "CALLS_CACHE_DIR", directory)
+    monkeypatch.setattr(call_graph, "_calls_cache", OrderedDict())
+    return directory
+
+
+@pytest.fixture
+def graph():
+    return PythonCallGraph({path: extract_file_calls(source) for path, source in FILES.items()})
+
+
+@pytest.fixture
+def project(git_repo):
+    """Repositório git com os arquivos de FILES commitados."""
+    repo = git_repo
+    for path, source in FILES.items():
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / path).write_bytes(source)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    return repo
+
+
+class TestExtractFileCalls:
+    """Testes para a extração de um arquivo."""
+
+    def test_definicoes_com_nome_qualificado(self):
+        calls = extract_file_calls(PAGAMENTOS)
+
+        assert [(d.qualname, d.kind, d.line) for d in calls.definitions] == [
+            ("Pagamento", "class", 4),
+            ("Pagamento.processar", "function", 5),
+            ("Pagamento.validar", "function", 9),
+            ("pagar", "function", 13),
+        ]
+
+    def test_chamadas_com_escopo(self):
+        calls = extract_file_calls(PAGAMENTOS)
+
+        assert [(c.scope, c.target, c.line) for c in calls.calls] == [
+            ("Pagamento.processar", "self.validar", 6),
+            ("Pagamento.processar", "formatar", 7),
+            ("pagar", ".processar", 16),
+            ("pagar", "Pagamento", 16),
+        ]
+
+    def test_comentarios_e_strings_nao_sao_chamadas(self):
+        calls = extract_file_calls(PAGAMENTOS)
+
+        assert all(c.line not in (14, 15) for c in calls.calls)
+
+    def test_imports(self):
+        calls = extract_file_calls(APP)
+
+        assert [(i.alias, i.level, i.module, i.name) for i in calls.imports] == [
+            ("u", 0, "loja.util", ""),
+            ("pagar", 0, "loja", "pagar"),
+        ]
+
+    def test_codigo_invalido(self):
+        assert extract_file_calls(b"def quebrado(:\n") is None
+
+
+class TestModuleName:
+    """Testes para o nome do módulo de um arquivo."""
+
+    def test_modulo(self):
+        assert module_name("src/loja/util.py") == "src.loja.util"
+
+    def test_pacote(self):
+        assert module_name("src/loja/__init__.py") == "src.loja"
+
+
+class TestPythonCallGraph:
+    """Testes para a resolução das chamadas."""
+
+    def test_callers_via_reexportacao_e_alias(self, graph):
+        callers = graph.callers("src/loja/pagamentos.py", "pagar")
+
+        assert [(file, call.line, call.scope) for file, call in callers] == [
+            ("app.py", 11, "Relatorio.gerar"),
+            ("app.py", 15, "pagar_tudo"),
+        ]
+
+    def test_import_relativo(self, graph):
+        callers = graph.callers("src/loja/util.py", "formatar")
+
+        assert [(file, call.line) for file, call in callers] == [
+            ("app.py", 11),
+            ("src/loja/pagamentos.py", 7),
+        ]
+
+    def test_metodo_homonimo_de_outra_classe_nao_conta(self, graph):
+        callers = graph.callers("src/loja/pagamentos.py", "validar")
+
+        assert [(file, call.line) for file, call in callers] == [
+            ("src/loja/pagamentos.py", 6)
+        ]
+
+    def test_metodo_unico_em_receptor_desconhecido(self, graph):
+        callers = graph.callers("src/loja/pagamentos.py", "processar")
+
+        assert [(file, call.line) for file, call in callers] == [
+            ("src/loja/pagamentos.py", 16)
+        ]
+
+    def test_callees_por_linha(self, graph):
+        callees = graph.callees("app.py", {11})
+
+        assert [(file, d.qualname) for file, d in callees] == [
+            ("src/loja/util.py", "formatar"),
+            ("src/loja/pagamentos.py", "pagar"),
+        ]
+
+    def test_builtins_nao_resolvem(self, graph):
+        assert graph.callees("app.py", {7}) == []
+
+    def test_callers_de_definicao_qualificada(self, graph):
+        callers = graph.callers_of("src/loja/pagamentos.py", "Pagamento.processar")
+
+        assert [(file, call.scope) for file, call in callers] == [
+            ("src/loja/pagamentos.py", "pagar")
+        ]
+        assert graph.callers_of("src/loja/pagamentos.py", "inexistente") == []
+
+    def test_callees_de_definicao(self, graph):
+        callees = graph.callees_of("app.py", "Relatorio.gerar")
+
+        assert [(file, d.qualname) for file, d in callees] == [
+            ("app.py", "Relatorio.validar"),
+            ("src/loja/util.py", "formatar"),
+            ("src/loja/pagamentos.py", "pagar"),
+        ]
+
+
+class TestCache:
+    """Testes para o cache por SHA de blob."""
+
+    def test_reaproveita_cache_em_disco(self, tmp_path, calls_cache, monkeypatch):
+        (tmp_path / "m.py").write_bytes(UTIL)
+        sha = git_blob_sha(UTIL)
+
+        calls = load_file_calls("m.py", sha, tmp_path)
+
+        assert (calls_cache / f"{sha}.json").exists()
+
+        # Nova execução: sem cache em memória e sem o arquivo no disco
+        monkeypatch.setattr(call_graph, "_calls_cache", OrderedDict())
+        (tmp_path / "m.py").unlink()
+        assert load_file_calls("m.py", sha, tmp_path) == calls
+
+    def test_cache_em_memoria_limitado(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(call_graph, "MAX_CALLS_MEMORY_ENTRIES", 2)
+        shas = []
+        for number in range(3):
+            content = f"def f{number}():\n    pass\n".encode()
+            (tmp_path / f"m{number}.py").write_bytes(content)
+            shas.append(git_blob_sha(content))
+            load_file_calls(f"m{number}.py", shas[-1], tmp_path)
+
+        # O menos usado sai da memória, mas continua no disco
+        assert list(call_graph._calls_cache) == shas[1:]
+        assert load_file_calls("m0.py", shas[0], tmp_path) is not None
+        assert list(call_graph._calls_cache) == [shas[2], shas[0]]
+
+
+class TestBuildCallGraph:
+    """Testes para a construção a partir do repositório."""
+
+    def test_arquivos_rastreados(self, project):
+        graph = build_call_graph(project)
+
+        assert sorted(graph.files) == sorted(FILES)
+
+    def test_prazo_esgotado_nao_retorna_grafo_parcial(self, project):
+        assert build_call_graph(project, deadline=Deadline.after(0)) is None
+
+    def test_context_graph_sem_falsos_positivos(self, project):
+        diff = parse_diff("""diff --git a/src/loja/pagamentos.py b/src/loja/pagamentos.py
+--- a/src/loja/pagamentos.py
++++ b/src/loja/pagamentos.py
+@@ -9,2 +9,2 @@ class Pagamento:
+     def validar(self, valor):
+-        return valor
++        return valor > 0
+""")
+        diff[0].hunks[0].function_name = "validar"
+
+        graphs = build_context_graph(diff, project, call_graph=build_call_graph(project, diff))
+
+        # Relatorio.validar("x") em app.py não é chamada deste método
+        assert [(r.file, r.line) for r in graphs[0].callers] == [
+            ("src/loja/pagamentos.py", 6)
+        ]
+
+    def test_callers_transitivos(self, project):
+        diff = parse_diff("""diff --git a/src/loja/pagamentos.py b/src/loja/pagamentos.py
+--- a/src/loja/pagamentos.py
++++ b/src/loja/pagamentos.py
+@@ -9,2 +9,2 @@ class Pagamento:
+     def validar(self, valor):
+-        return valor
++        return valor > 0
+""")
+        diff[0].hunks[0].function_name = "validar"
+
+        graphs = build_context_graph(
+            diff, project, call_graph=build_call_graph(project, diff), context_depth=3
+        )
+
+        # validar <- Pagamento.processar <- pagar <- app.py
+        assert [(r.depth, r.file, r.line, r.function_name) for r in graphs[0].callers] == [
+            (1, "src/loja/pagamentos.py", 6, "Pagamento.processar"),
+            (2, "src/loja/pagamentos.py", 16, "pagar"),
+            (3, "app.py", 11, "Relatorio.gerar"),
+            (3, "app.py", 15, "pagar_tudo"),
+        ]
+
+    def test_callees_transitivos(self, project):
+        diff = parse_diff("""diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -11,1 +11,1 @@ class Relatorio:
+-        return None
++        return u.formatar(pagar(10))
+""")
+        diff[0].hunks[0].function_name = "gerar"
+        graph = build_call_graph(project, diff)
+
+        direct = build_context_graph(diff, project, call_graph=graph)
+        deep = build_context_graph(diff, project, call_graph=graph, context_depth=3)
+
+        assert deep[0].callees[: len(direct[0].callees)] == direct[0].callees
+        # pagar -> Pagamento (classe sem __init__: a expansão para aí)
+        assert [(r.depth, r.function_name) for r in deep[0].callees] == [
+            (1, "formatar"),
+            (1, "pagar"),
+            (2, "Pagamento"),
+        ]
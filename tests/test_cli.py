@@ -103,3 +103,21 @@ class TestReviewCommand:
 
         assert result.exit_code == 0
         assert "-D" in result.output
+
+    def test_flag_diff_workers_reconhecida(self):
+        """Verifica que a flag --diff-workers é aceita pelo CLI."""
+        runner = CliRunner()
+
+        result = runner.invoke(review, ["--help"])
+
+        assert result.exit_code == 0
+        assert "--diff-workers" in result.output
+
+    def test_flag_incremental_reconhecida(self):
+        """Verifica que a flag --incremental é aceita pelo CLI."""
+        runner = CliRunner()
+
+        result = runner.invoke(review, ["--help"])
+
+        assert result.exit_code == 0
+        assert "--incremental" in result.output
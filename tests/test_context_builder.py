@@ -1,9 +1,20 @@
 """Testes para o context_builder."""
 
+from code_reviewer import context_builder
 from code_reviewer.context_builder import (
+    MAX_REFS_PER_SYMBOL,
     _is_comment_line,
+    build_context_graph,
+    expand_context_graph,
     find_callees,
+    find_callers,
+    find_callers_batch,
 )
+from code_reviewer.diff_parser import parse_diff
+from code_reviewer.models import ContextLookup
+from code_reviewer.related_tests import extract_test_references
+from code_reviewer.search import Deadline, GrepBackend
+from code_reviewer.symbol_index import SymbolIndex, extract_definitions
 
 
 class TestIsCommentLine:
@@ -73,3 +84,306 @@ class TestFindCallees:
     def test_lista_vazia(self):
         callees = find_callees([], workdir=None)
         assert callees == []
+
+    def test_nao_busca_biblioteca_padrao(self, tmp_path):
+        (tmp_path / "util.py").write_text("def loads(s):\n    pass\n\ndef salvar():\n    pass\n")
+
+        backend = GrepBackend()
+
+        callees = find_callees(
+            ["dados = json.loads(texto)", "itens.append(x)", "salvar()"],
+            tmp_path,
+            search_backend=backend,
+        )
+        methods = find_callees(["self.loads(t)"], tmp_path, search_backend=backend)
+
+        assert [c.function_name for c in callees] == ["salvar"]
+        assert [c.function_name for c in methods] == ["loads"]
+
+
+class TestFindCallersBatch:
+    """Testes para a busca de callers em uma única varredura."""
+
+    def _project(self, tmp_path):
+        (tmp_path / "app.py").write_text(
+            "def pagar(valor):\n"
+            "    return estornar(valor)\n"
+            "\n"
+            "# pagar(1) em comentário\n"
+            "pagar(10); estornar(5)\n"
+        )
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "lib.js").write_text("pagar(1)\n")
+        return tmp_path
+
+    def test_distribui_linhas_entre_simbolos(self, tmp_path):
+        project = self._project(tmp_path)
+
+        callers = find_callers_batch(["pagar", "estornar", "ausente"], project)
+
+        assert [(r.file, r.line) for r in callers["pagar"]] == [("app.py", 5)]
+        assert sorted((r.file, r.line) for r in callers["estornar"]) == [
+            ("app.py", 2),
+            ("app.py", 5),
+        ]
+        assert callers["ausente"] == []
+
+    def test_mesmo_resultado_que_busca_individual(self, tmp_path):
+        project = self._project(tmp_path)
+
+        batch = find_callers_batch(["pagar", "estornar"], project)
+
+        assert batch["pagar"] == find_callers("pagar", project)
+        assert batch["estornar"] == find_callers("estornar", project)
+
+    def test_limite_por_simbolo(self, tmp_path):
+        (tmp_path / "muitos.py").write_text("cobrar()\n" * 20 + "avisar()\n")
+
+        callers = find_callers_batch(["cobrar", "avisar"], tmp_path)
+
+        assert len(callers["cobrar"]) == MAX_REFS_PER_SYMBOL
+        assert len(callers["avisar"]) == 1
+
+    def test_uma_unica_varredura_do_projeto(self, tmp_path):
+        project = self._project(tmp_path)
+        backend = GrepBackend()
+        calls = []
+        original = backend.search
+
+        def spy(patterns, workdir, deadline=None):
+            calls.append(patterns)
+            return original(patterns, workdir, deadline)
+
+        backend.search = spy
+        diff = parse_diff("""diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -1,2 +1,2 @@ def pagar(valor):
+-    return 1
++    return estornar(valor)
+@@ -5,1 +5,1 @@ def estornar(valor):
+-x
++y
+""")
+
+        graphs = build_context_graph(
+            diff, project, symbol_index=None, search_backend=backend
+        )
+
+        assert {g.function_name for g in graphs} == {"pagar", "estornar"}
+        caller_scans = [p for p in calls if "pagar(" in p]
+        assert caller_scans == [["pagar(", "estornar("]]
+
+
+class TestExpandContextGraph:
+    """Testes para a expansão transitiva pela busca textual."""
+
+    def _project(self, tmp_path):
+        (tmp_path / "base.js").write_text("function cobrar(valor) {\n  return valor;\n}\n")
+        (tmp_path / "servico.js").write_text(
+            "function pagar(valor) {\n  return cobrar(valor);\n}\n"
+        )
+        (tmp_path / "main.js").write_text("function main() {\n  pagar(1);\n}\n")
+        return tmp_path
+
+    def _diff(self):
+        return parse_diff("""diff --git a/base.js b/base.js
+--- a/base.js
++++ b/base.js
+@@ -1,2 +1,2 @@ function cobrar(valor) {
+-  return 0;
++  return valor;
+""")
+
+    def test_profundidade_um_mantem_chamadas_diretas(self, tmp_path):
+        project = self._project(tmp_path)
+
+        graphs = build_context_graph(self._diff(), project, search_backend=GrepBackend())
+
+        assert [(r.file, r.line, r.depth) for r in graphs[0].callers] == [
+            ("servico.js", 2, 1)
+        ]
+
+    def test_callers_do_segundo_nivel(self, tmp_path):
+        project = self._project(tmp_path)
+
+        graphs = build_context_graph(
+            self._diff(), project, search_backend=GrepBackend(), context_depth=3
+        )
+
+        assert [(r.file, r.line, r.depth, r.function_name) for r in graphs[0].callers] == [
+            ("servico.js", 2, 1, None),
+            ("main.js", 2, 2, "main"),
+        ]
+
+    def test_prazo_esgotado_interrompe_niveis_indiretos(self, tmp_path):
+        project = self._project(tmp_path)
+        graph = build_context_graph(self._diff(), project, search_backend=GrepBackend())[0]
+
+        expand_context_graph(
+            graph, 3, project, GrepBackend(), deadline=Deadline.after(0)
+        )
+
+        assert [r.depth for r in graph.callers] == [1]
+        assert graph.skipped_lookups == [ContextLookup.INDIRECT]
+
+    def test_respeita_o_limite_total(self, tmp_path, monkeypatch):
+        project = self._project(tmp_path)
+        monkeypatch.setattr(context_builder, "MAX_CONTEXT_NODES", 1)
+
+        graphs = build_context_graph(
+            self._diff(), project, search_backend=GrepBackend(), context_depth=3
+        )
+
+        assert [r.depth for r in graphs[0].callers] == [1]
+
+
+class TestContextDeadline:
+    """Testes para o prazo único do backtracking de contexto."""
+
+    DIFF = """diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -1,2 +1,2 @@ def pagar(valor):
+-    return 1
++    return estornar(valor)
+"""
+
+    def _project(self, tmp_path):
+        (tmp_path / "app.py").write_text(
+            "def pagar(valor):\n    return estornar(valor)\n\npagar(10)\n"
+        )
+        # Sem import em app.py: a definição só é achada pela busca
+        (tmp_path / "estorno.py").write_text("def estornar(valor):\n    pass\n")
+        return tmp_path
+
+    def _spy(self, calls):
+        backend = GrepBackend()
+        original = backend.search
+
+        def spy(patterns, workdir, deadline=None):
+            calls.append(patterns)
+            return original(patterns, workdir, deadline)
+
+        backend.search = spy
+        return backend
+
+    def test_callers_antes_dos_callees(self, tmp_path):
+        project = self._project(tmp_path)
+        calls = []
+
+        graphs = build_context_graph(
+            parse_diff(self.DIFF), project, search_backend=self._spy(calls)
+        )
+
+        assert calls == [["pagar("], ["estornar"]]
+        assert [(r.file, r.line) for r in graphs[0].callers] == [("app.py", 4)]
+        assert [(r.file, r.line) for r in graphs[0].callees] == [("estorno.py", 1)]
+        assert graphs[0].skipped_lookups == []
+
+    def test_prazo_esgotado_retorna_grafo_parcial(self, tmp_path):
+        project = self._project(tmp_path)
+        calls = []
+
+        graphs = build_context_graph(
+            parse_diff(self.DIFF),
+            project,
+            search_backend=self._spy(calls),
+            deadline=Deadline.after(0),
+        )
+
+        assert graphs[0].function_name == "pagar"
+        assert graphs[0].file_content is not None
+        assert graphs[0].callers == [] and graphs[0].callees == []
+        assert graphs[0].skipped_lookups == [ContextLookup.CALLERS, ContextLookup.CALLEES]
+        # Com o prazo esgotado, a busca de callees nem começa
+        assert calls == [["pagar("]]
+
+
+class TestTestesRelacionados:
+    """Testes para o espaço próprio dos testes no contexto."""
+
+    DIFF = """diff --git a/loja.py b/loja.py
+--- a/loja.py
++++ b/loja.py
+@@ -1,2 +1,2 @@ def pagar(valor):
+-    return 1
++    return valor
+"""
+
+    def _project(self, tmp_path, callers=1):
+        (tmp_path / "loja.py").write_text("def pagar(valor):\n    return valor\n")
+        (tmp_path / "app.py").write_text("pagar(1)\n" * callers)
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_loja.py").write_text(
+            "from loja import pagar\n\n\ndef test_pagar():\n    assert pagar(2) == 2\n"
+        )
+        return tmp_path
+
+    def test_testes_separados_dos_callers(self, tmp_path):
+        project = self._project(tmp_path)
+
+        graph = build_context_graph(
+            parse_diff(self.DIFF), project, search_backend=GrepBackend()
+        )[0]
+
+        assert [(r.file, r.line) for r in graph.callers] == [("app.py", 1)]
+        assert [(r.file, r.line, r.function_name) for r in graph.tests] == [
+            ("tests/test_loja.py", 5, "test_pagar")
+        ]
+
+    def test_testes_nao_ocupam_o_limite_dos_callers(self, tmp_path):
+        project = self._project(tmp_path, callers=MAX_REFS_PER_SYMBOL)
+
+        callers = find_callers_batch(["pagar"], project, GrepBackend())["pagar"]
+
+        assert len([r for r in callers if r.file == "app.py"]) == MAX_REFS_PER_SYMBOL
+
+    def test_testes_pelo_indice(self, tmp_path):
+        project = self._project(tmp_path)
+        test_file = "tests/test_loja.py"
+        content = (project / test_file).read_bytes()
+        index = SymbolIndex(
+            {
+                "loja.py": ("k1", extract_definitions(b"def pagar(valor):\n"), None),
+                test_file: ("k2", [], extract_test_references(content, test_file)),
+            }
+        )
+
+        graph = build_context_graph(
+            parse_diff(self.DIFF),
+            project,
+            symbol_index=index,
+            search_backend=GrepBackend(),
+        )[0]
+
+        assert [(r.file, r.line, r.function_name, r.snippet) for r in graph.tests] == [
+            ("tests/test_loja.py", 5, "test_pagar", "assert pagar(2) == 2")
+        ]
+
+    def test_indice_ignora_testes_que_so_repetem_o_nome(self, tmp_path):
+        diff = """diff --git a/file_cache.py b/file_cache.py
+--- a/file_cache.py
++++ b/file_cache.py
+@@ -1,2 +1,2 @@ def get(path):
+-    return None
++    return path
+"""
+        (tmp_path / "file_cache.py").write_text("def get(path):\n    return path\n")
+        test_file = "tests/test_i18n.py"
+        content = b"def test_traducao():\n    assert textos.get('ok') == 'ok'\n"
+        index = SymbolIndex(
+            {
+                "file_cache.py": ("k1", extract_definitions(b"def get(path):\n"), None),
+                test_file: ("k2", [], extract_test_references(content, test_file)),
+            }
+        )
+
+        graph = build_context_graph(
+            parse_diff(diff),
+            tmp_path,
+            symbol_index=index,
+            search_backend=GrepBackend(),
+        )[0]
+
+        assert graph.tests == []
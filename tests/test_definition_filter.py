@@ -0,0 +1,60 @@
+"""Testes para o filtro de nomes sem definição no projeto."""
+
+from code_reviewer.definition_filter import call_language, is_external_call
+
+
+class TestIsExternalCall:
+    """Testes para is_external_call."""
+
+    def test_palavras_chave_de_cada_linguagem(self):
+        assert is_external_call("if")
+        assert is_external_call("except")
+        assert is_external_call("typeof")
+        assert is_external_call("defer")
+
+    def test_builtins(self):
+        assert is_external_call("isinstance")
+        assert is_external_call("ValueError")
+        assert is_external_call("parseInt")
+        assert is_external_call("make")
+
+    def test_funcao_do_projeto(self):
+        assert not is_external_call("process_payment")
+        assert not is_external_call("processar", "pagamento")
+
+    def test_biblioteca_padrao_so_com_receptor_builtin(self):
+        assert is_external_call("loads", "json", builtin_receiver=True)
+        assert not is_external_call("loads", "json")
+        assert not is_external_call("join")
+
+    def test_metodos_de_tipos_builtin_so_em_literais(self):
+        assert is_external_call("join", "", "python", builtin_receiver=True)
+        # ``obj.get(`` pode ser um método do projeto
+        assert not is_external_call("get", "")
+        assert not is_external_call("append", "items", "python")
+        assert not is_external_call("run", "ai_runner")
+
+    def test_metodo_do_proprio_objeto_e_buscado(self):
+        assert not is_external_call("update", "self")
+        assert not is_external_call("get", "this")
+        assert is_external_call("print", "self")
+
+    def test_tabelas_da_linguagem_do_arquivo(self):
+        assert not is_external_call("fetch", language="python")
+        assert not is_external_call("close", language="python")
+        assert not is_external_call("select", language="python")
+        assert is_external_call("fetch", language="js")
+        assert is_external_call("make", language="go")
+        assert not is_external_call("len", language="js")
+        assert is_external_call("len", language="python")
+
+
+class TestCallLanguage:
+    """Testes para call_language."""
+
+    def test_extensoes(self):
+        assert call_language("a/b.py") == "python"
+        assert call_language("web/app.tsx") == "js"
+        assert call_language("cmd/main.go") == "go"
+        assert call_language("README.md") is None
+        assert call_language(None) is None
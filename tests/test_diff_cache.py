@@ -0,0 +1,117 @@
+"""Testes para o cache persistente do diff."""
+
+import os
+
+import pytest
+
+from code_reviewer import diff_cache
+from code_reviewer.diff_cache import (
+    compute_cache_key,
+    evict_cache,
+    load_cached_diff,
+    store_cached_diff,
+)
+from code_reviewer.diff_parser import IGNORED_PATTERNS, parse_diff
+from code_reviewer.models import FileTriage, TriageStatus
+
+SAMPLE_DIFF = """diff --git a/services/payment.py b/services/payment.py
+index 1234567..abcdefg 100644
+--- a/services/payment.py
++++ b/services/payment.py
+@@ -45,4 +45,5 @@ def process_payment(amount, token):
+     validated = validate_card(token)
+-    result = charge(amount)
++    result = charge(amount, currency="BRL")
++    log(result)
+     return result
+diff --git a/routes/checkout.py b/routes/checkout.py
+new file mode 100644
+--- /dev/null
++++ b/routes/checkout.py
+@@ -0,0 +1,2 @@
++def checkout_handler(request):
++    return "ação"
+"""
+
+TRIAGE = [
+    FileTriage(path="routes/checkout.py", added=2, removed=0),
+    FileTriage(path="services/payment.py", added=2, removed=1),
+    FileTriage(path="yarn.lock", added=10, removed=3, status=TriageStatus.IGNORED),
+]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Redireciona o diretório do cache para um diretório temporário."""
+    directory = tmp_path / "diff"
+    monkeypatch.setattr(diff_cache, "CACHE_DIR", directory)
+    return directory
+
+
+class TestComputeCacheKey:
+    """Testes para a chave do cache."""
+
+    def test_chave_deterministica(self):
+        key_a = compute_cache_key("a" * 40, "b" * 40, 3, IGNORED_PATTERNS)
+        key_b = compute_cache_key("a" * 40, "b" * 40, 3, list(IGNORED_PATTERNS))
+
+        assert key_a == key_b
+
+    def test_chave_muda_com_parametros(self):
+        base = compute_cache_key("a" * 40, "b" * 40, 3, IGNORED_PATTERNS)
+
+        assert compute_cache_key("a" * 40, "c" * 40, 3, IGNORED_PATTERNS) != base
+        assert compute_cache_key("a" * 40, "b" * 40, 5, IGNORED_PATTERNS) != base
+        assert compute_cache_key("a" * 40, "b" * 40, 3, ["*.lock"]) != base
+
+
+class TestLoadStore:
+    """Testes para leitura e gravação de entradas."""
+
+    def test_roundtrip(self):
+        diff_files = parse_diff(SAMPLE_DIFF)
+
+        store_cached_diff("k", TRIAGE, diff_files)
+        cached = load_cached_diff("k")
+
+        assert cached is not None
+        triage, files = cached
+        assert triage == TRIAGE
+        assert files == diff_files
+        assert files[0].hunks[0].added_lines == diff_files[0].hunks[0].added_lines
+
+    def test_chave_ausente(self):
+        assert load_cached_diff("inexistente") is None
+
+    def test_entrada_corrompida(self, cache_dir):
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "k.bin").write_bytes(b"lixo")
+
+        assert load_cached_diff("k") is None
+
+
+class TestEvictCache:
+    """Testes para a remoção LRU."""
+
+    def test_remove_entradas_menos_usadas(self, cache_dir):
+        cache_dir.mkdir(parents=True)
+        for i, name in enumerate(["antiga", "media", "nova"]):
+            path = cache_dir / f"{name}.bin"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+
+        evict_cache(max_bytes=250)
+
+        assert sorted(p.stem for p in cache_dir.glob("*.bin")) == ["media", "nova"]
+
+    def test_leitura_renova_entrada(self, cache_dir):
+        store_cached_diff("usada", TRIAGE, [])
+        store_cached_diff("outra", TRIAGE, [])
+        os.utime(cache_dir / "usada.bin", (1000, 1000))
+        os.utime(cache_dir / "outra.bin", (2000, 2000))
+
+        load_cached_diff("usada")
+        size = (cache_dir / "usada.bin").stat().st_size
+        evict_cache(max_bytes=size)
+
+        assert [p.stem for p in cache_dir.glob("*.bin")] == ["usada"]
@@ -1,10 +1,32 @@
 """Testes para o diff_parser."""
 
+import subprocess
+
+import pytest
+
 from code_reviewer.diff_parser import (
+    IGNORED_PATTERNS,
+    build_exclude_pathspecs,
+    build_ignore_matcher,
+    classify_file,
+    detect_moved_blocks,
+    get_git_diff,
     get_modified_functions,
     is_ignored_file,
+    iter_diff_chunks,
+    iter_diff_files,
+    iter_diff_files_bytes,
+    load_ignore_patterns,
     parse_diff,
+    parse_numstat,
+    resolve_diff_workers,
+    stream_git_diff,
+    stream_selected_diffs,
+    triage_diff,
 )
+from code_reviewer.models import LineKind, TriageStatus
+
+from .conftest import git
 
 # Exemplo de diff para testes
 SAMPLE_DIFF = """diff --git a/services/payment.py b/services/payment.py
@@ -84,6 +106,97 @@ class TestIsIgnoredFile:
     def test_ignora_minificado(self):
         assert is_ignored_file("dist/bundle.min.js") is True
 
+    def test_ignora_lock_em_subdiretorio(self):
+        assert is_ignored_file("frontend/yarn.lock") is True
+
+    def test_nao_ignora_dist_na_raiz(self):
+        # Diretórios como dist/ e build/ só são ignorados abaixo da raiz
+        assert is_ignored_file("build/helpers.py") is False
+        assert is_ignored_file("pkg/build/helpers.py") is True
+
+    def test_usa_matcher_customizado(self):
+        matcher = build_ignore_matcher(["*.generated.ts"])
+
+        assert is_ignored_file("src/api.generated.ts", matcher) is True
+        assert is_ignored_file("package-lock.json", matcher) is False
+
+
+class TestIgnorePatterns:
+    """Testes para padrões de ignore e pathspecs do git."""
+
+    def test_pathspecs_de_exclusao(self):
+        pathspecs = build_exclude_pathspecs(["**/*.lock", "yarn.lock"])
+
+        assert pathspecs == [
+            ":(top,exclude,glob)**/*.lock",
+            ":(top,exclude,glob)**/*.lock/**",
+            ":(top,exclude,glob)**/yarn.lock",
+            ":(top,exclude,glob)**/yarn.lock/**",
+        ]
+
+    def test_pathspecs_de_diretorio(self):
+        assert build_exclude_pathspecs(["generated/", "/gen", "out/**"]) == [
+            ":(top,exclude,glob)**/generated/**",
+            ":(top,exclude,glob)gen",
+            ":(top,exclude,glob)gen/**",
+            ":(top,exclude,glob)out/**",
+        ]
+
+    def test_matcher_vazio_nunca_casa(self):
+        assert is_ignored_file("qualquer.py", build_ignore_matcher([])) is False
+
+    def test_sem_arquivo_retorna_padroes_default(self, tmp_path):
+        assert load_ignore_patterns(tmp_path) == IGNORED_PATTERNS
+
+    def test_le_padroes_do_airevignore(self, tmp_path):
+        (tmp_path / ".airevignore").write_text(
+            "# gerados\n\n/generated/**\n*.pb.go\n"
+        )
+
+        patterns = load_ignore_patterns(tmp_path)
+
+        assert patterns[: len(IGNORED_PATTERNS)] == IGNORED_PATTERNS
+        assert patterns[len(IGNORED_PATTERNS):] == ["/generated/**", "*.pb.go"]
+
+    @pytest.mark.parametrize(
+        ("pattern", "ignored"),
+        [
+            ("generated/", {"generated/x.py", "generated/sub/y.py", "a/generated/z.py"}),
+            ("generated", {"generated/x.py", "generated/sub/y.py", "a/generated/z.py"}),
+            ("/generated", {"generated/x.py", "generated/sub/y.py"}),
+            ("generated/**", {"generated/x.py", "generated/sub/y.py"}),
+            ("arquivo", {"a/arquivo"}),
+            ("arquivo/", set()),
+        ],
+    )
+    def test_semantica_de_diretorio_do_gitignore(self, tmp_path, pattern, ignored):
+        files = [
+            "generated/x.py",
+            "generated/sub/y.py",
+            "a/generated/z.py",
+            "a/generated2",
+            "a/arquivo",
+            "generated_file",
+            "keep.py",
+        ]
+        for path in files:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("x\n")
+        git(tmp_path, "init", "-q")
+        git(tmp_path, "add", ".")
+        listed = subprocess.run(
+            ["git", "ls-files", "--", ".", *build_exclude_pathspecs([pattern])],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        matcher = build_ignore_matcher([pattern])
+
+        # Matcher e pathspec concordam entre si e com o .gitignore
+        assert {path for path in files if is_ignored_file(path, matcher)} == ignored
+        assert set(files) - set(listed) == ignored
+
 
 class TestParseDiff:
     """Testes para função parse_diff."""
@@ -218,3 +331,398 @@ index 1234567..abcdefg 100644
         # Verifica que as linhas de contexto têm números de linha válidos
         for line in second_hunk.context_lines:
             assert line.line_number > 0
+
+
+@pytest.fixture
+def git_repo(git_repo):
+    """Cria um repositório git com branch base e uma branch de feature."""
+    repo = git_repo
+    (repo / "app.py").write_text("def soma(a, b):\n    return a + b\n")
+    (repo / "package-lock.json").write_text('{"version": "1.0.0"}\n')
+    (repo / "util.py").write_text(
+        "".join(f"def util_{i}():\n    return {i}\n" for i in range(5))
+    )
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    git(repo, "checkout", "-q", "-b", "feature")
+    (repo / "app.py").write_text(
+        "def soma(a, b):\n    resultado = a + b\n    return resultado\n"
+    )
+    (repo / "package-lock.json").write_text('{"version": "1.0.1"}\n')
+    (repo / "novo.py").write_text("print('novo')\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "feature")
+    return repo
+
+
+class TestIterDiffFiles:
+    """Testes para o parser incremental."""
+
+    @pytest.mark.parametrize(
+        "diff_text", [SAMPLE_DIFF, SAMPLE_DIFF_WITH_LOCK, ""]
+    )
+    def test_mesmo_resultado_que_parse_diff(self, diff_text):
+        streamed = list(iter_diff_files(iter(diff_text.split("\n"))))
+
+        assert streamed == parse_diff(diff_text)
+
+    def test_produz_arquivo_antes_de_consumir_tudo(self):
+        consumed = []
+
+        def lines():
+            for line in SAMPLE_DIFF.split("\n"):
+                consumed.append(line)
+                yield line
+
+        first = next(iter_diff_files(lines()))
+
+        assert first.path == "services/payment.py"
+        # Só consumiu até o header do segundo arquivo
+        assert consumed[-1] == "diff --git a/routes/checkout.py b/routes/checkout.py"
+
+
+class TestBytesDiff:
+    """Testes para o parsing do diff em bytes com decodificação por arquivo."""
+
+    @pytest.mark.parametrize(
+        "diff_text", [SAMPLE_DIFF, SAMPLE_DIFF_WITH_LOCK, "", "lixo\n" + SAMPLE_DIFF]
+    )
+    def test_mesmo_resultado_que_texto(self, diff_text):
+        data = diff_text.encode()
+
+        assert parse_diff(data) == parse_diff(diff_text)
+        assert list(iter_diff_files_bytes(data.split(b"\n"))) == parse_diff(diff_text)
+
+    def test_fatias_por_arquivo(self):
+        chunks = list(iter_diff_chunks(SAMPLE_DIFF.encode()))
+
+        assert [header for header, _ in chunks] == [
+            b"diff --git a/services/payment.py b/services/payment.py",
+            b"diff --git a/routes/checkout.py b/routes/checkout.py",
+        ]
+        assert b"\n".join(bytes(chunk) for _, chunk in chunks) == SAMPLE_DIFF.encode()
+
+    def test_arquivo_ignorado_nao_e_decodificado(self, monkeypatch):
+        import code_reviewer.diff_parser as diff_parser
+
+        decoded = []
+        original = diff_parser.decode_diff_chunk
+
+        def spy(chunk, fallback_encoding):
+            decoded.append(bytes(chunk).split(b"\n", 1)[0])
+            return original(chunk, fallback_encoding)
+
+        monkeypatch.setattr(diff_parser, "decode_diff_chunk", spy)
+
+        files = parse_diff(SAMPLE_DIFF_WITH_LOCK.encode())
+
+        assert [f.path for f in files] == ["src/main.py"]
+        assert decoded == [b"diff --git a/src/main.py b/src/main.py"]
+
+    def test_fallback_por_arquivo(self):
+        data = SAMPLE_DIFF.encode().replace(b"BRL", "São Paulo".encode("latin-1"))
+
+        files = parse_diff(data)
+
+        assert [f.path for f in files] == ["services/payment.py", "routes/checkout.py"]
+        assert 'currency="São Paulo"' in files[0].hunks[0].added_lines[0].content
+
+    def test_sem_fallback_descarta_arquivo(self):
+        data = SAMPLE_DIFF.encode().replace(b"BRL", "São Paulo".encode("latin-1"))
+
+        files = parse_diff(data, fallback_encoding=None)
+
+        assert [f.path for f in files] == ["routes/checkout.py"]
+
+    def test_normaliza_crlf(self):
+        data = SAMPLE_DIFF.encode().replace(b"\n", b"\r\n")
+
+        assert parse_diff(data) == parse_diff(SAMPLE_DIFF)
+
+
+class TestStreamGitDiff:
+    """Testes para leitura do diff via pipe do git."""
+
+    def test_parseia_diff_do_repositorio(self, git_repo):
+        files = list(stream_git_diff("main", git_repo))
+
+        paths = [f.path for f in files]
+        assert paths == ["app.py", "novo.py"]
+        assert files[1].is_new is True
+        assert files[0].hunks[0].added_lines[0].content == "    resultado = a + b"
+
+    def test_extrai_sha_dos_blobs(self, git_repo):
+        files = list(stream_git_diff("main", git_repo))
+
+        app, novo = files
+        expected = subprocess.run(
+            ["git", "rev-parse", "HEAD:app.py"],
+            cwd=git_repo, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        assert app.new_blob == expected
+        assert app.old_blob is not None
+        assert novo.old_blob is None
+
+    def test_arquivo_ignorado_nao_sai_do_git(self, git_repo):
+        output = get_git_diff("main", git_repo, ignore_patterns=IGNORED_PATTERNS)
+
+        assert b"app.py" in output
+        assert b"package-lock.json" not in output
+
+    def test_respeita_airevignore(self, git_repo):
+        (git_repo / ".airevignore").write_text("novo.py\n")
+
+        files = list(stream_git_diff("main", git_repo))
+
+        assert [f.path for f in files] == ["app.py"]
+
+    def test_airevignore_de_diretorio_na_triagem(self, git_repo):
+        (git_repo / "generated" / "api").mkdir(parents=True)
+        (git_repo / "generated" / "api" / "cliente.py").write_text("x = 1\n")
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-q", "-m", "gerado")
+        (git_repo / ".airevignore").write_text("generated/\n")
+
+        triage = {entry.path: entry for entry in triage_diff("main", git_repo)}
+        files = [f.path for f in stream_git_diff("main", git_repo)]
+
+        assert triage["generated/api/cliente.py"].status == TriageStatus.IGNORED
+        assert "generated/api/cliente.py" not in files
+
+    def test_arquivo_latin1_nao_interrompe_o_diff(self, git_repo):
+        (git_repo / "legado.py").write_bytes("nome = 'João'\n".encode("latin-1"))
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-q", "-m", "latin-1")
+
+        files = {f.path: f for f in stream_git_diff("main", git_repo)}
+
+        assert set(files) == {"app.py", "legado.py", "novo.py"}
+        assert files["legado.py"].hunks[0].added_lines[0].content == "nome = 'João'"
+
+    def test_branch_inexistente_levanta_erro(self, git_repo):
+        with pytest.raises(subprocess.CalledProcessError):
+            list(stream_git_diff("nao-existe", git_repo))
+
+
+class TestParseNumstat:
+    """Testes para parsing do git diff --numstat -z."""
+
+    def test_parseia_registros(self):
+        output = "3\t1\tsrc/a.py\0-\t-\tlogo.png\0"
+
+        assert parse_numstat(output) == [
+            (3, 1, "src/a.py", None),
+            (None, None, "logo.png", None),
+        ]
+
+    def test_renomeacao_usa_caminho_novo(self):
+        output = "0\t0\t\0old/a.py\0new/a.py\0" "1\t0\tb.py\0"
+
+        assert parse_numstat(output) == [
+            (0, 0, "new/a.py", "old/a.py"),
+            (1, 0, "b.py", None),
+        ]
+
+    def test_output_vazio(self):
+        assert parse_numstat("") == []
+
+
+class TestClassifyFile:
+    """Testes para classificação da triagem."""
+
+    def test_revisavel(self):
+        assert classify_file("src/a.py", 10, 2) == TriageStatus.REVIEWABLE
+
+    def test_ignorado_tem_prioridade(self):
+        assert classify_file("package-lock.json", 40000, 100) == TriageStatus.IGNORED
+
+    def test_binario(self):
+        assert classify_file("img/logo.png", None, None) == TriageStatus.BINARY
+
+    def test_gerado(self):
+        assert classify_file("api/user_pb2.py", 10, 0) == TriageStatus.GENERATED
+        assert classify_file("vendor/lib/x.go", 10, 0) == TriageStatus.GENERATED
+
+    def test_enorme(self):
+        status = classify_file("src/big.py", 90, 20, max_changed_lines=100)
+        assert status == TriageStatus.HUGE
+
+
+class TestTwoPhaseDiff:
+    """Testes para triagem + obtenção seletiva de patches."""
+
+    def test_triagem_classifica_arquivos(self, git_repo):
+        triage = triage_diff("main", git_repo)
+
+        statuses = {entry.path: entry.status for entry in triage}
+        assert statuses == {
+            "app.py": TriageStatus.REVIEWABLE,
+            "novo.py": TriageStatus.REVIEWABLE,
+            "package-lock.json": TriageStatus.IGNORED,
+        }
+        app = next(entry for entry in triage if entry.path == "app.py")
+        assert (app.added, app.removed) == (2, 1)
+
+    def test_patches_apenas_dos_selecionados(self, git_repo):
+        files = list(stream_selected_diffs("main", ["novo.py"], git_repo))
+
+        assert [f.path for f in files] == ["novo.py"]
+
+    def test_grupos_mantem_ordem_e_resultado(self, git_repo):
+        paths = ["app.py", "novo.py"]
+
+        batched = list(stream_selected_diffs("main", paths, git_repo, batch_size=1))
+
+        assert batched == list(stream_git_diff("main", git_repo))
+
+    def test_modo_paralelo_mantem_ordem_e_resultado(self, git_repo):
+        paths = ["app.py", "novo.py"]
+
+        parallel = list(stream_selected_diffs("main", paths, git_repo, workers=2))
+
+        assert parallel == list(stream_selected_diffs("main", paths, git_repo))
+
+    def test_sem_caminhos_nao_executa_git(self, git_repo):
+        assert list(stream_selected_diffs("nao-existe", [], git_repo)) == []
+
+
+RENAME_DIFF = """diff --git a/antigo.py b/novo.py
+similarity index 90%
+rename from antigo.py
+rename to novo.py
+index 1111111..2222222 100644
+--- a/antigo.py
++++ b/novo.py
+@@ -1,2 +1,2 @@
+ def f():
+-    return 1
++    return 2
+diff --git a/a.py b/b.py
+similarity index 100%
+rename from a.py
+rename to b.py
+"""
+
+MOVED_DIFF = """diff --git a/origem.py b/origem.py
+--- a/origem.py
++++ b/origem.py
+@@ -1,5 +1,1 @@
+ import os
+-def mover(valor):
+-    resultado = valor * 2
+-    return resultado
+-
+diff --git a/destino.py b/destino.py
+--- a/destino.py
++++ b/destino.py
+@@ -1,1 +1,6 @@
+ import sys
++def mover(valor):
++    resultado = valor * 2
++    return resultado
++
++print(mover(1))
+"""
+
+
+# Bloco existente envolvido por um novo if: só a indentação muda
+REINDENTED_DIFF = """diff --git a/conexao.py b/conexao.py
+--- a/conexao.py
++++ b/conexao.py
+@@ -1,4 +1,5 @@ def enviar(conn, dados):
+ def enviar(conn, dados):
+-    pacote = serializar(dados)
+-    conn.escrever(pacote)
+-    conn.confirmar(len(pacote))
++    if conn.is_ready():
++        pacote = serializar(dados)
++        conn.escrever(pacote)
++        conn.confirmar(len(pacote))
+"""
+
+
+class TestRenamesAndMoves:
+    """Testes para renomeações e blocos movidos."""
+
+    def test_parseia_renomeacao(self):
+        files = parse_diff(RENAME_DIFF)
+
+        assert [(f.path, f.old_path, f.similarity) for f in files] == [
+            ("novo.py", "antigo.py", 90),
+            ("b.py", "a.py", 100),
+        ]
+        assert files[0].is_rename and not files[0].is_pure_rename
+        assert files[1].is_pure_rename
+        assert files[1].hunks == []
+
+    def test_renomeacao_no_repositorio(self, git_repo):
+        git(git_repo, "mv", "util.py", "helpers.py")
+        git(git_repo, "commit", "-q", "-m", "renomeia")
+
+        triage = triage_diff("main", git_repo)
+        renamed = next(entry for entry in triage if entry.path == "helpers.py")
+        files = list(
+            stream_selected_diffs(
+                "main", ["helpers.py"], git_repo, old_paths={"helpers.py": "util.py"}
+            )
+        )
+
+        assert renamed.old_path == "util.py"
+        assert (renamed.added, renamed.removed) == (0, 0)
+        assert files[0].old_path == "util.py"
+        assert files[0].is_pure_rename
+
+    def test_detecta_bloco_movido(self):
+        files = parse_diff(MOVED_DIFF)
+
+        moved = detect_moved_blocks(files)
+
+        source, target = files[0].hunks[0], files[1].hunks[0]
+        assert moved == 4
+        assert source.lines.count(LineKind.MOVED_REMOVED) == 4
+        assert target.lines.count(LineKind.MOVED_ADDED) == 4
+        assert target.lines.count(LineKind.ADDED) == 1
+        assert target.moved_blocks[0].path == "origem.py"
+        assert target.moved_blocks[0].line == 2
+        assert source.moved_blocks[0].path == "destino.py"
+
+    def test_bloco_curto_nao_e_movido(self):
+        files = parse_diff(MOVED_DIFF)
+
+        assert detect_moved_blocks(files, min_lines=5) == 0
+        assert files[1].hunks[0].moved_blocks == []
+
+    def test_bloco_reindentado_nao_e_movido(self):
+        files = parse_diff(REINDENTED_DIFF)
+
+        moved = detect_moved_blocks(files)
+
+        hunk = files[0].hunks[0]
+        assert moved == 0
+        assert hunk.moved_blocks == []
+        assert hunk.lines.count(LineKind.ADDED) == 4
+        assert hunk.lines.count(LineKind.REMOVED) == 3
+
+
+class TestResolveDiffWorkers:
+    """Testes para escolha da quantidade de workers."""
+
+    def test_valor_explicito(self):
+        assert resolve_diff_workers(3, 1) == 3
+
+    def test_automatico_sequencial_sem_limiar_medido(self, monkeypatch):
+        monkeypatch.setattr("code_reviewer.diff_parser.os.cpu_count", lambda: 64)
+
+        assert resolve_diff_workers(0, 10) == 1
+        assert resolve_diff_workers(0, 100000) == 1
+
+    def test_automatico_sequencial_para_poucos_arquivos(self, monkeypatch):
+        monkeypatch.setattr("code_reviewer.diff_parser.PARALLEL_DIFF_MIN_FILES", 500)
+
+        assert resolve_diff_workers(0, 10) == 1
+
+    def test_automatico_limitado(self, monkeypatch):
+        monkeypatch.setattr("code_reviewer.diff_parser.PARALLEL_DIFF_MIN_FILES", 500)
+        monkeypatch.setattr("code_reviewer.diff_parser.os.cpu_count", lambda: 64)
+
+        assert resolve_diff_workers(0, 100000) == 8
@@ -0,0 +1,108 @@
+"""Testes para o cache de arquivos do review."""
+
+import pytest
+
+from code_reviewer.context_builder import build_context_graph, get_context_around_line
+from code_reviewer.diff_parser import parse_diff
+from code_reviewer.file_cache import FileCache
+
+CONTENT = "".join(f"linha {i}\n" for i in range(1, 31))
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "a.py").write_text(CONTENT)
+    (tmp_path / "b.py").write_text("x = 1")
+    return tmp_path
+
+
+class TestFileCache:
+    """Testes para FileCache."""
+
+    def test_le_cada_arquivo_uma_vez(self, project):
+        cache = FileCache(project)
+
+        assert cache.read_text("a.py") == CONTENT
+        (project / "a.py").unlink()
+
+        assert cache.read_bytes("a.py") == CONTENT.encode()
+        assert cache.lines("a.py", 2, 3) == ["linha 2", "linha 3"]
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_linhas_iguais_a_split(self, project):
+        cache = FileCache(project)
+        lines = CONTENT.split("\n")
+
+        assert cache.line_count("a.py") == len(lines)
+        assert cache.lines("a.py", 1, 1000) == lines
+        assert cache.lines("a.py", 29, 31) == lines[28:31]
+        assert cache.lines("b.py", 1, 1) == ["x = 1"]
+
+    def test_janela_fora_do_arquivo(self, project):
+        cache = FileCache(project)
+
+        assert cache.lines("a.py", -3, 0) == []
+        assert cache.lines("a.py", 40, 45) == []
+
+    def test_arquivo_inexistente(self, project):
+        cache = FileCache(project)
+
+        assert cache.read_text("nao-existe.py") is None
+        assert cache.lines("nao-existe.py", 1, 5) == []
+        assert "nao-existe.py" not in cache
+
+    def test_texto_nao_utf8(self, project):
+        (project / "c.txt").write_bytes(b"caf\xe9\n")
+        cache = FileCache(project)
+
+        assert cache.read_text("c.txt") is None
+        assert cache.lines("c.txt", 1, 1) == ["caf�"]
+
+    def test_remove_menos_usados_acima_do_teto(self, project):
+        (project / "c.py").write_text("y" * 100)
+        cache = FileCache(project, max_bytes=len(CONTENT) + 100)
+
+        cache.read_bytes("a.py")
+        cache.read_bytes("b.py")
+        cache.read_bytes("a.py")
+        cache.read_bytes("c.py")
+
+        assert "b.py" not in cache
+        assert "a.py" in cache and "c.py" in cache
+        assert cache.total_bytes <= cache.max_bytes
+        assert cache.evictions == 1
+
+    def test_arquivo_maior_que_o_teto_nao_e_guardado(self, project):
+        cache = FileCache(project, max_bytes=10)
+
+        assert cache.read_text("a.py") == CONTENT
+        assert "a.py" not in cache
+        assert cache.total_bytes == 0
+
+
+class TestIntegracao:
+    """Testes do uso do cache pelo context_builder."""
+
+    def test_contexto_ao_redor_da_linha(self, project):
+        cache = FileCache(project)
+
+        context = get_context_around_line("a.py", 10, file_cache=cache)
+
+        assert context.split("\n") == [f"linha {i}" for i in range(5, 16)]
+        assert get_context_around_line("a.py", 10, project) == context
+
+    def test_build_context_graph_reaproveita_cache(self, project):
+        cache = FileCache(project)
+        cache.read_text("a.py")
+        diff = parse_diff("""diff --git a/a.py b/a.py
+--- a/a.py
++++ b/a.py
+@@ -1,1 +1,1 @@ def funcao():
+-x
++linha 1
+""")
+
+        graphs = build_context_graph(diff, project, file_cache=cache)
+
+        assert graphs[0].file_content == CONTENT
+        assert cache.misses == 1
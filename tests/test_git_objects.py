@@ -0,0 +1,136 @@
+"""Testes para a leitura de objetos do git."""
+
+
+import pytest
+
+from code_reviewer.file_cache import FileCache
+from code_reviewer.git_objects import BlobReader
+from code_reviewer.python_analysis import git_blob_sha, read_blob
+
+from .conftest import git
+
+
+@pytest.fixture
+def git_repo(git_repo):
+    """Repositório com um commit e alterações não commitadas."""
+    repo = git_repo
+    (repo / "src").mkdir()
+    (repo / "src" / "app.py").write_text("x = 1\n")
+    (repo / "com espaço.py").write_text("y = 2\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    (repo / "src" / "app.py").write_text("x = 'local'\n")
+    (repo / "novo.py").write_text("z = 3\n")
+    return repo
+
+
+class TestBlobReader:
+    """Testes para BlobReader."""
+
+    def test_le_a_versao_do_head(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            assert reader.read_file("src/app.py") == b"x = 1\n"
+            assert reader.read_file("com espaço.py") == b"y = 2\n"
+
+    def test_objeto_inexistente(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            assert reader.read_file("novo.py") is None
+            assert reader.read_file("nao existe.py") is None
+            # O processo continua respondendo depois de um objeto ausente
+            assert reader.read_file("src/app.py") == b"x = 1\n"
+
+    def test_ignora_objetos_que_nao_sao_blob(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            assert reader.read("HEAD:src") is None
+            assert reader.read("HEAD") is None
+            assert reader.read("HEAD:src/app.py") == b"x = 1\n"
+
+    def test_le_pelo_sha_do_blob(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            assert reader.read(git_blob_sha(b"x = 1\n")) == b"x = 1\n"
+
+    def test_um_unico_processo_para_varias_leituras(self, git_repo):
+        reader = BlobReader(git_repo)
+        reader.read_file("src/app.py")
+        process = reader._process
+
+        for _ in range(50):
+            assert reader.read_file("src/app.py") == b"x = 1\n"
+
+        assert reader._process is process
+        assert reader.reads == 51
+        reader.close()
+        assert process.poll() is not None
+
+    def test_reinicia_apos_close(self, git_repo):
+        reader = BlobReader(git_repo)
+        reader.read_file("src/app.py")
+        reader.close()
+
+        assert reader.read_file("src/app.py") == b"x = 1\n"
+        reader.close()
+
+    def test_caminho_que_nao_e_utf8(self, git_repo):
+        # Nome em latin-1, como o git o devolve decodificado com surrogateescape
+        path = b"caf\xe9.py".decode("utf-8", "surrogateescape")
+        (git_repo / path).write_text("w = 4\n")
+        git(git_repo, "add", "--", path)
+        git(git_repo, "commit", "-q", "-m", "latin-1")
+
+        with BlobReader(git_repo) as reader:
+            assert reader.read_file(path) == b"w = 4\n"
+            # Um caminho impossível de codificar não derruba o leitor
+            assert reader.read_file("\ud800.py") is None
+            assert reader.read_file("src/app.py") == b"x = 1\n"
+
+    def test_fora_de_um_repositorio(self, tmp_path):
+        with BlobReader(tmp_path / "inexistente") as reader:
+            assert reader.read_file("app.py") is None
+
+    def test_lista_os_arquivos_da_revisao(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            assert reader.paths() == {"src/app.py", "com espaço.py"}
+
+    def test_lista_o_que_difere_da_revisao(self, git_repo):
+        git(git_repo, "rm", "-q", "--cached", "com espaço.py")
+
+        with BlobReader(git_repo) as reader:
+            # Alterações no working tree e no índice; não rastreados ficam fora
+            assert reader.changed_paths() == {"src/app.py", "com espaço.py"}
+
+    def test_listagem_sem_git(self, tmp_path):
+        with BlobReader(tmp_path) as reader:
+            assert reader.paths() is None
+            assert reader.changed_paths() is None
+
+
+class TestFileCacheComBlobReader:
+    """Testes para o FileCache lendo do banco de objetos."""
+
+    def test_le_a_versao_do_head(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            cache = FileCache(git_repo, blob_reader=reader)
+
+            # Alterado no working tree: lê a versão do diff, não a local
+            assert cache.read_text("src/app.py") == "x = 1\n"
+            assert cache.read_text("com espaço.py") == "y = 2\n"
+            assert reader.reads == 2
+            # Fora do HEAD (não rastreado): recorre ao disco
+            assert cache.read_text("novo.py") == "z = 3\n"
+            assert cache.read_text("ausente.py") is None
+
+    def test_sem_git_le_do_working_tree(self, tmp_path):
+        (tmp_path / "app.py").write_text("x = 1\n")
+
+        with BlobReader(tmp_path) as reader:
+            assert FileCache(tmp_path, blob_reader=reader).read_text("app.py") == "x = 1\n"
+
+    def test_read_blob_usa_o_processo_do_cache(self, git_repo):
+        with BlobReader(git_repo) as reader:
+            cache = FileCache(git_repo)
+            cache.blob_reader = reader
+            sha = git_blob_sha(b"x = 1\n")
+
+            # O working tree foi alterado: o blob vem do cat-file --batch
+            assert read_blob("src/app.py", sha, git_repo, cache) == b"x = 1\n"
+            assert reader.reads == 1
@@ -0,0 +1,221 @@
+"""Testes para a resolução de callees pelos imports."""
+
+import pytest
+
+from code_reviewer.context_builder import find_callees
+from code_reviewer.file_cache import FileCache
+from code_reviewer.git_objects import BlobReader
+from code_reviewer.import_resolver import (
+    EXTERNAL,
+    ImportResolver,
+    parse_js_imports,
+    parse_python_imports,
+)
+from code_reviewer.search import GrepBackend
+
+from .conftest import git
+
+FILES = {
+    "src/loja/__init__.py": "from .pagamentos import pagar\n",
+    "src/loja/pagamentos.py": "import os\n\n\ndef pagar(valor):\n    return valor\n",
+    "src/loja/util.py": "def formatar(valor):\n    return str(valor)\n",
+    "app.py": (
+        "import json\n"
+        "import loja.util as u\n"
+        "from loja import pagar, util\n"
+        "from requests import get\n"
+        "\n"
+        "\n"
+        "def local():\n"
+        "    pass\n"
+    ),
+    "web/app.ts": (
+        "import { render as r } from './view';\n"
+        "import * as api from './api';\n"
+        "import fmt from './fmt.js';\n"
+        "import { useState } from 'react';\n"
+        "const { salvar } = require('../lib/db');\n"
+    ),
+    "web/view.tsx": "export function render(el: Element) {\n  return el;\n}\n",
+    "web/api/index.ts": "export * from './client';\n",
+    "web/api/client.ts": "// cliente\nexport const fetchUser = async (id: string) => id;\n",
+    "web/fmt.ts": "export default function (valor) {\n  return valor;\n}\n",
+    "lib/db.js": "function salvar(x) {}\nmodule.exports = { salvar };\n",
+}
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    for path, content in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return ImportResolver(FileCache(tmp_path))
+
+
+def _location(resolution):
+    return (resolution.file, resolution.line)
+
+
+class TestParseImports:
+    """Testes para a leitura dos imports."""
+
+    def test_python(self):
+        imports = parse_python_imports(
+            "from .a import x as y, z\nfrom b import (\n    c,\n)\nimport d.e\nimport f.g as h\n"
+        )
+
+        assert {alias: (t.level, t.module, t.name) for alias, t in imports.bindings.items()} == {
+            "y": (1, "a", "x"),
+            "z": (1, "a", "z"),
+            "c": (0, "b", "c"),
+            "d": (0, "d", None),
+            "h": (0, "f.g", None),
+        }
+
+    def test_js(self):
+        imports = parse_js_imports(
+            "import React, { a as b } from 'react';\n"
+            "export { c } from './c';\n"
+            "export * from './d';\n"
+            "const e = require('./e');\n"
+        )
+
+        assert {alias: (t.module, t.name) for alias, t in imports.bindings.items()} == {
+            "React": ("react", "default"),
+            "b": ("react", "a"),
+            "c": ("./c", "c"),
+            "e": ("./e", None),
+        }
+        assert [t.module for t in imports.star] == ["./d"]
+
+
+class TestImportResolverPython:
+    """Testes para imports do Python."""
+
+    def test_reexportacao_no_pacote(self, resolver):
+        assert _location(resolver.resolve("app.py", "pagar")) == ("src/loja/pagamentos.py", 4)
+
+    def test_alias_de_modulo(self, resolver):
+        assert _location(resolver.resolve("app.py", "formatar", "u")) == ("src/loja/util.py", 1)
+
+    def test_submodulo_importado_do_pacote(self, resolver):
+        assert _location(resolver.resolve("app.py", "formatar", "util")) == ("src/loja/util.py", 1)
+
+    def test_biblioteca_padrao_e_externa(self, resolver):
+        assert resolver.resolve("app.py", "loads", "json") is EXTERNAL
+
+    def test_modulo_nao_encontrado_cai_na_busca(self, resolver):
+        assert resolver.resolve("app.py", "get") is None
+        assert resolver.resolve("app.py", "processar", "pedido") is None
+
+    def test_definicao_no_proprio_arquivo(self, resolver):
+        assert _location(resolver.resolve("app.py", "local")) == ("app.py", 7)
+
+
+class TestImportResolverNoHead:
+    """Com o BlobReader do review, os módulos são os do HEAD."""
+
+    def test_modulo_removido_do_disco_continua_no_head(self, git_repo):
+        for path, content in FILES.items():
+            (git_repo / path).parent.mkdir(parents=True, exist_ok=True)
+            (git_repo / path).write_text(content)
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-q", "-m", "inicial")
+        (git_repo / "src" / "loja" / "util.py").unlink()
+
+        with BlobReader(git_repo) as reader:
+            resolver = ImportResolver(FileCache(git_repo, blob_reader=reader))
+
+            assert _location(resolver.resolve("app.py", "formatar", "u")) == (
+                "src/loja/util.py",
+                1,
+            )
+
+
+class TestImportResolverJs:
+    """Testes para imports de JS/TS."""
+
+    def test_import_com_alias(self, resolver):
+        resolution = resolver.resolve("web/app.ts", "r")
+
+        assert _location(resolution) == ("web/view.tsx", 1)
+        assert resolution.snippet == "export function render(el: Element) {"
+
+    def test_namespace_com_export_estrela(self, resolver):
+        assert _location(resolver.resolve("web/app.ts", "fetchUser", "api")) == (
+            "web/api/client.ts",
+            2,
+        )
+
+    def test_export_default_com_extensao_js_para_ts(self, resolver):
+        assert _location(resolver.resolve("web/app.ts", "fmt")) == ("web/fmt.ts", 1)
+
+    def test_require(self, resolver):
+        assert _location(resolver.resolve("web/app.ts", "salvar")) == ("lib/db.js", 1)
+
+    def test_pacote_npm_e_externo(self, resolver):
+        assert resolver.resolve("web/app.ts", "useState") is EXTERNAL
+
+
+class TestFindCalleesComImports:
+    """Testes para find_callees usando os imports."""
+
+    def test_resolve_sem_varrer_o_projeto(self, resolver):
+        backend = GrepBackend()
+        calls = []
+        original = backend.search
+
+        def spy(patterns, workdir, deadline=None):
+            calls.append(patterns)
+            return original(patterns, workdir, deadline)
+
+        backend.search = spy
+
+        callees = find_callees(
+            ["total = pagar(u.formatar(v))", "dados = get(url)"],
+            resolver.file_cache.root,
+            search_backend=backend,
+            source_file="app.py",
+            import_resolver=resolver,
+        )
+
+        assert sorted((c.function_name, c.file) for c in callees) == [
+            ("formatar", "src/loja/util.py"),
+            ("pagar", "src/loja/pagamentos.py"),
+        ]
+        # Só o nome de módulo não resolvido vai para a busca
+        assert calls == [["get"]]
+
+    def test_metodo_de_nome_comum_resolvido_pelo_import(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (tmp_path / "pkg" / "runner.py").write_text("def run(x):\n    return x\n")
+        (tmp_path / "pkg" / "app.py").write_text("from . import runner\n")
+        resolver = ImportResolver(FileCache(tmp_path))
+
+        callees = find_callees(
+            ["runner.run(1)", "dados = json.loads(texto)", "'-'.join(partes)"],
+            tmp_path,
+            search_backend=GrepBackend(),
+            source_file="pkg/app.py",
+            import_resolver=resolver,
+        )
+
+        assert [(c.function_name, c.file, c.line) for c in callees] == [
+            ("run", "pkg/runner.py", 1)
+        ]
+
+    def test_nomes_de_outras_linguagens_sao_buscados_em_python(self, tmp_path):
+        (tmp_path / "rede.py").write_text("def fetch(url):\n    pass\n")
+        (tmp_path / "app.py").write_text("from rede import *\n")
+        resolver = ImportResolver(FileCache(tmp_path))
+
+        callees = find_callees(
+            ["pagina = fetch(url)", "obj.get(1)"],
+            tmp_path,
+            search_backend=GrepBackend(),
+            source_file="app.py",
+            import_resolver=resolver,
+        )
+
+        assert [(c.function_name, c.file) for c in callees] == [("fetch", "rede.py")]
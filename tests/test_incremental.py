@@ -0,0 +1,166 @@
+"""Testes para o review incremental."""
+
+
+import pytest
+
+from code_reviewer import repository
+from code_reviewer.diff_parser import parse_diff
+from code_reviewer.incremental import (
+    carry_over_findings,
+    load_review_state,
+    map_line,
+    merge_findings,
+    save_review_state,
+)
+from code_reviewer.models import Category, Finding, Severity
+from code_reviewer.repository import RepositorySession
+
+from .conftest import git
+
+# Linha 3 alterada, linha 1 inserida no topo: linhas depois de 3 deslocam +1
+INCREMENT_DIFF = """diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -1,4 +1,5 @@
++import os
+ a = 1
+ b = 2
+-c = 3
++c = 4
+ d = 5
+@@ -20,2 +21,3 @@
+ x = 1
++y = 2
+ z = 3
+diff --git a/velho.py b/novo.py
+similarity index 95%
+rename from velho.py
+rename to novo.py
+diff --git a/removido.py b/removido.py
+deleted file mode 100644
+--- a/removido.py
++++ /dev/null
+@@ -1,1 +0,0 @@
+-print(1)
+"""
+
+
+def _finding(file, line, category=Category.BUG, title="Problema"):
+    return Finding(
+        file=file,
+        line=line,
+        severity=Severity.WARNING,
+        category=category,
+        title=title,
+        description="descrição",
+    )
+
+
+@pytest.fixture
+def git_repo(git_repo, tmp_path, monkeypatch):
+    """Repositório com dois commits na branch feature e cache isolado."""
+    monkeypatch.setattr(repository, "REPOS_CACHE_DIR", tmp_path / "cache")
+    repo = git_repo
+    (repo / "app.py").write_text("x = 1\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    git(repo, "checkout", "-q", "-b", "feature")
+    (repo / "app.py").write_text("x = 2\n")
+    git(repo, "commit", "-q", "-am", "feature")
+    return repo
+
+
+class TestMapLine:
+    """Testes para map_line."""
+
+    @pytest.mark.parametrize(
+        ("old_line", "new_line"),
+        [(1, 2), (2, 3), (3, None), (4, 5), (10, 11), (20, 21), (21, 23), (30, 32)],
+    )
+    def test_mapeia_linhas(self, old_line, new_line):
+        app = parse_diff(INCREMENT_DIFF)[0]
+
+        assert map_line(app, old_line) == new_line
+
+    def test_arquivo_removido(self):
+        removed = parse_diff(INCREMENT_DIFF)[2]
+
+        assert map_line(removed, 1) is None
+
+
+class TestCarryOverFindings:
+    """Testes para carry_over_findings e merge_findings."""
+
+    def test_reaproveita_e_descarta(self):
+        findings = [
+            _finding("app.py", 3),
+            _finding("app.py", 10),
+            _finding("velho.py", 7),
+            _finding("removido.py", 1),
+            _finding("intocado.py", 5),
+        ]
+
+        carried = carry_over_findings(findings, parse_diff(INCREMENT_DIFF))
+
+        assert [(f.file, f.line) for f in carried] == [
+            ("app.py", 11),
+            ("novo.py", 7),
+            ("intocado.py", 5),
+        ]
+
+    def test_finding_novo_prevalece(self):
+        new = [_finding("app.py", 11, title="Novo")]
+        carried = [
+            _finding("app.py", 11, title="Antigo"),
+            _finding("app.py", 11, category=Category.SECURITY),
+        ]
+
+        merged = merge_findings(new, carried)
+
+        assert [f.title for f in merged] == ["Novo", "Problema"]
+
+
+class TestReviewState:
+    """Testes para persistência do estado incremental."""
+
+    def test_salva_e_carrega(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        save_review_state(session, "main", [_finding("app.py", 1)])
+
+        state = load_review_state(RepositorySession.open(git_repo), "main")
+
+        assert state is not None
+        assert state.head_sha == session.head_sha
+        assert state.findings[0].file == "app.py"
+
+    def test_continua_valido_apos_novos_commits(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        save_review_state(session, "main", [])
+        (git_repo / "app.py").write_text("x = 3\n")
+        git(git_repo, "commit", "-q", "-am", "mais")
+
+        state = load_review_state(RepositorySession.open(git_repo), "main")
+
+        assert state is not None
+        assert state.head_sha == session.head_sha
+
+    def test_descarta_apos_rebase(self, git_repo):
+        save_review_state(RepositorySession.open(git_repo), "main", [])
+        (git_repo / "app.py").write_text("x = 3\n")
+        git(git_repo, "commit", "-q", "--amend", "-am", "reescrito")
+
+        assert load_review_state(RepositorySession.open(git_repo), "main") is None
+
+    def test_estado_por_branch_e_base(self, git_repo):
+        save_review_state(RepositorySession.open(git_repo), "main", [])
+
+        assert load_review_state(RepositorySession.open(git_repo), "develop") is None
+        git(git_repo, "checkout", "-q", "-b", "outra")
+        assert load_review_state(RepositorySession.open(git_repo), "main") is None
+
+    def test_estado_corrompido(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        save_review_state(session, "main", [])
+        next((session.cache_dir / "reviews").glob("*.json")).write_text("{")
+
+        assert load_review_state(session, "main") is None
@@ -0,0 +1,109 @@
+"""Testes para os modelos."""
+
+from code_reviewer.models import DiffHunk, DiffLine, HunkLines, LineKind
+
+
+class TestHunkLines:
+    """Testes para o armazenamento compacto de linhas."""
+
+    def test_preserva_ordem_de_insercao(self):
+        lines = HunkLines()
+        lines.append(LineKind.CONTEXT, 10, "a")
+        lines.append(LineKind.REMOVED, 11, "b")
+        lines.append(LineKind.ADDED, 11, "c")
+
+        assert list(lines) == [
+            (LineKind.CONTEXT, 10, "a"),
+            (LineKind.REMOVED, 11, "b"),
+            (LineKind.ADDED, 11, "c"),
+        ]
+
+    def test_conta_por_tipo(self):
+        lines = HunkLines()
+        lines.append(LineKind.ADDED, 1, "x")
+        lines.append(LineKind.ADDED, 2, "y")
+        lines.append(LineKind.REMOVED, 1, "z")
+
+        assert lines.count(LineKind.ADDED) == 2
+        assert lines.count(LineKind.REMOVED) == 1
+        assert lines.count(LineKind.CONTEXT) == 0
+        assert len(lines) == 3
+
+    def test_conteudo_por_indice_apos_freeze(self):
+        lines = HunkLines()
+        lines.append(LineKind.ADDED, 1, "primeira")
+        lines.freeze()
+        lines.append(LineKind.ADDED, 2, "")
+        lines.append(LineKind.ADDED, 3, "terceira")
+
+        assert lines.content(0) == "primeira"
+        assert lines.content(1) == ""
+        assert lines.content(2) == "terceira"
+
+    def test_igualdade(self):
+        a, b = HunkLines(), HunkLines()
+        for lines in (a, b):
+            lines.append(LineKind.ADDED, 1, "x")
+
+        assert a == b
+        b.append(LineKind.CONTEXT, 2, "y")
+        assert a != b
+
+
+class TestDiffHunk:
+    """Testes para a view Pydantic do hunk."""
+
+    def test_construtor_com_listas_gera_armazenamento_compacto(self):
+        hunk = DiffHunk(
+            start_line_old=1,
+            start_line_new=1,
+            added_lines=[DiffLine(line_number=2, content="novo", is_addition=True)],
+            context_lines=[DiffLine(line_number=1, content="ctx", is_addition=False)],
+        )
+
+        assert list(hunk.lines) == [
+            (LineKind.CONTEXT, 1, "ctx"),
+            (LineKind.ADDED, 2, "novo"),
+        ]
+        assert hunk.added_count == 1
+        assert hunk.removed_count == 0
+
+    def test_views_materializam_diff_lines(self):
+        hunk = DiffHunk(start_line_old=5, start_line_new=5)
+        hunk.lines.append(LineKind.REMOVED, 5, "old")
+        hunk.lines.append(LineKind.ADDED, 5, "new")
+
+        assert hunk.removed_lines == [
+            DiffLine(line_number=5, content="old", is_addition=False)
+        ]
+        assert hunk.added_lines == [
+            DiffLine(line_number=5, content="new", is_addition=True)
+        ]
+
+    def test_views_acompanham_mudanca_de_tipo(self):
+        hunk = DiffHunk(start_line_old=1, start_line_new=1)
+        hunk.lines.append(LineKind.ADDED, 1, "x")
+        hunk.lines.append(LineKind.ADDED, 2, "y")
+        assert len(hunk.added_lines) == 2
+
+        hunk.lines.set_kind(1, LineKind.CONTEXT)
+
+        assert [line.content for line in hunk.added_lines] == ["x"]
+        assert [line.content for line in hunk.context_lines] == ["y"]
+
+    def test_json_roundtrip(self):
+        hunk = DiffHunk(
+            function_name="f",
+            start_line_old=1,
+            start_line_new=1,
+            removed_lines=[DiffLine(line_number=1, content="a", is_addition=False)],
+            added_lines=[DiffLine(line_number=1, content="b", is_addition=True)],
+        )
+
+        data = hunk.model_dump()
+
+        assert "lines" not in data
+        assert data["added_lines"] == [
+            {"line_number": 1, "content": "b", "is_addition": True}
+        ]
+        assert DiffHunk.model_validate_json(hunk.model_dump_json()) == hunk
@@ -291,6 +291,47 @@ class TestProgressReporterPrint:
 class TestProgressReporterShowDiffFiles:
     """Testes para método show_diff_files() do ProgressReporter."""
 
+    def test_exibe_arquivos_ignorados_com_motivo(self):
+        """Arquivos descartados na triagem devem aparecer com o motivo."""
+        from code_reviewer.models import DiffFile, FileTriage, TriageStatus
+
+        output = io.StringIO()
+        console = Console(file=output, force_terminal=False)
+        reporter = ProgressReporter(console=console)
+
+        reporter.show_diff_files(
+            [DiffFile(path="src/main.py")],
+            skipped=[
+                FileTriage(path="yarn.lock", added=10, removed=2, status=TriageStatus.IGNORED),
+                FileTriage(path="logo.png", status=TriageStatus.BINARY),
+            ],
+        )
+
+        result = output.getvalue()
+        assert "Arquivos ignorados:" in result
+        assert "yarn.lock (ignorado)" in result
+        assert "logo.png (binário)" in result
+
+    def test_limita_arquivos_ignorados_exibidos(self):
+        """Muitos arquivos descartados são resumidos com contagem."""
+        from code_reviewer.formatters.progress import MAX_SKIPPED_SHOWN
+        from code_reviewer.models import FileTriage, TriageStatus
+
+        output = io.StringIO()
+        console = Console(file=output, force_terminal=False)
+        reporter = ProgressReporter(console=console)
+
+        skipped = [
+            FileTriage(path=f"vendor/f{i}.go", added=1, removed=0, status=TriageStatus.GENERATED)
+            for i in range(MAX_SKIPPED_SHOWN + 5)
+        ]
+        reporter.show_diff_files([], skipped=skipped)
+
+        result = output.getvalue()
+        assert "vendor/f0.go" in result
+        assert f"vendor/f{MAX_SKIPPED_SHOWN}.go" not in result
+        assert "+5 mais" in result
+
     def test_exibe_arquivos_com_contagem_linhas(self):
         """Deve exibir cada arquivo com contagem de linhas adicionadas/removidas."""
         from code_reviewer.models import DiffFile, DiffHunk, DiffLine
@@ -527,6 +568,59 @@ class TestProgressReporterShowDependencies:
         result = output.getvalue()
         assert "Sem dependências encontradas" in result
 
+    def test_niveis_indiretos_sao_resumidos(self):
+        """Referências indiretas (--context-depth) aparecem só como contagem."""
+        from code_reviewer.models import ContextGraph, FunctionRef
+
+        output = io.StringIO()
+        console = Console(file=output, force_terminal=False, width=200)
+        reporter = ProgressReporter(console=console)
+
+        contexts = [
+            ContextGraph(
+                function_name="process",
+                file="main.py",
+                callers=[
+                    FunctionRef(file="checkout.py", line=10, snippet="process()"),
+                    FunctionRef(file="api.py", line=20, snippet="checkout()", depth=2),
+                    FunctionRef(file="cli.py", line=5, snippet="handle()", depth=3),
+                ],
+                callees=[],
+            )
+        ]
+
+        reporter.show_dependencies(contexts)
+
+        result = output.getvalue()
+        assert "checkout.py" in result
+        assert "api.py" not in result
+        assert "Indiretos (até o nível 3): 2 callers, 0 callees" in result
+
+    def test_exibe_arquivos_de_teste(self):
+        """Testes relacionados aparecem em linha própria."""
+        from code_reviewer.models import ContextGraph, FunctionRef
+
+        output = io.StringIO()
+        console = Console(file=output, force_terminal=False, width=200)
+        reporter = ProgressReporter(console=console)
+
+        contexts = [
+            ContextGraph(
+                function_name="process",
+                file="main.py",
+                tests=[
+                    FunctionRef(file="tests/test_main.py", line=3, snippet="process()"),
+                    FunctionRef(file="tests/test_main.py", line=9, snippet="process(1)"),
+                ],
+            )
+        ]
+
+        reporter.show_dependencies(contexts)
+
+        result = output.getvalue()
+        assert "Testes: tests/test_main.py" in result
+        assert "Sem dependências encontradas" not in result
+
     def test_nao_faz_nada_quando_disabled(self):
         """Quando disabled, não deve fazer nada."""
         from code_reviewer.models import ContextGraph
@@ -1,6 +1,14 @@
 """Testes para o prompt_builder."""
 
-from code_reviewer.models import ContextGraph, DiffFile, DiffHunk, DiffLine, FunctionRef
+from code_reviewer.diff_parser import detect_moved_blocks, parse_diff
+from code_reviewer.models import (
+    ContextGraph,
+    ContextLookup,
+    DiffFile,
+    DiffHunk,
+    DiffLine,
+    FunctionRef,
+)
 from code_reviewer.prompt_builder import (
     build_prompt,
     format_context_for_prompt,
@@ -53,6 +61,24 @@ class TestFormatDiffForPrompt:
         assert "+    nova_linha()" in result
         assert "-    linha_antiga()" in result
 
+    def test_lista_todas_as_funcoes_do_hunk(self):
+        diff_file = DiffFile(
+            path="m.py",
+            hunks=[
+                DiffHunk(
+                    function_name="primeira",
+                    start_line_old=4,
+                    start_line_new=4,
+                    enclosing_functions=["primeira", "Servico"],
+                    added_lines=[DiffLine(line_number=5, content="x", is_addition=True)],
+                )
+            ],
+        )
+
+        result = format_diff_for_prompt([diff_file])
+
+        assert "#### Funções: primeira, Servico" in result
+
     def test_arquivo_novo(self):
         diff_file = DiffFile(path="novo.py", is_new=True, hunks=[])
 
@@ -160,6 +186,58 @@ class TestFormatDiffForPrompt:
         # Adição com 12 espaços
         assert "+            deep_call()" in result
 
+    def test_usa_ordem_original_do_diff_parseado(self):
+        """Linhas removidas ficam antes das adicionadas, mesmo com números distintos."""
+        diff = """diff --git a/m.py b/m.py
+--- a/m.py
++++ b/m.py
+@@ -10,4 +10,3 @@ def f():
+     a = 1
+-    b = 2
+-    c = 3
++    d = 4
+     return a
+"""
+        result = format_diff_for_prompt(parse_diff(diff))
+
+        body = result.split("Linhas 10+:\n")[1].split("\n")[:5]
+        assert body == ["     a = 1", "-    b = 2", "-    c = 3", "+    d = 4", "     return a"]
+
+    def test_renomeacao_pura_sem_conteudo(self):
+        diff_file = DiffFile(path="b.py", old_path="a.py", similarity=100, hunks=[])
+
+        result = format_diff_for_prompt([diff_file])
+
+        assert "(renomeado de a.py, similaridade 100%)" in result
+        assert "Linhas" not in result
+
+    def test_bloco_movido_vira_referencia(self):
+        diff = """diff --git a/a.py b/a.py
+--- a/a.py
++++ b/a.py
+@@ -1,4 +1,1 @@
+ x = 1
+-def mover(valor):
+-    resultado = valor * 2
+-    return resultado
+diff --git a/b.py b/b.py
+--- a/b.py
++++ b/b.py
+@@ -1,1 +1,4 @@
+ y = 2
++def mover(valor):
++    resultado = valor * 2
++    return resultado
+"""
+        files = parse_diff(diff)
+        detect_moved_blocks(files)
+
+        result = format_diff_for_prompt(files)
+
+        assert "resultado = valor" not in result
+        assert "~ (3 linhas movidas para b.py:2, sem alteração)" in result
+        assert "~ (3 linhas movidas de a.py:2, sem alteração)" in result
+
 
 class TestFormatContextForPrompt:
     """Testes para função format_context_for_prompt."""
@@ -244,6 +322,69 @@ class TestFormatReferencesForPrompt:
 
         assert "sem referências encontradas" in result
 
+    def test_indica_buscas_interrompidas(self):
+        graph = ContextGraph(
+            function_name="process_payment",
+            file="payment.py",
+            skipped_lookups=[ContextLookup.CALLERS, ContextLookup.CALLEES],
+        )
+
+        result = format_references_for_prompt([graph])
+
+        assert "sem referências encontradas" not in result
+        assert "referências incompletas: quem chama, o que usa" in result
+
+    def test_niveis_indiretos_compactos(self):
+        graph = ContextGraph(
+            function_name="process_payment",
+            file="payment.py",
+            callers=[
+                FunctionRef(file="checkout.py", line=32, snippet="process_payment(amount)"),
+                FunctionRef(
+                    file="api.py",
+                    line=8,
+                    snippet="checkout(cart)",
+                    function_name="handle",
+                    depth=2,
+                ),
+            ],
+            callees=[
+                FunctionRef(
+                    file="utils.py", line=3, snippet="def fmt", function_name="fmt", depth=2
+                )
+            ],
+        )
+
+        result = format_references_for_prompt([graph])
+
+        assert "- checkout.py:32 → `process_payment(amount)`" in result
+        assert "**Chamada indiretamente por:**\n- [nível 2] `handle` → api.py:8" in result
+        assert "**Usa indiretamente:**\n- [nível 2] `fmt` → utils.py:3" in result
+        assert "checkout(cart)" not in result
+        assert "**Usa:**" not in result
+
+    def test_testes_relacionados(self):
+        graph = ContextGraph(
+            function_name="process_payment",
+            file="payment.py",
+            tests=[
+                FunctionRef(
+                    file="tests/test_payment.py",
+                    line=12,
+                    snippet="assert process_payment(10)",
+                    function_name="test_aprovado",
+                )
+            ],
+        )
+
+        result = format_references_for_prompt([graph])
+
+        assert (
+            "**Testes relacionados:**\n"
+            "- `test_aprovado` em tests/test_payment.py:12 → `assert process_payment(10)`"
+        ) in result
+        assert "(sem referências encontradas)" not in result
+
 
 class TestBuildPrompt:
     """Testes para função build_prompt."""
@@ -0,0 +1,209 @@
+"""Testes para a análise de Python via AST."""
+
+import subprocess
+from collections import OrderedDict
+
+import pytest
+
+from code_reviewer import python_analysis
+from code_reviewer.diff_parser import parse_diff
+from code_reviewer.python_analysis import (
+    FunctionSpanIndex,
+    extract_function_spans,
+    git_blob_sha,
+    load_function_spans,
+    resolve_python_functions,
+)
+
+SOURCE = b'''import os
+
+
+def primeira():
+    return 1
+
+
+class Servico:
+    ativo = True
+
+    @property
+    def nome(self):
+        return "x"
+
+    def processar(self, item):
+        def interna():
+            return item
+        return interna()
+
+
+def segunda():
+    return 2
+'''
+
+
+@pytest.fixture(autouse=True)
+def ast_cache(tmp_path, monkeypatch):
+    """Isola o cache de AST em memória e em disco."""
+    directory = tmp_path / "ast"
+    monkeypatch.setattr(python_analysis, "AST_CACHE_DIR", directory)
+    monkeypatch.setattr(python_analysis, "_spans_cache", OrderedDict())
+    return directory
+
+
+class TestGitBlobSha:
+    """Testes para o cálculo do SHA de blob."""
+
+    def test_igual_ao_git_hash_object(self, tmp_path):
+        path = tmp_path / "a.py"
+        path.write_bytes(SOURCE)
+        expected = subprocess.run(
+            ["git", "hash-object", str(path)], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        assert git_blob_sha(SOURCE) == expected
+
+
+class TestFunctionSpans:
+    """Testes para extração e indexação de spans."""
+
+    def test_extrai_funcoes_metodos_e_classes(self):
+        spans = extract_function_spans(SOURCE)
+
+        names = [span.name for span in spans]
+        assert names == ["primeira", "Servico", "nome", "processar", "interna", "segunda"]
+
+    def test_span_inclui_decorator(self):
+        spans = {span.name: span for span in extract_function_spans(SOURCE)}
+
+        assert spans["nome"].start == 11
+        assert spans["nome"].end == 13
+
+    def test_codigo_invalido(self):
+        assert extract_function_spans(b"def (:\n") is None
+
+    def test_indice_retorna_funcao_mais_interna(self):
+        index = FunctionSpanIndex(extract_function_spans(SOURCE))
+
+        assert index.enclosing(1) is None
+        assert index.enclosing(5) == "primeira"
+        assert index.enclosing(9) == "Servico"
+        assert index.enclosing(17) == "interna"
+        assert index.enclosing(18) == "processar"
+        assert index.enclosing(22) == "segunda"
+        assert index.enclosing(999) is None
+
+
+class TestLoadFunctionSpans:
+    """Testes para o cache por SHA de blob."""
+
+    def test_grava_e_reaproveita_cache_em_disco(self, tmp_path, ast_cache, monkeypatch):
+        (tmp_path / "m.py").write_bytes(SOURCE)
+        sha = git_blob_sha(SOURCE)
+
+        spans = load_function_spans("m.py", sha, tmp_path)
+
+        assert (ast_cache / f"{sha}.json").exists()
+
+        # Nova execução: sem cache em memória e sem o arquivo no disco
+        monkeypatch.setattr(python_analysis, "_spans_cache", OrderedDict())
+        (tmp_path / "m.py").unlink()
+        assert load_function_spans("m.py", sha, tmp_path) == spans
+
+    def test_cache_em_memoria_limitado(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(python_analysis, "MAX_SPANS_MEMORY_ENTRIES", 2)
+        shas = []
+        for number in range(3):
+            content = f"def f{number}():\n    pass\n".encode()
+            (tmp_path / f"m{number}.py").write_bytes(content)
+            shas.append(git_blob_sha(content))
+            load_function_spans(f"m{number}.py", shas[-1], tmp_path)
+
+        # O menos usado sai da memória, mas continua no disco
+        assert list(python_analysis._spans_cache) == shas[1:]
+        assert load_function_spans("m0.py", shas[0], tmp_path)[0].name == "f0"
+        assert list(python_analysis._spans_cache) == [shas[2], shas[0]]
+
+
+class TestResolvePythonFunctions:
+    """Testes para a resolução das funções modificadas."""
+
+    def test_corrige_nome_do_hunk_header(self, tmp_path):
+        (tmp_path / "m.py").write_bytes(SOURCE)
+        # O git atribuiria o hunk à função anterior (primeira)
+        diff = """diff --git a/m.py b/m.py
+--- a/m.py
++++ b/m.py
+@@ -21,2 +21,2 @@ def primeira():
+ def segunda():
+-    return 0
++    return 2
+"""
+        files = parse_diff(diff)
+
+        resolve_python_functions(files, tmp_path)
+
+        hunk = files[0].hunks[0]
+        assert hunk.function_name == "segunda"
+        assert hunk.enclosing_functions == ["segunda"]
+
+    def test_hunk_no_topo_do_arquivo(self, tmp_path):
+        (tmp_path / "m.py").write_bytes(SOURCE)
+        diff = """diff --git a/m.py b/m.py
+--- a/m.py
++++ b/m.py
+@@ -1,1 +1,1 @@
+-import sys
++import os
+"""
+        files = parse_diff(diff)
+
+        resolve_python_functions(files, tmp_path)
+
+        assert files[0].hunks[0].function_names == []
+
+    def test_linhas_de_modulo_mantem_o_nome_do_hunk_header(self, tmp_path):
+        (tmp_path / "m.py").write_bytes(SOURCE)
+        diff = """diff --git a/m.py b/m.py
+--- a/m.py
++++ b/m.py
+@@ -1,1 +1,1 @@ def antiga():
+-import sys
++import os
+"""
+        files = parse_diff(diff)
+
+        resolve_python_functions(files, tmp_path)
+
+        hunk = files[0].hunks[0]
+        assert hunk.enclosing_functions == []
+        assert hunk.function_names == ["antiga"]
+
+    def test_hunk_com_varias_funcoes(self, tmp_path):
+        (tmp_path / "m.py").write_bytes(SOURCE)
+        diff = """diff --git a/m.py b/m.py
+--- a/m.py
++++ b/m.py
+@@ -16,3 +16,3 @@
+         def interna():
+-            return None
++            return item
+-        return interna
++        return interna()
+"""
+        files = parse_diff(diff)
+
+        resolve_python_functions(files, tmp_path)
+
+        assert files[0].hunks[0].function_names == ["interna", "processar"]
+
+    def test_ignora_arquivos_nao_python(self, tmp_path):
+        files = parse_diff("""diff --git a/a.js b/a.js
+--- a/a.js
++++ b/a.js
+@@ -1,1 +1,1 @@ function foo() {
+-a
++b
+""")
+
+        resolve_python_functions(files, tmp_path)
+
+        assert files[0].hunks[0].function_names == ["foo"]
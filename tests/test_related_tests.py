@@ -0,0 +1,141 @@
+"""Testes para o índice de testes relacionados."""
+
+from code_reviewer.related_tests import (
+    RelatedTest,
+    RelatedTestIndex,
+    extract_test_references,
+    is_test_file,
+    module_stem,
+)
+
+PYTHON_TEST = b"""from loja.pagamentos import pagar
+import pytest
+
+
+@pytest.fixture
+def carrinho():
+    return criar_carrinho()
+
+
+class TestPagar:
+    def test_pagamento_aprovado(self, carrinho):
+        assert pagar(carrinho) == len(carrinho)
+        assert pagar(carrinho, 2)
+
+    def test_estorno(self, carrinho):
+        pagar(carrinho)
+
+
+def auxiliar():
+    return pagar(None)
+"""
+
+JS_TEST = b"""import { render } from '../src/view';
+
+describe('view', () => {
+  it('renderiza o item', () => { expect(render(1)).toBe(1); });
+});
+"""
+
+
+class TestIsTestFile:
+    """Testes para is_test_file."""
+
+    def test_caminhos_de_teste(self):
+        assert is_test_file("tests/test_app.py")
+        assert is_test_file("test_app.py")
+        assert is_test_file("pkg/app_test.go")
+        assert is_test_file("web/__tests__/view.js")
+        assert is_test_file("web/view.spec.tsx")
+        assert is_test_file("web/view.test.mjs")
+
+    def test_caminhos_de_codigo(self):
+        assert not is_test_file("src/app.py")
+        assert not is_test_file("src/contest.py")
+        assert not is_test_file("web/testing.js")
+
+
+class TestModuleStem:
+    """Testes para module_stem."""
+
+    def test_arquivo_e_pacote(self):
+        assert module_stem("src/loja/pagamentos.py") == "pagamentos"
+        assert module_stem("src/loja/__init__.py") == "loja"
+        assert module_stem("../src/view") == "view"
+        assert module_stem("web/api/index.ts") == "api"
+
+
+class TestExtractTestReferences:
+    """Testes para extract_test_references."""
+
+    def test_python_uma_chamada_por_teste(self):
+        references, modules = extract_test_references(PYTHON_TEST, "tests/test_loja.py")
+
+        assert [(name, line, test) for name, line, test, _ in references] == [
+            ("criar_carrinho", 7, ""),
+            ("pagar", 12, "test_pagamento_aprovado"),
+            ("pagar", 16, "test_estorno"),
+            ("pagar", 20, ""),
+        ]
+        assert references[1][3] == "assert pagar(carrinho) == len(carrinho)"
+        assert modules == ["pagamentos", "pagar", "pytest"]
+
+    def test_js_chamadas_na_linha_do_teste(self):
+        references, modules = extract_test_references(JS_TEST, "web/view.test.ts")
+
+        assert ("render", 4, "renderiza o item") in [
+            (name, line, test) for name, line, test, _ in references
+        ]
+        assert modules == ["view"]
+
+    def test_ignora_binario(self):
+        assert extract_test_references(b"\0def test_x(): pagar()", "tests/x.py") == ([], [])
+
+
+class TestRelatedTestIndex:
+    """Testes para RelatedTestIndex."""
+
+    def _index(self):
+        return RelatedTestIndex(
+            {
+                "tests/test_outro.py": ([("pagar", 3, "test_outro", "pagar()")], ["outro"]),
+                "tests/test_loja.py": extract_test_references(
+                    PYTHON_TEST, "tests/test_loja.py"
+                ),
+                "tests/test_pagamentos.py": ([("pagar", 8, "", "pagar(x)")], []),
+            }
+        )
+
+    def test_so_quem_importa_ou_leva_o_nome_do_modulo(self):
+        tests = self._index().lookup("pagar", "src/loja/pagamentos.py")
+
+        assert [(t.file, t.test) for t in tests] == [
+            ("tests/test_loja.py", "test_pagamento_aprovado"),
+            ("tests/test_loja.py", "test_estorno"),
+            ("tests/test_loja.py", None),
+            ("tests/test_pagamentos.py", None),
+        ]
+
+    def test_nome_distintivo_aceita_os_demais_arquivos_por_ultimo(self):
+        tests = self._index().lookup("pagar", "src/loja/pagamentos.py", distinctive=True)
+
+        assert [(t.file, t.test) for t in tests][-1] == ("tests/test_outro.py", "test_outro")
+        assert len(tests) == 5
+
+    def test_limite(self):
+        tests = self._index().lookup("pagar", "src/loja/pagamentos.py", limit=1)
+
+        assert tests == [
+            RelatedTest(
+                "tests/test_loja.py",
+                12,
+                "test_pagamento_aprovado",
+                "assert pagar(carrinho) == len(carrinho)",
+            )
+        ]
+
+    def test_nome_desconhecido(self):
+        index = self._index()
+
+        assert index.lookup("estornar", "src/loja/pagamentos.py") == []
+        assert index.file_count == 3
@@ -0,0 +1,121 @@
+"""Testes para a sessão do repositório."""
+
+import subprocess
+
+import pytest
+
+from code_reviewer import repository
+from code_reviewer.repository import RepositoryError, RepositorySession
+
+from .conftest import git
+
+
+@pytest.fixture
+def git_repo(git_repo):
+    """Cria um repositório com branch main e uma branch feature à frente."""
+    repo = git_repo
+    (repo / "src").mkdir()
+    (repo / "src" / "app.py").write_text("x = 1\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    git(repo, "checkout", "-q", "-b", "feature/login")
+    (repo / "src" / "app.py").write_text("x = 2\n")
+    git(repo, "commit", "-q", "-am", "feature")
+    return repo
+
+
+@pytest.fixture
+def no_git(monkeypatch):
+    """Falha o teste se a sessão chamar o git."""
+
+    def fail(args, workdir):
+        raise AssertionError(f"git chamado: {args}")
+
+    monkeypatch.setattr(repository, "_run_git", fail)
+
+
+class TestRepositorySession:
+    """Testes para RepositorySession."""
+
+    def test_le_head_e_branch_sem_processos(self, git_repo, no_git):
+        session = RepositorySession.open(git_repo)
+
+        assert session.branch == "feature/login"
+        assert session.root == git_repo.resolve()
+
+    def test_head_igual_ao_rev_parse(self, git_repo):
+        session = RepositorySession.open(git_repo)
+
+        assert session.head_sha == git(git_repo, "rev-parse", "HEAD")
+
+    def test_encontra_raiz_a_partir_de_subdiretorio(self, git_repo, no_git):
+        session = RepositorySession.open(git_repo / "src")
+
+        assert session.root == git_repo.resolve()
+        assert session.workdir == (git_repo / "src").resolve()
+
+    def test_le_packed_refs(self, git_repo, no_git):
+        expected = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=git_repo, capture_output=True, text=True
+        ).stdout.strip()
+        subprocess.run(["git", "pack-refs", "--all"], cwd=git_repo, check=True)
+
+        session = RepositorySession.open(git_repo)
+
+        assert not (git_repo / ".git" / "refs" / "heads" / "feature" / "login").exists()
+        assert session.head_sha == expected
+
+    def test_head_destacado(self, git_repo):
+        sha = git(git_repo, "rev-parse", "HEAD")
+        git(git_repo, "checkout", "-q", "--detach")
+
+        session = RepositorySession.open(git_repo)
+
+        assert session.branch == "HEAD"
+        assert session.head_sha == sha
+
+    def test_worktree(self, git_repo, tmp_path):
+        worktree = tmp_path / "wt"
+        git(git_repo, "worktree", "add", "-q", "-b", "outra", str(worktree), "main")
+
+        session = RepositorySession.open(worktree)
+
+        assert session.root == worktree
+        assert session.branch == "outra"
+        assert session.head_sha == git(git_repo, "rev-parse", "main")
+
+    def test_merge_base_e_reaproveitado(self, git_repo, monkeypatch):
+        session = RepositorySession.open(git_repo)
+        expected = git(git_repo, "merge-base", "main", "HEAD")
+        calls = []
+        original = repository._run_git
+
+        def spy(args, workdir):
+            calls.append(args)
+            return original(args, workdir)
+
+        monkeypatch.setattr(repository, "_run_git", spy)
+
+        assert session.merge_base("main") == expected
+        assert session.merge_base("main") == expected
+        assert len(calls) == 1
+
+    def test_branch_base_inexistente(self, git_repo):
+        with pytest.raises(RepositoryError):
+            RepositorySession.open(git_repo).merge_base("nao-existe")
+
+    def test_fora_de_repositorio(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path))
+        monkeypatch.setattr(repository, "_find_git_dir", lambda start: None)
+
+        with pytest.raises(RepositoryError):
+            RepositorySession.open(tmp_path)
+
+    def test_repositorio_sem_commits(self, tmp_path):
+        git(tmp_path, "init", "-q", "-b", "main")
+
+        session = RepositorySession.open(tmp_path)
+
+        assert session.branch == "main"
+        with pytest.raises(RepositoryError):
+            session.head_sha
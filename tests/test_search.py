@@ -0,0 +1,220 @@
+"""Testes para os backends de busca textual."""
+
+import shutil
+import sys
+import time
+
+import pytest
+
+from code_reviewer.context_builder import MAX_REFS_PER_SYMBOL, find_callers_batch
+from code_reviewer.git_objects import BlobReader
+from code_reviewer.search import (
+    AUTO_SEARCH_BACKEND,
+    Deadline,
+    GitGrepBackend,
+    GrepBackend,
+    MmapBackend,
+    PythonBackend,
+    RevisionBackend,
+    RipgrepBackend,
+    SearchBackend,
+    SearchMatch,
+    get_search_backend,
+    list_search_backends,
+    select_search_backend,
+)
+from code_reviewer.search.base import parse_null_line, stream_command
+
+from .conftest import git
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Repositório com código, binário e diretórios excluídos."""
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "app.py").write_text(
+        "def pagar(valor):\n"
+        "    return estornar(valor)\n"
+        "\n"
+        "pagar(10); estornar(5)\n"
+    )
+    (repo / "src" / "util.js").write_text("function avisar() {}\navisar()\n")
+    (repo / "imagem.bin").write_bytes(b"\0\x01pagar(\n")
+    (repo / "node_modules").mkdir()
+    (repo / "node_modules" / "lib.js").write_text("pagar(1)\n")
+    git(repo, "init", "-q")
+    git(repo, "add", ".")
+    return repo
+
+
+BACKENDS = [
+    GitGrepBackend,
+    pytest.param(
+        RipgrepBackend,
+        marks=pytest.mark.skipif(shutil.which("rg") is None, reason="rg não instalado"),
+    ),
+    GrepBackend,
+    MmapBackend,
+    PythonBackend,
+]
+
+EXPECTED = [
+    SearchMatch("src/app.py", 1, "def pagar(valor):"),
+    SearchMatch("src/app.py", 2, "    return estornar(valor)"),
+    SearchMatch("src/app.py", 4, "pagar(10); estornar(5)"),
+    SearchMatch("src/util.js", 1, "function avisar() {}"),
+    SearchMatch("src/util.js", 2, "avisar()"),
+]
+
+
+@pytest.mark.parametrize("backend_class", BACKENDS)
+class TestBackends:
+    """Todos os backends devem produzir o mesmo resultado."""
+
+    def test_implementa_protocolo(self, backend_class):
+        assert isinstance(backend_class(), SearchBackend)
+
+    def test_encontra_linhas_com_qualquer_padrao(self, backend_class, project):
+        backend = backend_class()
+
+        matches = list(backend.search(["pagar(", "estornar(", "avisar("], project))
+
+        assert sorted(matches, key=lambda m: (m.file, m.line)) == EXPECTED
+
+    def test_linha_com_varios_padroes_aparece_uma_vez(self, backend_class, project):
+        matches = list(backend_class().search(["pagar(", "estornar("], project))
+
+        assert [m.line for m in matches if m.file == "src/app.py"] == [1, 2, 4]
+
+    def test_ignora_binarios_e_diretorios_excluidos(self, backend_class, project):
+        matches = list(backend_class().search(["pagar("], project))
+
+        assert {m.file for m in matches} == {"src/app.py"}
+
+    def test_padroes_sao_literais(self, backend_class, project):
+        assert list(backend_class().search(["pag.r("], project)) == []
+
+    def test_sem_padroes(self, backend_class, project):
+        assert list(backend_class().search([], project)) == []
+
+
+@pytest.fixture
+def dirty_project(project):
+    """O projeto commitado, com alterações locais, no índice e sem rastrear."""
+    git(project, "config", "user.email", "test@example.com")
+    git(project, "config", "user.name", "Test")
+    git(project, "commit", "-q", "-m", "inicial")
+    (project / "src" / "app.py").write_text("import os\n\ndef pagar(valor):\n    return 0\n")
+    (project / "src" / "util.js").write_text("function avisar() {}\npagar(3)\n")
+    git(project, "add", "src/util.js")
+    (project / "node_modules" / "lib.js").write_text("pagar(2)\n")
+    (project / "novo.py").write_text("pagar(1)\n")
+    return project
+
+
+@pytest.mark.parametrize("backend_class", BACKENDS)
+class TestRevisionBackend:
+    """A busca deve ver o HEAD, como o FileCache do review."""
+
+    def test_busca_na_versao_do_head(self, backend_class, dirty_project):
+        with BlobReader(dirty_project) as reader:
+            backend = RevisionBackend(backend_class(), reader)
+
+            matches = list(backend.search(["pagar(", "estornar(", "avisar("], dirty_project))
+
+        assert sorted(matches, key=lambda m: (m.file, m.line)) == EXPECTED
+
+    def test_sem_head_busca_no_working_tree(self, backend_class, project):
+        with BlobReader(project) as reader:
+            backend = RevisionBackend(backend_class(), reader)
+
+            matches = list(backend.search(["avisar("], project))
+
+        assert [m.file for m in matches] == ["src/util.js", "src/util.js"]
+
+
+class TestSelecao:
+    """Testes para a escolha do backend."""
+
+    def test_lista_backends(self):
+        assert list_search_backends() == ["git-grep", "ripgrep", "mmap", "grep", "python"]
+
+    def test_auto_prefere_git_grep_em_repositorio(self, project):
+        assert select_search_backend(project).name == "git-grep"
+        assert select_search_backend(project, AUTO_SEARCH_BACKEND).name == "git-grep"
+
+    def test_auto_fora_de_repositorio(self, tmp_path):
+        assert select_search_backend(tmp_path).name != "git-grep"
+
+    def test_forca_backend(self, project):
+        assert select_search_backend(project, "python").name == "python"
+
+    def test_backend_forcado_indisponivel(self, tmp_path):
+        with pytest.raises(ValueError, match="não está disponível"):
+            select_search_backend(tmp_path, "git-grep")
+
+    def test_backend_inexistente(self):
+        with pytest.raises(ValueError, match="não encontrado"):
+            get_search_backend("ack")
+
+
+def _slow_tool(output: str) -> list[str]:
+    """Comando que escreve ``output`` e continua "varrendo" por 10s."""
+    script = (
+        "import sys, time\n"
+        f"sys.stdout.write({output!r})\n"
+        "sys.stdout.flush()\n"
+        "time.sleep(10)\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+class TestStreaming:
+    """Testes para o encerramento antecipado das buscas."""
+
+    def test_parse_null_line(self):
+        assert parse_null_line(b"./a.py\x0012:x = f()", b":") == SearchMatch("a.py", 12, "x = f()")
+        assert parse_null_line(b"sem separador", b":") is None
+
+    def test_fechar_iterador_encerra_o_processo(self, tmp_path):
+        start = time.monotonic()
+        results = stream_command(_slow_tool("a.py\x001:f()\n"), tmp_path, b":", None)
+
+        assert next(results) == SearchMatch("a.py", 1, "f()")
+        results.close()
+
+        assert time.monotonic() - start < 5
+
+    def test_prazo_encerra_processo_sem_saida(self, tmp_path):
+        start = time.monotonic()
+
+        matches = list(stream_command(_slow_tool(""), tmp_path, b":", Deadline.after(0.3)))
+
+        assert matches == []
+        assert time.monotonic() - start < 5
+
+    def test_prazo_vencido_nao_executa(self, tmp_path):
+        deadline = Deadline.after(-1)
+
+        assert deadline.expired and deadline.remaining() == 0
+        assert list(stream_command(["false"], tmp_path, b":", deadline)) == []
+
+    def test_python_respeita_prazo(self, project):
+        assert list(PythonBackend().search(["pagar("], project, Deadline.after(-1))) == []
+
+    def test_callers_param_a_busca_com_referencias_suficientes(self, tmp_path):
+        for i in range(50):
+            (tmp_path / f"m{i:02}.py").write_text("get(1)\n" * 20)
+        consumed = []
+
+        class Contador(GrepBackend):
+            def search(self, patterns, workdir, deadline=None):
+                for match in super().search(patterns, workdir, deadline):
+                    consumed.append(match)
+                    yield match
+
+        callers = find_callers_batch(["get"], tmp_path, Contador())
+
+        assert len(callers["get"]) == MAX_REFS_PER_SYMBOL
+        assert len(consumed) == MAX_REFS_PER_SYMBOL
@@ -0,0 +1,257 @@
+"""Testes para o índice de definições de símbolos."""
+
+
+import pytest
+from click.testing import CliRunner
+
+from code_reviewer import repository
+from code_reviewer.cli import index as index_command
+from code_reviewer.context_builder import find_callees
+from code_reviewer.repository import RepositorySession
+from code_reviewer.search import Deadline, GrepBackend
+from code_reviewer.symbol_index import (
+    SymbolIndex,
+    build_symbol_index,
+    extract_definitions,
+    list_indexable_files,
+    load_no_definition_cache,
+    load_symbol_index,
+    read_lookup_stats,
+    record_lookup_stats,
+    save_no_definition_cache,
+)
+
+from .conftest import git
+
+
+@pytest.fixture
+def git_repo(git_repo, tmp_path, monkeypatch):
+    """Repositório com algumas definições e cache isolado."""
+    monkeypatch.setattr(repository, "REPOS_CACHE_DIR", tmp_path / "cache")
+    repo = git_repo
+    (repo / "services").mkdir(parents=True)
+    (repo / "web").mkdir()
+    (repo / "node_modules" / "lib").mkdir(parents=True)
+    (repo / "services" / "payment.py").write_text(
+        "class Payment:\n    def charge(self):\n        pass\n\n\ndef refund(tx):\n    pass\n"
+    )
+    (repo / "web" / "app.js").write_text("function render(el) {\n  return el;\n}\n")
+    (repo / "node_modules" / "lib" / "index.js").write_text("function render() {}\n")
+    (repo / "logo.png").write_bytes(b"\x89PNG\0def fake():")
+    git(repo, "add", "-f", ".")
+    git(repo, "commit", "-q", "-m", "inicial")
+    return repo
+
+
+class TestExtractDefinitions:
+    """Testes para extract_definitions."""
+
+    def test_extrai_nome_linha_e_tipo(self):
+        content = b"import os\n\nclass A:\n    def run(self):\n        pass\nfunc Go() {}\n"
+
+        assert extract_definitions(content) == [
+            ("A", 3, "class", "class A:"),
+            ("run", 4, "def", "def run(self):"),
+            ("Go", 6, "func", "func Go() {}"),
+        ]
+
+    def test_ignora_binario(self):
+        assert extract_definitions(b"\0\0def x():") == []
+
+    def test_palavra_chave_precisa_ser_inteira(self):
+        assert extract_definitions(b"undef foo\nredefine bar\n") == []
+
+
+class TestBuildSymbolIndex:
+    """Testes para construção e atualização do índice."""
+
+    def test_lista_arquivos_sem_diretorios_excluidos(self, git_repo):
+        files = list_indexable_files(git_repo)
+
+        assert "services/payment.py" in files
+        assert "node_modules/lib/index.js" not in files
+
+    def test_busca_definicoes(self, git_repo):
+        index, stats = build_symbol_index(git_repo)
+
+        (definition,) = index.lookup("refund")
+        assert (definition.file, definition.line, definition.kind) == (
+            "services/payment.py",
+            6,
+            "def",
+        )
+        assert [d.file for d in index.lookup("render")] == ["web/app.js"]
+        assert index.lookup("fake") == []
+        assert (index.hits, index.misses) == (2, 1)
+        assert stats.parsed == stats.files == 3
+
+    def test_reaproveita_arquivos_inalterados(self, git_repo):
+        previous, _ = build_symbol_index(git_repo)
+        (git_repo / "web" / "app.js").write_text("function paint(el) {}\n")
+        git(git_repo, "commit", "-q", "-am", "paint")
+
+        index, stats = build_symbol_index(git_repo, previous)
+
+        assert (stats.reused, stats.parsed) == (2, 1)
+        assert index.lookup("render") == []
+        assert index.lookup("paint")[0].line == 1
+
+    def test_prazo_esgotado_deixa_o_indice_incompleto(self, git_repo):
+        previous, _ = build_symbol_index(git_repo)
+        (git_repo / "web" / "app.js").write_text("function paint(el) {}\n")
+        git(git_repo, "commit", "-q", "-am", "paint")
+
+        index, stats = build_symbol_index(git_repo, previous, Deadline.after(0))
+
+        assert not stats.complete
+        assert (stats.reused, stats.parsed) == (2, 0)
+        assert index.lookup("paint") == []
+        assert index.lookup("refund")
+
+    def test_remove_arquivos_apagados(self, git_repo):
+        previous, _ = build_symbol_index(git_repo)
+        git(git_repo, "rm", "-q", "web/app.js")
+        git(git_repo, "commit", "-q", "-m", "remove app.js")
+
+        index, _ = build_symbol_index(git_repo, previous)
+
+        assert index.lookup("render") == []
+
+    def test_indexa_o_head_e_nao_o_working_tree(self, git_repo):
+        (git_repo / "web" / "app.js").write_text("function paint(el) {}\n")
+        (git_repo / "web" / "novo.js").write_text("function novo() {}\n")
+        git(git_repo, "add", "web/novo.js")
+
+        index, stats = build_symbol_index(git_repo)
+
+        assert stats.files == 3
+        assert [d.file for d in index.lookup("render")] == ["web/app.js"]
+        assert index.lookup("paint") == []
+        assert index.lookup("novo") == []
+
+    def test_persiste_no_cache_do_repositorio(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        load_symbol_index(session)
+
+        index, stats = load_symbol_index(RepositorySession.open(git_repo))
+
+        assert (stats.reused, stats.parsed) == (3, 0)
+        assert index.lookup("Payment")[0].kind == "class"
+
+    def test_dump_invalido(self):
+        assert SymbolIndex.load(b"lixo") is None
+
+    def test_estatisticas_de_busca_acumulam(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        for _ in range(2):
+            index, _ = load_symbol_index(session)
+            index.lookup("refund")
+            index.lookup("inexistente")
+            record_lookup_stats(session, index)
+
+        assert read_lookup_stats(session) == (2, 2)
+
+
+class TestTestesNoIndice:
+    """Testes para as referências de testes extraídas com o índice."""
+
+    def test_indexa_so_arquivos_de_teste(self, git_repo):
+        (git_repo / "tests").mkdir()
+        (git_repo / "tests" / "test_payment.py").write_text(
+            "from services.payment import refund\n\n\ndef test_refund():\n    refund(1)\n"
+        )
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-q", "-m", "testes")
+
+        index, _ = build_symbol_index(git_repo)
+
+        assert index.files["tests/test_payment.py"][2] is not None
+        assert index.files["services/payment.py"][2] is None
+        tests = index.tests.lookup("refund", "services/payment.py")
+        assert [(t.file, t.line, t.test) for t in tests] == [
+            ("tests/test_payment.py", 5, "test_refund")
+        ]
+
+    def test_persiste_com_o_indice(self, git_repo):
+        (git_repo / "payment_test.py").write_text("refund(2)\n")
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-q", "-m", "testes")
+        session = RepositorySession.open(git_repo)
+        load_symbol_index(session)
+
+        index, stats = load_symbol_index(session)
+
+        assert stats.parsed == 0
+        assert index.tests.file_count == 1
+
+
+class TestFindCalleesComIndice:
+    """Testes para find_callees usando o índice."""
+
+    def test_resolve_pelo_indice(self, git_repo):
+        index, _ = build_symbol_index(git_repo)
+
+        callees = find_callees(["refund(tx)", "print(x)"], git_repo, index)
+
+        assert [(c.function_name, c.file, c.line) for c in callees] == [
+            ("refund", "services/payment.py", 6)
+        ]
+        assert callees[0].snippet == "def refund(tx):"
+
+
+class TestNoDefinitionCache:
+    """Testes para o cache persistente de símbolos sem definição."""
+
+    def _search_spy(self):
+        backend = GrepBackend()
+        calls = []
+        original = backend.search
+
+        def spy(patterns, workdir, deadline=None):
+            calls.append(patterns)
+            return original(patterns, workdir, deadline)
+
+        backend.search = spy
+        return backend, calls
+
+    def test_nao_busca_de_novo_o_que_nao_existe(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        cache = load_no_definition_cache(session)
+        backend, calls = self._search_spy()
+
+        first = find_callees(["refund(tx)", "sumido(x)"], git_repo, None, backend, None, cache)
+        save_no_definition_cache(session, cache)
+        cache = load_no_definition_cache(RepositorySession.open(git_repo))
+        second = find_callees(["sumido(x)"], git_repo, None, backend, None, cache)
+
+        assert [c.function_name for c in first] == ["refund"]
+        assert "sumido" in cache and "refund" not in cache
+        assert second == []
+        assert calls == [["refund", "sumido"]]
+
+    def test_invalida_quando_os_arquivos_mudam(self, git_repo):
+        session = RepositorySession.open(git_repo)
+        cache = load_no_definition_cache(session)
+        cache.add("sumido")
+        save_no_definition_cache(session, cache)
+
+        (git_repo / "web" / "novo.js").write_text("function sumido() {}\n")
+        git(git_repo, "add", "web/novo.js")
+        git(git_repo, "commit", "-q", "-m", "novo")
+
+        assert "sumido" not in load_no_definition_cache(session)
+
+
+class TestIndexCommand:
+    """Testes para o comando airev index."""
+
+    def test_exibe_estatisticas(self, git_repo):
+        runner = CliRunner()
+
+        first = runner.invoke(index_command, ["--workdir", str(git_repo)])
+        second = runner.invoke(index_command, ["--workdir", str(git_repo)])
+
+        assert first.exit_code == 0
+        assert "3 parseados" in first.output
+        assert "3 reaproveitados, 0 parseados" in second.output
+        assert "nenhuma busca registrada" in second.output